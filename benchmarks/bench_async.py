@@ -0,0 +1,53 @@
+"""Benchmark AsyncUnrealDevice throughput with many concurrent sessions.
+
+Usage: python benchmarks/bench_async.py [sessions] [commands] [latency]
+"""
+
+import sys
+import time
+import asyncio
+
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gtunrealdevice import AsyncUnrealDevice     # noqa: E402
+from gtunrealdevice.core import DEVICES_DATA     # noqa: E402
+
+
+async def run_session(address, commands, latency):
+    device = AsyncUnrealDevice(address, latency=latency)
+    await device.connect()
+    for _ in range(commands):
+        await device.execute('show version')
+    await device.disconnect()
+
+
+async def run(sessions, commands, latency):
+    coros = [run_session('10.0.{}.{}'.format(i // 256, i % 256), commands, latency)
+             for i in range(sessions)]
+    await asyncio.gather(*coros)
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    commands = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.01
+
+    DEVICES_DATA.clear()
+    for i in range(sessions):
+        address = '10.0.{}.{}'.format(i // 256, i % 256)
+        DEVICES_DATA[address] = dict(name='device{}'.format(i),
+                                     cmdlines={'show version': 'version 1.0.{}'.format(i)})
+
+    start = time.perf_counter()
+    asyncio.run(run(sessions, commands, latency))
+    duration = time.perf_counter() - start
+
+    total = sessions * commands
+    fmt = '{} sessions x {} commands (latency {} s): {:.2f} s, {:.0f} commands/s'
+    print(fmt.format(sessions, commands, latency, duration, total / duration))
+
+
+if __name__ == '__main__':
+    main()
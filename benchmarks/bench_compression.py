@@ -0,0 +1,92 @@
+"""Benchmark memory, disk, and latency of compressed outputs per codec.
+
+Every device carries a large show running-config output and a show
+version output.  Memory is the size of outputs kept in devices data,
+disk is the size of the dumped devices info file, and latency is
+measured with UnrealDevice.execute on a cold and a warm LRU cache.
+
+Usage: python benchmarks/bench_compression.py [output_kb ...]
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from gtunrealdevice import core     # noqa: E402
+from gtunrealdevice.core import DevicesData     # noqa: E402
+from gtunrealdevice.core import UnrealDevice     # noqa: E402
+from gtunrealdevice.outputpool import OutputPool     # noqa: E402
+from gtunrealdevice.compression import CompressedOutput     # noqa: E402
+
+TOTAL = 20
+
+
+def create_output(size, seed):
+    lst, index = [], 0
+    while sum(len(line) + 1 for line in lst) < size:
+        lst.append('interface GigabitEthernet{}/{}'.format(seed, index))
+        lst.append(' ip address 10.{}.{}.1 255.255.255.0'.format(seed % 256, index % 256))
+        lst.append(' description uplink {} of device {}'.format(index, seed))
+        index += 1
+    return '\n'.join(lst)
+
+
+def measure(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def run(codec, output_size, dirname):
+    devices_data = DevicesData()
+    devices_data.clear()
+    devices_data.pool = OutputPool(codec=codec, min_size=1024)
+    devices = {
+        '10.0.0.{}'.format(i): dict(cmdlines={'show running-config': create_output(output_size, i),
+                                              'show version': 'version {}'.format(i)})
+        for i in range(TOTAL)
+    }
+    ingest = measure(lambda: devices_data.update(devices))
+    memory = devices_data.get_output_stats()['unique_size']
+
+    filename = str(Path(dirname, 'devices_info_{}.yaml'.format(codec or 'raw')))
+    devices_data.save(filename)
+    disk = Path(filename).stat().st_size
+
+    core.DEVICES_DATA, original = devices_data, core.DEVICES_DATA
+    try:
+        CompressedOutput.clear_cache()
+        devices = [UnrealDevice(address) for address in devices_data]
+        for device in devices:
+            device.connect(is_timestamp=False, showed=False)
+
+        def execute():
+            for device in devices:
+                device.execute('show running-config', is_timestamp=False, showed=False)
+
+        cold = measure(execute) / TOTAL
+        warm = measure(execute, repeat=5) / TOTAL
+    finally:
+        core.DEVICES_DATA = original
+    return ingest, memory, disk, cold, warm
+
+
+def main():
+    sizes = [int(i) for i in sys.argv[1:]] or [256, 4096]
+    fmt = '{:>6} KB outputs  {:5}  ingest {:9.1f} ms  memory {:9.1f} KB  disk {:9.1f} KB  ' \
+          'execute cold {:8.2f} ms  warm {:8.2f} ms'
+    with tempfile.TemporaryDirectory() as dirname:
+        for size in sizes:
+            for codec in ['', 'zlib', 'lzma', 'bz2']:
+                ingest, memory, disk, cold, warm = run(codec, size * 1024, dirname)
+                print(fmt.format(size, codec or 'raw', ingest, memory / 1024, disk / 1024, cold, warm))
+                sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
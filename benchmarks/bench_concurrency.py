@@ -0,0 +1,96 @@
+"""Benchmark parallel CLI workers which share devices and sessions files.
+
+Every worker process adds its own devices to devices_info.yaml, and
+connects, executes, and releases them through the serialized database
+like parallel CLI calls.  Throughput is reported with a consistency
+check, i.e. every device of every worker is kept in devices info file,
+devices info file is a valid yaml file, and no session is left behind.
+
+Usage: python benchmarks/bench_concurrency.py [workers] [devices_per_worker]
+"""
+
+import io
+import sys
+import time
+import contextlib
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from gtunrealdevice import core     # noqa: E402
+from gtunrealdevice.config import Data     # noqa: E402
+from gtunrealdevice.core import DevicesData     # noqa: E402
+from gtunrealdevice.core import UnrealDevice     # noqa: E402
+from gtunrealdevice.dataformat import DataFormat     # noqa: E402
+from gtunrealdevice.serialization import SerializedFile     # noqa: E402
+
+
+def setup(dirname):
+    Data.devices_info_filename = str(Path(dirname, 'devices_info.yaml'))
+    SerializedFile.filename = str(Path(dirname, 'serialized_data.db'))
+    SerializedFile.legacy_filename = str(Path(dirname, 'serialized_data.yaml'))
+    core.DEVICES_DATA = DevicesData()
+
+
+def run_worker(dirname, worker, total):
+    setup(dirname)
+    devices_data = core.DEVICES_DATA
+    for index in range(total):
+        address = '10.{}.{}.{}'.format(worker, index // 256, index % 256)
+        devices_data[address] = dict(name='w{}-d{}'.format(worker, index),
+                                     cmdlines={'show version': 'version {}'.format(index)})
+        devices_data.save()
+
+        device = UnrealDevice(address)
+        device.connect(is_timestamp=False, showed=False)
+        SerializedFile.add_instance(address, device)
+
+        instance = SerializedFile.get_instance(address)
+        instance.execute('show version', is_timestamp=False, showed=False)
+        SerializedFile.add_instance(address, instance)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            SerializedFile.remove_instance(address)
+    return total
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    ctx = multiprocessing.get_context('spawn')
+
+    with tempfile.TemporaryDirectory() as dirname:
+        setup(dirname)
+        Path(Data.devices_info_filename).write_text('')
+
+        start = time.perf_counter()
+        with ctx.Pool(workers) as pool:
+            args = [(dirname, worker, total) for worker in range(workers)]
+            count = sum(pool.starmap(run_worker, args))
+        duration = time.perf_counter() - start
+
+        devices_data = DevicesData()
+        devices_data.compact()
+        with open(Data.devices_info_filename) as stream:
+            content = DataFormat.load(stream.read())
+        sessions = SerializedFile.get_info(is_instance=False)
+
+        expected = {'10.{}.{}.{}'.format(w, i // 256, i % 256)
+                    for w in range(workers) for i in range(total)}
+        is_consistent = (set(devices_data) == expected and set(content) == expected
+                         and sessions.total == 0)    # noqa
+
+        fmt = '{} workers x {} devices  {:8.1f} ops/sec  {:8.3f} ms/op  consistent={}'
+        print(fmt.format(workers, total, count / duration,
+                         duration * 1000 / count, is_consistent))
+        if not is_consistent:
+            lost = len(expected - set(devices_data))
+            print('  - lost devices: {}, leftover sessions: {}'.format(lost, sessions.total))  # noqa
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
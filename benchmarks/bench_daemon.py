@@ -0,0 +1,62 @@
+"""Benchmark per-command latency of the real unreal-device console CLI
+with and without unreal-device daemon.
+
+Every command is a new interpreter like a console call.  With daemon,
+the thin client forwards the command before devices data or yaml is
+imported, so a forwarded command costs an interpreter start and a round
+trip over the daemon socket.  A bare interpreter start is the floor.
+
+Usage: python benchmarks/bench_daemon.py [total]
+"""
+
+import os
+import sys
+import subprocess
+import tempfile
+import time
+
+from pathlib import Path
+
+ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+def run(env, *args):
+    return subprocess.run([sys.executable] + list(args), env=env,
+                          stdout=subprocess.DEVNULL, check=False)
+
+
+def run_cli(env, *args):
+    return run(env, '-m', 'gtunrealdevice', *args)
+
+
+def measure(total, func, *args):
+    start = time.perf_counter()
+    for _ in range(total):
+        func(*args)
+    return (time.perf_counter() - start) * 1000 / total
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, PYTHONPATH=ROOT)
+        cmdline = ['execute', '1.1.1.1::show version']
+
+        run_cli(env, 'connect', '1.1.1.1')
+        interpreter = measure(total, run, env, '-c', 'pass')
+        in_process = measure(total, run_cli, env, *cmdline)
+
+        run_cli(env, 'daemon', 'start')
+        try:
+            daemon = measure(total, run_cli, env, *cmdline)
+        finally:
+            run_cli(env, 'daemon', 'stop')
+
+        fmt = '{:28}: {:8.1f} ms/command'
+        print(fmt.format('interpreter start', interpreter))
+        print(fmt.format('in-process CLI execute', in_process))
+        print(fmt.format('daemon CLI execute', daemon))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark parsing and dumping of devices info per serialization backend.
+
+The test devices info is scaled up by copying its devices under new
+addresses.
+
+Usage: python benchmarks/bench_dataformat.py [total ...]
+"""
+
+import json
+import sys
+import time
+
+from pathlib import Path
+
+import yaml
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from gtunrealdevice.dataformat import DataFormat     # noqa: E402
+
+FILENAME = Path(ROOT, 'tests', 'unit', 'data', 'devices_info.yaml')
+
+
+def create_devices_info(total):
+    node = yaml.safe_load(FILENAME.read_text())
+    devices = dict()
+    for index in range(total):
+        for address, device in node.items():
+            address = '{}.{}'.format(address, index)
+            devices[address] = dict(device, name='{}-{}'.format(device.get('name'), index))
+    return devices
+
+
+def measure(func, repeat=3):
+    lst = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        lst.append(time.perf_counter() - start)
+    return min(lst) * 1000
+
+
+def main():
+    totals = [int(i) for i in sys.argv[1:]] or [1000, 10000, 50000]
+    backends = [
+        ('yaml SafeLoader', lambda d: yaml.safe_dump(d), lambda t: yaml.load(t, Loader=yaml.SafeLoader)),
+        ('DataFormat yaml', lambda d: DataFormat.dump(d), lambda t: DataFormat.load(t)),
+        ('DataFormat json', lambda d: DataFormat.dump(d, is_json=True), lambda t: DataFormat.load(t)),
+        ('stdlib json', lambda d: json.dumps(d), lambda t: json.loads(t)),
+    ]
+    print('yaml backend of DataFormat: {}'.format(DataFormat.get_backend_name()))
+    fmt = '{:>8} devices  {:16}  {:8.1f} KB  parse {:10.2f} ms  dump {:10.2f} ms'
+    for total in totals:
+        devices = create_devices_info(total)
+        for name, dump, load in backends:
+            text = dump(devices)
+            dump_duration = measure(lambda: dump(devices))
+            load_duration = measure(lambda: load(text))
+            print(fmt.format(total, name, len(text) / 1024, load_duration, dump_duration))
+        sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
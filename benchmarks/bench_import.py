@@ -0,0 +1,60 @@
+"""Benchmark ``import gtunrealdevice`` while devices_info.yaml grows.
+
+Usage: python benchmarks/bench_import.py [repeat]
+"""
+
+import os
+import sys
+import statistics
+import subprocess
+import tempfile
+import time
+
+from pathlib import Path
+
+import yaml
+
+ROOT = str(Path(__file__).resolve().parent.parent)
+
+
+def create_devices_info(home, total):
+    app_directory = Path(home, '.geekstrident', 'gtunrealdevice')
+    app_directory.mkdir(parents=True, exist_ok=True)
+    devices = dict()
+    for index in range(total):
+        address = '10.{}.{}.{}'.format(index // 65536, index // 256 % 256, index % 256)
+        devices[address] = dict(
+            name='device{}'.format(index),
+            login='device{} is successfully connected.'.format(index),
+            cmdlines={'show version': 'version is 1.0.{}'.format(index)}
+        )
+    filename = Path(app_directory, 'devices_info.yaml')
+    with open(filename, 'w') as stream:
+        yaml.safe_dump(devices, stream)
+    return filename
+
+
+def measure_import(home, repeat):
+    env = dict(os.environ, HOME=home, PYTHONPATH=ROOT)
+    lst = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'import gtunrealdevice'],
+                       env=env, check=True)
+        lst.append(time.perf_counter() - start)
+    return statistics.median(lst)
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    fmt = '{:>8} devices  {:>10.1f} KB  import {:8.2f} ms'
+    for total in [0, 1000, 10000, 50000]:
+        with tempfile.TemporaryDirectory() as home:
+            filename = create_devices_info(home, total)
+            size = filename.stat().st_size / 1024
+            duration = measure_import(home, repeat)
+            print(fmt.format(total, size, duration * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark serialized size and CLI execute latency of a session.
+
+A CLI execute call reads a session from the serialized database,
+executes a command line, and writes the session back.  A legacy
+session pickles the whole device including its device data, and a
+compact session state pickles only address, name, connection status,
+output-cycling cursors, and success code.  A cursor session is not
+written back at all, and only its advanced cursor row is updated.
+
+Usage: python benchmarks/bench_session.py [output_kb ...]
+"""
+
+import sys
+import time
+import pickle
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from gtunrealdevice import core     # noqa: E402
+from gtunrealdevice.core import DevicesData     # noqa: E402
+from gtunrealdevice.core import UnrealDevice     # noqa: E402
+from gtunrealdevice.serialization import SerializedFile     # noqa: E402
+
+REPEAT = 200
+
+
+class LegacyUnrealDevice(UnrealDevice):
+    """Unreal device which is pickled with its whole state as before"""
+    def __getstate__(self):
+        return dict(self.__dict__)
+
+
+def measure_cli_execute(device, is_cursor=False):
+    address = device.address
+    SerializedFile.add_instance(address, device)
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        instance = SerializedFile.get_instance(address)
+        instance.execute('show running-config', is_timestamp=False, showed=False)
+        if is_cursor:
+            SerializedFile.update_cursors(address, instance.table)
+        else:
+            SerializedFile.add_instance(address, instance)
+    return (time.perf_counter() - start) * 1000 / REPEAT
+
+
+def main():
+    sizes = [int(i) for i in sys.argv[1:]] or [16, 1024]
+    fmt = '{:>6} KB outputs  {:8}  session {:12,d} bytes  CLI execute {:8.3f} ms'
+    with tempfile.TemporaryDirectory() as dirname:
+        SerializedFile.filename = str(Path(dirname, 'serialized_data.db'))
+        SerializedFile.legacy_filename = str(Path(dirname, 'serialized_data.yaml'))
+        for size in sizes:
+            devices_data = DevicesData()
+            devices_data.clear()
+            output = 'interface GigabitEthernet0/0\n' * (size * 1024 // 29)
+            devices_data['1.1.1.1'] = dict(cmdlines={'show running-config': [output, output],
+                                                     'show version': 'version 1'})
+            core.DEVICES_DATA = devices_data
+
+            variants = [('legacy', LegacyUnrealDevice, False),
+                        ('compact', UnrealDevice, False),
+                        ('cursor', UnrealDevice, True)]
+            for name, cls, is_cursor in variants:
+                device = cls('1.1.1.1')
+                device.connect(is_timestamp=False, showed=False)
+                duration = measure_cli_execute(device, is_cursor=is_cursor)
+                print(fmt.format(size, name, len(pickle.dumps(device)), duration))
+                sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark load, lookup, and save of yaml and sqlite devices data.
+
+Usage: python benchmarks/bench_storage.py [total ...]
+"""
+
+import sys
+import tempfile
+import time
+
+from pathlib import Path
+
+import yaml
+
+ROOT = str(Path(__file__).resolve().parent.parent)
+sys.path.insert(0, ROOT)
+
+from gtunrealdevice.config import Data                      # noqa: E402
+from gtunrealdevice.core import DevicesData                 # noqa: E402
+from gtunrealdevice.sqlitedata import SqliteDevicesData     # noqa: E402
+from gtunrealdevice.yamlcache import YamlCache              # noqa: E402
+
+
+def create_devices_info(directory, total):
+    devices = dict()
+    for index in range(total):
+        address = '10.{}.{}.{}'.format(index // 65536, index // 256 % 256, index % 256)
+        devices[address] = dict(
+            name='device{}'.format(index),
+            login='device{} is successfully connected.'.format(index),
+            cmdlines={
+                'show version': 'version is 1.0.{}'.format(index),
+                'show interfaces': '\n'.join('Gi0/{} is up'.format(i) for i in range(24)),
+            }
+        )
+    filename = str(Path(directory, 'devices_info.yaml'))
+    with open(filename, 'w') as stream:
+        yaml.safe_dump(devices, stream, default_flow_style=False)
+    return filename
+
+
+def measure(func):
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def lookup(devices_data, total):
+    for index in range(0, total, max(total // 100, 1)):
+        address = devices_data.get_address_from_name('device{}'.format(index))
+        devices_data[address]['cmdlines']['show version']
+
+
+def run_yaml(filename, total):
+    Data.devices_info_filename = filename
+    devices_data = DevicesData()
+    load = measure(devices_data.materialize)
+    find = measure(lambda: lookup(devices_data, total))
+
+    def save():
+        devices_data['10.255.255.255'] = dict(name='extra')
+        devices_data.save(filename)
+    return load, find, measure(save)
+
+
+def run_sqlite(directory, filename, total):
+    Data.devices_info_filename = filename
+    devices_data = SqliteDevicesData(str(Path(directory, 'devices_info.db')))
+    devices_data.materialize()
+    devices_data.connection.close()
+
+    devices_data = SqliteDevicesData(devices_data.db_filename)
+    load = measure(devices_data.materialize)
+    find = measure(lambda: lookup(devices_data, total))
+
+    def save():
+        devices_data['10.255.255.255'] = dict(name='extra')
+        devices_data.save()
+    return load, find, measure(save)
+
+
+def main():
+    totals = [int(i) for i in sys.argv[1:]] or [1000, 10000, 100000]
+    fmt = '{:>8} devices  {:6}  load {:10.2f} ms  lookup x100 {:8.2f} ms  save {:10.2f} ms'
+    devices_info_filename, cache_directory = Data.devices_info_filename, YamlCache.directory
+    try:
+        for total in totals:
+            with tempfile.TemporaryDirectory() as directory:
+                YamlCache.directory = str(Path(directory, 'cache'))
+                filename = create_devices_info(directory, total)
+                print(fmt.format(total, 'yaml', *run_yaml(filename, total)))
+                print(fmt.format(total, 'sqlite', *run_sqlite(directory, filename, total)))
+            sys.stdout.flush()
+    finally:
+        Data.devices_info_filename, YamlCache.directory = devices_info_filename, cache_directory
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark peak memory of loading a devices info file as a whole and streamed.
+
+The test devices info is scaled up by copying its devices under new
+addresses, and every device carries outputs of the given size.
+
+Usage: python benchmarks/bench_stream_load.py [total ...]
+"""
+
+import sys
+import time
+import tempfile
+import tracemalloc
+
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from gtunrealdevice.core import DevicesData     # noqa: E402
+from gtunrealdevice.sqlitedata import SqliteDevicesData     # noqa: E402
+from gtunrealdevice.dataformat import DataFormat     # noqa: E402
+
+OUTPUT_SIZE = 4 * 1024
+
+
+def create_devices_file(filename, total):
+    output = '\n'.join(['interface line'] * (OUTPUT_SIZE // 15))
+    with open(filename, 'w') as stream:
+        for index in range(total):
+            address = '10.{}.{}.{}'.format(index // 65536, index // 256 % 256, index % 256)
+            node = dict(name='device{}'.format(index),
+                        cmdlines={'show run': output, 'show version': 'version {}'.format(index)})
+            DataFormat.dump({address: node}, stream)
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    duration = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duration * 1000, peak / 1024 / 1024
+
+
+def load_whole(filename):
+    devices_data = DevicesData()
+    devices_data.clear()
+    devices_data.stream_min_size = float('inf')
+    devices_data.load(filename)
+
+
+def load_streamed(filename):
+    devices_data = DevicesData()
+    devices_data.clear()
+    devices_data.stream_min_size = 0
+    devices_data.load(filename)
+
+
+def load_sqlite(filename):
+    devices_data = SqliteDevicesData(':memory:')
+    devices_data.clear()
+    devices_data.load(filename)
+    devices_data.connection.close()
+
+
+def main():
+    totals = [int(i) for i in sys.argv[1:]] or [1000, 5000]
+    loaders = [('whole', load_whole), ('streamed', load_streamed), ('sqlite streamed', load_sqlite)]
+    fmt = '{:>8} devices  {:8.1f} MB  {:16}  {:10.2f} ms  peak {:8.1f} MB'
+    with tempfile.TemporaryDirectory() as dirname:
+        for total in totals:
+            filename = str(Path(dirname, 'devices_info_{}.yaml'.format(total)))
+            create_devices_file(filename, total)
+            size = Path(filename).stat().st_size / 1024 / 1024
+            for name, load in loaders:
+                duration, peak = measure(lambda: load(filename))
+                print(fmt.format(total, size, name, duration, peak))
+            sys.stdout.flush()
+
+
+if __name__ == '__main__':
+    main()
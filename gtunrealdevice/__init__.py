@@ -1,21 +1,32 @@
 """Top-level module for gtunrealdevice.
 
+Public names are imported from their modules on first access, so
+``import gtunrealdevice`` does not import yaml, asyncio, or
+concurrent.futures until they are used.
 """
-from gtunrealdevice.core import UnrealDevice
-from gtunrealdevice.core import create
-from gtunrealdevice.core import connect
-from gtunrealdevice.core import disconnect
-from gtunrealdevice.core import execute
-from gtunrealdevice.core import configure
+import sys
 
-from gtunrealdevice.config import version
-from gtunrealdevice.config import edition
-
-__version__ = version
-__edition__ = edition
+_exports = dict(
+    UnrealDevice='gtunrealdevice.core',
+    create='gtunrealdevice.core',
+    connect='gtunrealdevice.core',
+    disconnect='gtunrealdevice.core',
+    execute='gtunrealdevice.core',
+    configure='gtunrealdevice.core',
+    AsyncUnrealDevice='gtunrealdevice.asyncdevice',
+    DeviceGroup='gtunrealdevice.fleet',
+    MemoryMode='gtunrealdevice.memorymode',
+    version='gtunrealdevice.config',
+    edition='gtunrealdevice.config',
+    __version__='gtunrealdevice.config',
+    __edition__='gtunrealdevice.config',
+)
 
 __all__ = [
     'UnrealDevice',
+    'AsyncUnrealDevice',
+    'DeviceGroup',
+    'MemoryMode',
     'create',
     'connect',
     'disconnect',
@@ -24,3 +35,22 @@ __all__ = [
     'version',
     'edition',
 ]
+
+
+def __getattr__(name):
+    if name not in _exports:
+        fmt = 'module {!r} has no attribute {!r}'
+        raise AttributeError(fmt.format(__name__, name))
+    import importlib
+    value = getattr(importlib.import_module(_exports[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports))
+
+
+if sys.version_info < (3, 7):   # pragma: no cover
+    for _name in _exports:
+        __getattr__(_name)
@@ -1,5 +1,4 @@
 
-from gtunrealdevice.main import Cli
+from gtunrealdevice.client import execute
 
-console = Cli()
-console.run()
+execute()
@@ -0,0 +1,174 @@
+"""Module containing the logic for AsyncUnrealDevice."""
+
+import asyncio
+import functools
+import threading
+
+from gtunrealdevice.core import UnrealDevice
+from gtunrealdevice.core import DEVICES_DATA
+
+
+class AsyncUnrealDevice:
+    """Async Unreal Device class
+
+    AsyncUnrealDevice wraps UnrealDevice with coroutine methods.  It shares
+    DEVICES_DATA with UnrealDevice, never prints to stdout, and optionally
+    simulates latency of a real device without blocking the event loop.
+    A connection which loads or saves devices info, and a reconnection,
+    run in the default executor of the running event loop, so file I/O
+    and file locking never block the event loop.
+
+    Attributes
+    ----------
+    address (str): an address of device
+    name (str): name of device
+    latency (float): simulated latency in seconds per operation.  Default is 0.
+    kwargs (dict): keyword arguments
+
+    Properties
+    ----------
+    is_connected -> bool
+    success_code -> int
+
+    Methods
+    -------
+    connect(**kwargs) -> bool
+    reconnect(**kwargs) -> bool
+    disconnect(**kwargs) -> bool
+    execute(cmdline, **kwargs) -> str
+    configure(config, **kwargs) -> str
+    """
+    _connect_lock = threading.Lock()
+
+    def __init__(self, address, name='', latency=0, **kwargs):
+        self.device = UnrealDevice(address, name=name, **kwargs)
+        self.latency = latency
+
+    @property
+    def address(self):
+        return self.device.address
+
+    @property
+    def name(self):
+        return self.device.name
+
+    @property
+    def is_connected(self):
+        """Return device connection status"""
+        return self.device.is_connected
+
+    @property
+    def success_code(self):
+        return self.device.success_code
+
+    async def simulate_latency(self, latency=None):
+        latency = self.latency if latency is None else latency
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+    async def connect(self, default=True, latency=None, **kwargs):
+        """Connect an unreal device
+
+        Parameters
+        ----------
+        default (bool): connect to default device if host is not found.
+        latency (float): simulated latency in seconds.  Default is self.latency.
+        kwargs (dict): keyword arguments
+
+        Returns
+        -------
+        bool: connection status
+        """
+        await self.simulate_latency(latency)
+        kwargs.update(showed=False)
+        if DEVICES_DATA.is_loaded and self.address in DEVICES_DATA:
+            return self.device.connect(default=default, **kwargs)
+
+        loop = asyncio.get_running_loop()
+        func = functools.partial(self.connect_device, default=default, **kwargs)
+        result = await loop.run_in_executor(None, func)
+        return result
+
+    def connect_device(self, default=True, **kwargs):
+        """Connect an unreal device whose connection may load devices info
+        or save an auto-generated device.  Such connections are serialized."""
+        with self._connect_lock:
+            return self.device.connect(default=default, **kwargs)
+
+    def reconnect_device(self, **kwargs):
+        """Reconnect an unreal device.  A reconnection is serialized with
+        connections because it connects the device again."""
+        with self._connect_lock:
+            return self.device.reconnect(**kwargs)
+
+    async def reconnect(self, latency=None, **kwargs):
+        """Reconnect an unreal device
+
+        Parameters
+        ----------
+        latency (float): simulated latency in seconds.  Default is self.latency.
+        kwargs (dict): keyword arguments
+
+        Returns
+        -------
+        bool: connection status
+        """
+        await self.simulate_latency(latency)
+        kwargs.update(showed=False)
+        loop = asyncio.get_running_loop()
+        func = functools.partial(self.reconnect_device, **kwargs)
+        result = await loop.run_in_executor(None, func)
+        return result
+
+    async def disconnect(self, latency=None, **kwargs):
+        """Disconnect an unreal device
+
+        Parameters
+        ----------
+        latency (float): simulated latency in seconds.  Default is self.latency.
+        kwargs (dict): keyword arguments
+
+        Returns
+        -------
+        bool: disconnection status
+        """
+        await self.simulate_latency(latency)
+        kwargs.update(showed=False)
+        result = self.device.disconnect(**kwargs)
+        return result
+
+    async def execute(self, cmdline, latency=None, **kwargs):
+        """Execute command line for an unreal device
+
+        Parameters
+        ----------
+        cmdline (str): command line
+        latency (float): simulated latency in seconds.  Default is self.latency.
+        kwargs (dict): keyword arguments
+
+        Returns
+        -------
+        str: output of a command line
+        """
+        await self.simulate_latency(latency)
+        kwargs.update(showed=False)
+        output = self.device.execute(cmdline, **kwargs)
+        return output
+
+    async def configure(self, config, latency=None, **kwargs):
+        """Configure an unreal device
+
+        Parameters
+        ----------
+        config (str): configuration data for device
+        latency (float): simulated latency in seconds.  Default is self.latency.
+        kwargs (dict): keyword arguments
+
+        Returns
+        -------
+        str: result of configuration
+        """
+        await self.simulate_latency(latency)
+        kwargs.update(showed=False)
+        result = self.device.configure(config, **kwargs)
+        return result
@@ -0,0 +1,112 @@
+"""Module containing the thin console client of gtunrealdevice.
+
+The unreal-device console entry point forwards a command to a running
+unreal-device daemon before devices data, yaml, or any console module
+is imported, so a forwarded command only costs an interpreter start and
+a round trip over the daemon socket.  If the daemon is not running, the
+command is processed in-process by gtunrealdevice.main.Cli.
+"""
+
+import os
+import sys
+import json
+import socket
+
+ECODE_BAD = 1   # ECODE.BAD without importing gtunrealdevice.constant
+
+
+class Client:
+    """Thin client of unreal-device daemon
+
+    Attributes
+    ----------
+    filename (str): a daemon socket file name
+    commands (list): console commands which are forwarded to daemon
+
+    Methods
+    -------
+    Client.is_supported() -> bool
+    Client.get_command(args) -> str
+    Client.send(request, timeout=None, filename='') -> dict
+    Client.forward(args, filename='') -> int or None
+    """
+    filename = os.path.join(os.path.expanduser('~'), '.geekstrident',
+                            'gtunrealdevice', 'daemon.sock')
+    commands = ['configure', 'connect', 'destroy', 'disconnect', 'execute',
+                'info', 'list', 'load', 'release', 'reload', 'usage',
+                'version', 'view']
+
+    @classmethod
+    def is_supported(cls):
+        return hasattr(socket, 'AF_UNIX')
+
+    @classmethod
+    def get_command(cls, args):
+        command = args[0].strip().lower() if args else ''
+        return command if command in cls.commands else ''
+
+    @classmethod
+    def send(cls, request, timeout=None, filename=''):
+        """Send a request to daemon
+
+        Parameters
+        ----------
+        request (dict): a request
+        timeout (float): socket timeout in seconds.  Default is None.
+        filename (str): a daemon socket file name.  Default is Client.filename.
+
+        Returns
+        -------
+        dict: a response from daemon
+
+        Raises
+        ------
+        OSError: raise exception if daemon is unavailable
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(filename or cls.filename)
+            sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as stream:
+                response = json.loads(stream.readline().decode('utf-8'))
+                return response
+
+    @classmethod
+    def forward(cls, args, filename=''):
+        """Forward console arguments to daemon if it is running
+
+        Parameters
+        ----------
+        args (list): a list of console arguments
+        filename (str): a daemon socket file name.  Default is Client.filename.
+
+        Returns
+        -------
+        int: exit code of forwarded command or None if daemon is not running
+        """
+        filename = filename or cls.filename
+        if not cls.is_supported() or not os.path.exists(filename):
+            return None
+
+        request = dict(action='execute', args=list(args), cwd=os.getcwd())
+        try:
+            response = cls.send(request, filename=filename)
+        except (OSError, ValueError):
+            return None
+
+        sys.stdout.write(response.get('output', ''))
+        sys.stderr.write(response.get('error', ''))
+        sys.stdout.flush()
+        return response.get('exit_code', ECODE_BAD)
+
+
+def execute():
+    """Execute gtunrealdevice console CLI through daemon if it is running."""
+    args = sys.argv[1:]
+    if Client.get_command(args):
+        exit_code = Client.forward(args)
+        if isinstance(exit_code, int):
+            sys.exit(exit_code)
+
+    from gtunrealdevice.main import Cli
+    Cli(args, is_forwarding=False).run()
@@ -0,0 +1,553 @@
+"""Module containing the logic for command line index of unreal device."""
+
+import re
+
+from bisect import bisect_left
+
+
+class CommandNode:
+    """A node of command token trie
+
+    Attributes
+    ----------
+    children (dict): a mapping of token to child node
+    cmdline (str): an original command line if node is terminal, otherwise, None
+    count (int): a total of terminal nodes in this subtree
+    """
+    __slots__ = ('children', 'cmdline', 'count', '_tokens', '_abbreviations')
+
+    def __init__(self):
+        self.children = dict()
+        self.cmdline = None
+        self.count = 0
+        self._tokens = None
+        self._abbreviations = None
+
+    def reset(self):
+        """Reset precomputed data of children"""
+        self._tokens = None
+        self._abbreviations = None
+
+    @property
+    def tokens(self):
+        """Return sorted tokens of children"""
+        if self._tokens is None:
+            self._tokens = sorted(self.children)
+        return self._tokens
+
+    @property
+    def abbreviations(self):
+        """Return a mapping of token abbreviation to token of children.
+
+        An abbreviation of more than one token is mapped to None, i.e.
+        ambiguous, unless it is also a complete token.
+        """
+        if self._abbreviations is None:
+            tbl = dict()
+            for token in self.children:
+                for index in range(1, len(token) + 1):
+                    abbreviation = token[:index]
+                    tbl[abbreviation] = None if abbreviation in tbl else token
+            tbl.update((token, token) for token in self.children)
+            self._abbreviations = tbl
+        return self._abbreviations
+
+    def find_children(self, prefix, limit=2):
+        """Find children whose token starts with prefix
+
+        Parameters
+        ----------
+        prefix (str): a token prefix
+        limit (int): a maximum number of children to find.  Default is 2.
+
+        Returns
+        -------
+        list: a list of child nodes
+        """
+        tokens = self.tokens
+        index = bisect_left(tokens, prefix)
+        lst = []
+        while index < len(tokens) and len(lst) < limit:
+            token = tokens[index]
+            if not token.startswith(prefix):
+                break
+            lst.append(self.children[token])
+            index += 1
+        return lst
+
+    def get_unique_cmdline(self, is_included=True):
+        """Get command line of unique terminal node of this subtree
+
+        Parameters
+        ----------
+        is_included (bool): including this node as a candidate.  Default is True.
+
+        Returns
+        -------
+        str: a command line if subtree has exactly one terminal, otherwise, None
+        """
+        node = self
+        if not is_included and node.cmdline is not None:
+            if node.count != 2:
+                return None
+            node = next(child for child in node.children.values() if child.count)
+
+        if node.count != 1:
+            return None
+
+        while node.cmdline is None:
+            node = next(child for child in node.children.values() if child.count)
+        return node.cmdline
+
+
+class CommandPattern:
+    """A parameterized command line
+
+    A pattern is either a command line with placeholders, e.g.
+    "show interface {ifname}", or a regular expression with prefix regex::,
+    e.g. "regex::show interface (?P<ifname>Gi\\S+)".
+
+    A leading global flag of a regular expression, e.g. (?i), is scoped
+    to the pattern, and a numbered backreference, e.g. \\1, is rejected
+    because group numbers change in a combined regular expression.
+
+    Attributes
+    ----------
+    cmdline (str): an original command line
+    pattern (str): a regular expression of command line
+    names (list): a list of captured names
+
+    Raises
+    ------
+    re.error: raise exception if command line is an invalid regular expression
+    """
+    placeholder_pattern = r'\{(?P<name>[a-zA-Z_]\w*)\}'
+    regex_prefix_pattern = r'(?i)regex::'
+    flags_pattern = r'\(\?(?P<flags>[imsx]+)\)'
+
+    def __init__(self, cmdline):
+        self.cmdline = cmdline
+        match = re.match(self.regex_prefix_pattern, cmdline)
+        if match:
+            pattern = cmdline[match.end():].strip()
+            flags = re.match(self.flags_pattern, pattern)
+            if flags:
+                pattern = '(?{}:{})'.format(flags.group('flags'), pattern[flags.end():])
+            if self.has_numbered_reference(pattern):
+                raise re.error('numbered group reference is unsupported', pattern=pattern)
+            self.pattern = pattern
+        else:
+            lst = []
+            start = 0
+            text = cmdline.strip()
+            for m in re.finditer(self.placeholder_pattern, text):
+                lst.append(self.escape(text[start:m.start()]))
+                lst.append(r'(?P<{}>\S+)'.format(m.group('name')))
+                start = m.end()
+            lst.append(self.escape(text[start:]))
+            self.pattern = ''.join(lst)
+        self.names = list(re.compile(self.pattern).groupindex)
+        re.compile(self.get_combined_pattern(0))
+
+    @classmethod
+    def has_numbered_reference(cls, pattern):
+        """Check if a regular expression refers to a group by its number,
+        i.e. a \\1 backreference or a (?(1)...) conditional
+
+        Parameters
+        ----------
+        pattern (str): a regular expression
+
+        Returns
+        -------
+        bool: True if pattern has a numbered group reference, otherwise, False.
+        """
+        index, size, is_class = 0, len(pattern), False
+        while index < size:
+            char = pattern[index]
+            if char == '\\':
+                is_ref = re.match(r'\\[1-9]', pattern[index:index + 2])
+                is_octal = re.match(r'\\[0-7]{3}', pattern[index:index + 4])
+                if is_ref and not is_octal and not is_class:
+                    return True
+                index += 2
+                continue
+            if is_class:
+                is_class = char != ']'
+            elif char == '[':
+                is_class = True
+                index += 1
+                index += pattern.startswith('^', index)
+                index += pattern.startswith(']', index)
+                continue
+            elif re.match(r'\(\?\(\d', pattern[index:index + 4]):
+                return True
+            index += 1
+        return False
+
+    @classmethod
+    def escape(cls, text):
+        return r'\s+'.join(re.escape(item) for item in re.split(' +', text))
+
+    @classmethod
+    def is_pattern(cls, cmdline):
+        """Check if command line is a parameterized command line
+
+        Parameters
+        ----------
+        cmdline (str): a command line
+
+        Returns
+        -------
+        bool: True if cmdline is a parameterized command line, otherwise, False.
+        """
+        if not isinstance(cmdline, str):
+            return False
+        is_regex = bool(re.match(cls.regex_prefix_pattern, cmdline))
+        return is_regex or bool(re.search(cls.placeholder_pattern, cmdline))
+
+    def get_combined_pattern(self, index):
+        """Get a regular expression whose named groups are unique per index
+
+        Parameters
+        ----------
+        index (int): an index of pattern in a combined pattern
+
+        Returns
+        -------
+        str: a regular expression
+        """
+        prefix = '_p{}_'.format(index)
+        pattern = re.sub(r'\(\?P<(?P<name>\w+)>', r'(?P<{}\g<name>>'.format(prefix), self.pattern)
+        pattern = re.sub(r'\(\?P=(?P<name>\w+)\)', r'(?P={}\g<name>)'.format(prefix), pattern)
+        return '(?P<_p{}>{})'.format(index, pattern)
+
+
+class CommandIndex:
+    """Command line index of unreal device
+
+    The index is a token trie over command lines with normalized whitespace.
+    It resolves exact, simplified, plural, unique-prefix, and token-wise
+    abbreviated command lines, e.g. "sh ip int br", in time proportional
+    to the length of the command line.  Parameterized command lines are
+    compiled into a single combined regular expression, and a full match
+    of them wins over a unique-prefix or abbreviated command line.
+
+    Attributes
+    ----------
+    cmdlines (dict): command lines of a device
+    simplified_cmdlines (dict): a mapping of normalized command line to
+            original command line
+    patterns (dict): a mapping of parameterized command line to CommandPattern
+    invalid_patterns (dict): a mapping of parameterized command line which
+            is an invalid regular expression to its error.  It is skipped
+            by match_pattern.
+    size (int): a number of indexed command lines
+
+    Methods
+    -------
+    CommandIndex.normalize(cmdline) -> str
+    is_built_from(cmdlines) -> bool
+    add(cmdline) -> None
+    remove(cmdline) -> None
+    search(cmdline) -> str
+    resolve(cmdline) -> tuple
+    search_prefix(cmdline) -> str
+    resolve_abbreviation(cmdline) -> tuple
+    match_pattern(cmdline) -> tuple
+    """
+    FOUND = 'found'
+    AMBIGUOUS = 'ambiguous'
+    INCOMPLETE = 'incomplete'
+    UNKNOWN = 'unknown'
+
+    def __init__(self, cmdlines=None):
+        self.cmdlines = dict() if cmdlines is None else cmdlines
+        self.simplified_cmdlines = dict()
+        self.patterns = dict()
+        self.invalid_patterns = dict()
+        self.root = CommandNode()
+        self.size = 0
+        self._keys = set()
+        self._matcher = None
+        self._pattern_list = None
+        for cmdline in self.cmdlines:
+            self.add(cmdline)
+
+    @classmethod
+    def normalize(cls, cmdline):
+        return re.sub(' +', ' ', str(cmdline))
+
+    def is_built_from(self, cmdlines):
+        """Check if index is up-to-date with command lines
+
+        Parameters
+        ----------
+        cmdlines (dict): command lines of a device
+
+        Returns
+        -------
+        bool: True if index is built from cmdlines and has same command
+                lines, i.e. cmdlines is not changed in place since then
+        """
+        if self.cmdlines is not cmdlines or len(self._keys) != len(cmdlines):
+            return False
+        return self._keys == cmdlines.keys()
+
+    def add(self, cmdline):
+        """Add a command line to index
+
+        Parameters
+        ----------
+        cmdline (str): a command line
+        """
+        self._keys.add(cmdline)
+        if not isinstance(cmdline, str):
+            return
+
+        if CommandPattern.is_pattern(cmdline):
+            if cmdline in self.patterns or cmdline in self.invalid_patterns:
+                return
+            try:
+                self.patterns[cmdline] = CommandPattern(cmdline)
+                self._matcher = None
+            except re.error as ex:
+                self.invalid_patterns[cmdline] = 'Invalid regular expression - {}'.format(ex)
+            self.size += 1
+            return
+
+        tokens = cmdline.split()
+        node = self.root
+        path = [node]
+        for token in tokens:
+            child = node.children.get(token)
+            if child is None:
+                child = CommandNode()
+                node.children[token] = child
+                node.reset()
+            node = child
+            path.append(node)
+
+        if node.cmdline is not None:
+            return
+
+        node.cmdline = cmdline
+        for item in path:
+            item.count += 1
+        self.simplified_cmdlines.setdefault(self.normalize(cmdline), cmdline)
+        self.size += 1
+
+    def remove(self, cmdline):
+        """Remove a command line from index
+
+        Parameters
+        ----------
+        cmdline (str): a command line
+        """
+        self._keys.discard(cmdline)
+        if not isinstance(cmdline, str):
+            return
+
+        if cmdline in self.patterns:
+            self.patterns.pop(cmdline)
+            self._matcher = None
+            self.size -= 1
+            return
+
+        if cmdline in self.invalid_patterns:
+            self.invalid_patterns.pop(cmdline)
+            self.size -= 1
+            return
+
+        tokens = cmdline.split()
+        node = self.root
+        path = [node]
+        for token in tokens:
+            node = node.children.get(token)
+            if node is None:
+                return
+            path.append(node)
+
+        if node.cmdline != cmdline:
+            return
+
+        node.cmdline = None
+        for item in path:
+            item.count -= 1
+
+        for parent, token in zip(reversed(path[:-1]), reversed(tokens)):
+            if parent.children[token].count:
+                break
+            parent.children.pop(token)
+            parent.reset()
+
+        simplified_cmdline = self.normalize(cmdline)
+        if self.simplified_cmdlines.get(simplified_cmdline) == cmdline:
+            self.simplified_cmdlines.pop(simplified_cmdline)
+        self.size -= 1
+
+    def search(self, cmdline):
+        """Get the full command line per requesting command line
+
+        Parameters
+        ----------
+        cmdline (str): a command line
+
+        Returns
+        -------
+        str: the full command line if found, otherwise, cmdline
+        """
+        result, _ = self.resolve(cmdline)
+        return result
+
+    def resolve(self, cmdline):
+        """Get the full command line per requesting command line with
+        captured values if it matches a parameterized command line
+
+        Parameters
+        ----------
+        cmdline (str): a command line
+
+        Returns
+        -------
+        tuple: the full command line if found, otherwise, cmdline, and
+                a dict of captured values
+        """
+        if not cmdline.strip():
+            return cmdline, dict()
+
+        for other_cmdline in [cmdline, cmdline + 's', cmdline + 'es']:
+            if other_cmdline in self.cmdlines:
+                return other_cmdline, dict()
+
+        simplified_cmdline = self.normalize(cmdline)
+        for other_cmdline in [simplified_cmdline, simplified_cmdline + 's',
+                              simplified_cmdline + 'es']:
+            if other_cmdline in self.simplified_cmdlines:
+                return self.simplified_cmdlines[other_cmdline], dict()
+
+        if self.patterns:
+            result, captures = self.match_pattern(cmdline)
+            if result is not None:
+                return result, captures
+
+        result = self.search_prefix(cmdline)
+        if result is None:
+            result, _ = self.resolve_abbreviation(cmdline)
+        return cmdline if result is None else result, dict()
+
+    def search_prefix(self, cmdline):
+        """Get the unique command line which starts with requesting command line
+
+        Parameters
+        ----------
+        cmdline (str): a command line
+
+        Returns
+        -------
+        str: the full command line if it is unique, otherwise, None
+        """
+        tokens = cmdline.split()
+        if not tokens:
+            return None
+
+        node = self.root
+        for token in tokens[:-1]:
+            node = node.children.get(token)
+            if node is None:
+                return None
+
+        if cmdline[-1].isspace():
+            node = node.children.get(tokens[-1])
+            return node.get_unique_cmdline(is_included=False) if node else None
+
+        children = node.find_children(tokens[-1])
+        if len(children) != 1:
+            return None
+        return children[0].get_unique_cmdline()
+
+    def resolve_abbreviation(self, cmdline):
+        """Resolve a command line whose tokens are abbreviated
+
+        Each token is resolved with the precomputed abbreviations of its
+        parent node, e.g. "sh ip int br" is resolved to
+        "show ip interface brief".
+
+        Parameters
+        ----------
+        cmdline (str): a command line
+
+        Returns
+        -------
+        tuple: a full command line or None, and a status which is
+                either found, ambiguous, incomplete, or unknown
+        """
+        tokens = cmdline.split()
+        if not tokens:
+            return None, self.UNKNOWN
+
+        node = self.root
+        for token in tokens:
+            if token not in node.abbreviations:
+                return None, self.UNKNOWN
+            full_token = node.abbreviations[token]
+            if full_token is None:
+                return None, self.AMBIGUOUS
+            node = node.children[full_token]
+
+        result = node.cmdline if node.cmdline is not None else node.get_unique_cmdline()
+
+        if result is None:
+            return None, self.INCOMPLETE
+        return result, self.FOUND
+
+    @property
+    def matcher(self):
+        """Return a combined regular expression of all patterns"""
+        if self._matcher is None:
+            self._pattern_list = list(self.patterns.values())
+            lst = [item.get_combined_pattern(i) for i, item in enumerate(self._pattern_list)]
+            self._matcher = re.compile('|'.join(lst)) if lst else None
+        return self._matcher
+
+    def match_pattern(self, cmdline):
+        """Match command line against parameterized command lines
+
+        Parameters
+        ----------
+        cmdline (str): a command line
+
+        Returns
+        -------
+        tuple: a parameterized command line or None, and a dict of captured values
+        """
+        matcher = self.matcher
+        match = matcher.fullmatch(cmdline.strip()) if matcher else None
+        if not match:
+            return None, dict()
+
+        index = int(match.lastgroup[2:])
+        pattern = self._pattern_list[index]
+        prefix = '_p{}_'.format(index)
+        captures = {name: match.group(prefix + name) for name in pattern.names}
+        return pattern.cmdline, captures
+
+    @classmethod
+    def substitute(cls, output, captures):
+        """Substitute {name} placeholders of output with captured values
+
+        Parameters
+        ----------
+        output (str): an output of command line
+        captures (dict): a dict of captured values
+
+        Returns
+        -------
+        str: a substituted output
+        """
+        if not captures or not isinstance(output, str):
+            return output
+
+        pattern = r'\{(%s)\}' % '|'.join(re.escape(name) for name in captures)
+        result = re.sub(pattern, lambda m: str(captures[m.group(1)] or ''), output)
+        return result
@@ -0,0 +1,185 @@
+"""Module containing the compressed storage of large command outputs.
+
+An output which is not smaller than a size threshold is kept compressed
+with zlib, lzma, or bz2 codec in devices data, in its parsed yaml cache,
+and in devices_info.yaml, e.g.
+
+    show tech-support: !compressed:zlib |-
+      eJzLSM3JyVcozy/KSQEAGgQEXQ==
+
+A compressed output is decompressed on demand, e.g. by
+UnrealDevice.execute, and decompressed outputs are kept in a bounded
+LRU cache.
+"""
+
+import bz2
+import lzma
+import zlib
+import base64
+import threading
+from collections import OrderedDict
+
+from yaml.constructor import ConstructorError
+
+from gtunrealdevice.dataformat import DataFormat
+
+TAG_PREFIX = '!compressed:'
+
+
+class CompressedOutput:
+    """Compressed command output
+
+    Attributes
+    ----------
+    codecs (dict): supported codecs, i.e. zlib, lzma, and bz2
+    cache_max_size (int): a maximum total length of cached decompressed outputs
+    codec (str): a codec name
+    data (bytes): compressed data
+    is_binary (bool): True if output is binary, otherwise, False.
+
+    Methods
+    -------
+    decompress() -> str or bytes
+    CompressedOutput.compress(output, codec) -> CompressedOutput
+    CompressedOutput.expand(obj) -> object
+    CompressedOutput.clear_cache() -> None
+    """
+    __slots__ = ('codec', 'data', 'is_binary')
+
+    codecs = dict(zlib=zlib, lzma=lzma, bz2=bz2)
+    cache_max_size = 64 * 1024 * 1024
+    _cache = OrderedDict()
+    _cache_size = 0
+    _lock = threading.Lock()
+
+    def __init__(self, codec, data, is_binary=False):
+        self.codec = codec
+        self.data = data
+        self.is_binary = is_binary
+
+    def __eq__(self, other):
+        if not isinstance(other, CompressedOutput):
+            return NotImplemented
+        return (self.codec, self.data, self.is_binary) == (other.codec, other.data, other.is_binary)
+
+    def __hash__(self):
+        return hash((self.codec, self.data, self.is_binary))
+
+    def __str__(self):
+        return str(self.decompress())
+
+    def __repr__(self):
+        fmt = '{}(codec={!r}, size={})'
+        return fmt.format(type(self).__name__, self.codec, len(self.data))
+
+    def __getstate__(self):
+        return self.codec, self.data, self.is_binary
+
+    def __setstate__(self, state):
+        self.codec, self.data, self.is_binary = state
+
+    def decompress(self):
+        """Decompress output through the LRU cache of decompressed outputs
+
+        Returns
+        -------
+        str or bytes: an output
+        """
+        cls = type(self)
+        with cls._lock:
+            output = cls._cache.get(self)
+            if output is not None:
+                cls._cache.move_to_end(self)
+                return output
+
+        output = self.codecs[self.codec].decompress(self.data)
+        output = output if self.is_binary else output.decode('utf-8', 'surrogatepass')
+
+        if len(output) <= cls.cache_max_size:
+            with cls._lock:
+                if self not in cls._cache:
+                    cls._cache[self] = output
+                    cls._cache_size += len(output)
+                while cls._cache_size > cls.cache_max_size:
+                    _, item = cls._cache.popitem(last=False)
+                    cls._cache_size -= len(item)
+        return output
+
+    @classmethod
+    def compress(cls, output, codec):
+        """Compress a text or binary output
+
+        Parameters
+        ----------
+        output (str, bytes): an output
+        codec (str): a codec name, i.e. zlib, lzma, or bz2
+
+        Returns
+        -------
+        CompressedOutput: a compressed output
+        """
+        is_binary = isinstance(output, bytes)
+        data = output if is_binary else output.encode('utf-8', 'surrogatepass')
+        return cls(codec, cls.codecs[codec].compress(data), is_binary=is_binary)
+
+    @classmethod
+    def expand(cls, obj):
+        """Replace compressed outputs with decompressed outputs
+
+        Parameters
+        ----------
+        obj (object): an output, a device info, or a devices info
+
+        Returns
+        -------
+        object: obj itself if it has no compressed output, otherwise, a new
+                object whose compressed outputs are decompressed
+        """
+        if isinstance(obj, CompressedOutput):
+            return obj.decompress()
+        if isinstance(obj, dict):
+            result = {key: cls.expand(value) for key, value in obj.items()}
+            return obj if all(result[key] is value for key, value in obj.items()) else result
+        if isinstance(obj, list):
+            result = [cls.expand(item) for item in obj]
+            return obj if all(i is j for i, j in zip(result, obj)) else result
+        return obj
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._cache.clear()
+            cls._cache_size = 0
+
+
+def represent_compressed_output(dumper, data):
+    suffix = '{}:binary'.format(data.codec) if data.is_binary else data.codec
+    text = base64.encodebytes(data.data).decode('ascii')
+    return dumper.represent_scalar(TAG_PREFIX + suffix, text, style='|')
+
+
+def construct_compressed_output(loader, tag_suffix, node):
+    codec, _, kind = tag_suffix.partition(':')
+    if codec not in CompressedOutput.codecs:
+        problem = 'unsupported {!r} codec of compressed output'.format(codec)
+        raise ConstructorError(None, None, problem, node.start_mark)
+    text = loader.construct_scalar(node)
+    data = base64.decodebytes(text.encode('ascii'))
+    return CompressedOutput(codec, data, is_binary=kind == 'binary')
+
+
+def encode_compressed_output(data):
+    return [data.codec, base64.b64encode(data.data).decode('ascii'), data.is_binary]
+
+
+def decode_compressed_output(value):
+    codec, text, is_binary = value
+    if codec not in CompressedOutput.codecs:
+        raise ValueError('unsupported {!r} codec of compressed output'.format(codec))
+    return CompressedOutput(codec, base64.b64decode(text.encode('ascii')), is_binary=is_binary)
+
+
+DataFormat.add_representer(CompressedOutput, represent_compressed_output)
+DataFormat.add_multi_constructor(TAG_PREFIX, construct_compressed_output)
+DataFormat.add_json_type('compressed', CompressedOutput,
+                         encode_compressed_output, decode_compressed_output)
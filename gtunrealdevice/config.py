@@ -3,9 +3,11 @@
 import yaml
 
 from os import path
+from os import environ
 from textwrap import dedent
 
 from gtunrealdevice.utils import File
+from gtunrealdevice.dataformat import DataFormat
 
 __version__ = '0.2.9'
 version = __version__
@@ -27,6 +29,23 @@ class Data:
     app_directory = File.get_path('.geekstrident', 'gtunrealdevice', is_home=True)
     devices_info_filename = File.get_path(app_directory, 'devices_info.yaml')
     serialized_filename = File.get_path(app_directory, 'serialized_data.yaml')
+    serialized_db_filename = File.get_path(app_directory, 'serialized_data.db')
+    daemon_socket_filename = File.get_path(app_directory, 'daemon.sock')
+    devices_db_filename = File.get_path(app_directory, 'devices_info.db')
+    cache_directory = File.get_path(app_directory, 'cache')
+
+    # storage backend of devices info, i.e. yaml or sqlite
+    storage_backend = environ.get('GTUNREALDEVICE_STORAGE', 'yaml').strip().lower()
+
+    # validating parsed yaml cache with content hash
+    is_cache_hashed = environ.get('GTUNREALDEVICE_CACHE_HASH', '').strip().lower() in ['1', 'true', 'yes']
+
+    # compressing large outputs of devices info with zlib, lzma, or bz2 codec
+    output_codec = environ.get('GTUNREALDEVICE_COMPRESSION', '').strip().lower()
+    compression_min_size = int(environ.get('GTUNREALDEVICE_COMPRESSION_MIN_SIZE', '') or 64 * 1024)
+
+    # keeping devices info and sessions in memory without any disk write
+    is_in_memory = environ.get('GTUNREALDEVICE_IN_MEMORY', '').strip().lower() in ['1', 'true', 'yes']
 
     # app sample data
     sample_devices_info_text = dedent("""
@@ -136,7 +155,7 @@ class Data:
     def get_dependency(cls):
         dependencies = dict(
             pyyaml=dict(
-                package='pyyaml v{}'.format(yaml.__version__),
+                package='pyyaml v{} ({})'.format(yaml.__version__, DataFormat.get_backend_name()),
                 url='https://pypi.org/project/PyYAML/'
             ),
         )
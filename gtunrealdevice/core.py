@@ -1,7 +1,10 @@
 """Module containing the logic for UnrealDevice."""
 import re
+import os
+import json
+import tempfile
+import contextlib
 
-import yaml
 import functools
 from os import path
 from datetime import datetime
@@ -11,6 +14,7 @@ from gtunrealdevice.exceptions import WrapperError
 from gtunrealdevice.exceptions import DevicesInfoError
 from gtunrealdevice.exceptions import UnrealDeviceConnectionError
 from gtunrealdevice.exceptions import UnrealDeviceOfflineError
+from gtunrealdevice.exceptions import OutputPipeError
 
 from gtunrealdevice.utils import Printer
 from gtunrealdevice.utils import Misc
@@ -21,6 +25,15 @@ from gtunrealdevice.constant import ECODE
 from gtunrealdevice.baredevice import create_bare_device_info
 from gtunrealdevice.baredevice import get_builtin_output
 
+from gtunrealdevice.cmdindex import CommandIndex
+from gtunrealdevice.pipe import OutputPipe
+from gtunrealdevice.yamlcache import YamlCache
+from gtunrealdevice.outputpool import OutputPool
+from gtunrealdevice.compression import CompressedOutput
+from gtunrealdevice.fileoutput import FileOutput
+from gtunrealdevice.filelock import FileLock
+from gtunrealdevice.dataformat import DataFormat
+
 
 def check_active_device(func):
     """Wrapper for UnrealDevice methods.
@@ -58,17 +71,395 @@ def check_active_device(func):
     return wrapper_func
 
 
+MISSING = object()
+
+
+def materialized(func):
+    """Wrapper for DevicesData methods which need devices info loaded.
+
+    Parameters
+    ----------
+    func (function): a callable function
+
+    Returns
+    -------
+    function: a wrapper function
+    """
+    @functools.wraps(func)
+    def wrapper_func(self, *args, **kwargs):
+        """A Wrapper Function"""
+        self.materialize()
+        result = func(self, *args, **kwargs)
+        return result
+    return wrapper_func
+
+
 class DevicesData(dict):
     """Devices Data class
 
+    Devices info is lazily loaded from
+    ~/.geekstrident/gtunrealdevice/devices_info.yaml on first access
+    so that importing gtunrealdevice does not touch the filesystem.
+
+    Added, modified, or removed devices are tracked, and save() appends
+    only those devices to devices_info.yaml.journal which is replayed on
+    load and compacted into devices_info.yaml once it outgrows the file.
+    A node which is handed out with [], get(), or setdefault() may be
+    changed in place; save() compares it with a copy which is taken when
+    it is handed out and saves it if it differs, so calling mark_dirty()
+    after an in-place change is optional.
+
+    Outputs are interned through an output pool, so an output which is
+    shared by many devices is kept once in memory and in devices_info.yaml.
+
+    Loading and saving devices info file hold an inter-process lock, and
+    saving first merges devices which other processes saved since load.
+
+    In in-memory mode, i.e. Data.is_in_memory, devices info starts empty,
+    and devices info file is neither created, read, nor saved.
+
+    Attributes
+    ----------
+    journal_min_size (int): a journal size in bytes which is never compacted
+    stream_min_size (int): a file size in bytes from which load streams devices
+
+    Properties
+    ----------
+    is_loaded -> bool
+    is_dirty -> bool
+    is_batching -> bool
+    journal_filename -> str
+
     Methods
+    materialize() -> None
+    mark_dirty(address) -> None
+    track(address) -> None
+    detect_changes() -> None
+    batch() -> contextmanager
+    lock() -> contextmanager
+    sync() -> None
+    refresh() -> None
+    reset() -> None
+    snapshot() -> dict
+    restore(snapshot) -> None
+    DevicesData.copy_node(node) -> object
     load_default() -> None
     load(filename) -> None
+    load_stream(filename) -> None
+    save(filename='') -> bool
+    compact() -> None
+    intern_node(node) -> dict
+    intern_output(output) -> object
+    get_output_stats() -> dict
+    get_command_index(device, cmdlines) -> CommandIndex
     """
+    journal_min_size = 64 * 1024
+    stream_min_size = 16 * 1024 * 1024
+
     def __init__(self):
         super().__init__()
         self.filenames = [Data.devices_info_filename]
         self.message = ''
+        self._is_loaded = False
+        self._command_indexes = dict()
+        self._dirty = set()
+        self._tracked = dict()
+        self._is_cleared = False
+        self._undo = None
+        self._is_save_deferred = False
+        self._parsed = None
+        self.pool = OutputPool()
+        self._file_lock = None
+        self._file_signature = None
+        self._journal_offset = 0
+
+    @property
+    def is_loaded(self):
+        """Return True if default devices info is already loaded"""
+        return self._is_loaded
+
+    def materialize(self):
+        """Load default devices info if it has not loaded yet"""
+        if not self._is_loaded:
+            self.load_default()
+
+    @property
+    def is_dirty(self):
+        """Return True if devices info has unsaved changes"""
+        return bool(self._dirty) or self._is_cleared
+
+    @property
+    def journal_filename(self):
+        """Return the journal file name of devices info file"""
+        return '{}.journal'.format(path.expanduser(Data.devices_info_filename))
+
+    def mark_dirty(self, address):
+        """Mark a device whose node is changed in place as unsaved
+
+        Parameters
+        ----------
+        address (str): a device address
+        """
+        self._dirty.add(address)
+
+    def track(self, address):
+        """Record a copy of the node of device which is handed out, so
+        save() detects its in-place changes
+
+        Parameters
+        ----------
+        address (str): a device address
+        """
+        node = super().get(address, MISSING)
+        if node is MISSING:
+            return
+        tracked = self._tracked.get(address)
+        if tracked is None or tracked[0] is not node:
+            self._tracked[address] = node, self.copy_node(node)
+
+    def detect_changes(self):
+        """Mark devices whose handed-out node is changed in place as unsaved.
+        A node which is replaced or removed in the meantime is not tracked."""
+        for address, (node, original) in list(self._tracked.items()):
+            if super().get(address, MISSING) is not node:
+                self._tracked.pop(address)
+            elif address in self._dirty or node != original:
+                self._dirty.add(address)
+                self._tracked[address] = node, self.copy_node(node)
+
+    @property
+    def is_batching(self):
+        """Return True if a batch is in progress"""
+        return self._undo is not None
+
+    def remember(self, address):
+        """Record a copy of the original node of device at its first touch
+        in a batch for rolling back the batch, so changes of node in place
+        are rolled back too
+
+        Parameters
+        ----------
+        address (str): a device address
+        """
+        if self._undo is None or address in self._undo:
+            return
+        node = super().get(address, MISSING)
+        self._undo[address] = node if node is MISSING else self.copy_node(node)
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Group changes of devices data into one transaction
+
+        Any save() of devices info file inside the batch is deferred to a
+        single save at the end of batch.  If any exception, including
+        KeyboardInterrupt, is raised, the changes made inside the batch,
+        including in-place changes of nodes which are read with [] or get(),
+        are rolled back and nothing is saved.
+        A nested batch joins the outer batch.
+
+        Yields
+        ------
+        DevicesData: this devices data
+        """
+        if self.is_batching:
+            yield self
+            return
+
+        self.materialize()
+        state = set(self._dirty), self._is_cleared
+        self._undo, self._is_save_deferred = dict(), False
+        try:
+            yield self
+        except BaseException:
+            undo, self._undo = self._undo, None
+            for address, node in undo.items():
+                if node is MISSING:
+                    super().pop(address, None)
+                else:
+                    super().__setitem__(address, node)
+                self._command_indexes.pop(address, None)
+            self._dirty, self._is_cleared = state
+            raise
+        else:
+            self._undo = None
+            self._is_save_deferred and self.save()
+        finally:
+            self._undo = None
+            self._is_save_deferred = False
+
+    @materialized
+    def __contains__(self, key):
+        return super().__contains__(key)
+
+    @materialized
+    def __getitem__(self, key):
+        self.remember(key)
+        self.track(key)
+        return super().__getitem__(key)
+
+    @materialized
+    def __setitem__(self, key, value):
+        self.remember(key)
+        self._command_indexes.pop(key, None)
+        self._dirty.add(key)
+        super().__setitem__(key, self.intern_node(value))
+
+    @materialized
+    def __delitem__(self, key):
+        self.remember(key)
+        self._command_indexes.pop(key, None)
+        super().__delitem__(key)
+        self._dirty.add(key)
+
+    @materialized
+    def __iter__(self):
+        return super().__iter__()
+
+    @materialized
+    def __len__(self):
+        return super().__len__()
+
+    @materialized
+    def __repr__(self):
+        return super().__repr__()
+
+    @materialized
+    def __eq__(self, other):
+        return super().__eq__(other)
+
+    @materialized
+    def get(self, key, default=None):
+        self.remember(key)
+        self.track(key)
+        return super().get(key, default)
+
+    @materialized
+    def keys(self):
+        return super().keys()
+
+    @materialized
+    def values(self):
+        return super().values()
+
+    @materialized
+    def items(self):
+        return super().items()
+
+    @materialized
+    def pop(self, key, *args):
+        self.remember(key)
+        self._command_indexes.pop(key, None)
+        super().__contains__(key) and self._dirty.add(key)
+        return super().pop(key, *args)
+
+    @materialized
+    def popitem(self):
+        key, value = super().popitem()
+        if self._undo is not None:
+            self._undo.setdefault(key, value)
+        self._command_indexes.pop(key, None)
+        self._dirty.add(key)
+        return key, value
+
+    @materialized
+    def setdefault(self, key, default=None):
+        self.remember(key)
+        super().__contains__(key) or self._dirty.add(key)
+        result = super().setdefault(key, default)
+        self.track(key)
+        return result
+
+    @materialized
+    def update(self, *args, **kwargs):
+        data = dict(*args, **kwargs)
+        for key, value in data.items():
+            self.remember(key)
+            self.intern_node(value)
+        self._command_indexes.clear()
+        self._dirty.update(data)
+        super().update(data)
+
+    @materialized
+    def copy(self):
+        return dict(self)
+
+    def clear(self):
+        if self._undo is not None:
+            for key, value in super().items():
+                self._undo.setdefault(key, value)
+        self._is_loaded = True
+        self._command_indexes.clear()
+        self._dirty.clear()
+        self._tracked.clear()
+        self._is_cleared = True
+        self._undo is None and self.pool.clear()
+        super().clear()
+
+    def reset(self):
+        """Forget devices info without saving, so it is loaded again on next use"""
+        super().clear()
+        self.pool.clear()
+        self._command_indexes.clear()
+        self._dirty.clear()
+        self._tracked.clear()
+        self._is_cleared = False
+        self._is_loaded = False
+        self._parsed = None
+        self._file_signature = None
+        self._journal_offset = 0
+
+    @materialized
+    def snapshot(self):
+        """Copy all devices info, e.g. before a test case
+
+        Returns
+        -------
+        dict: a copy of devices info whose outputs are shared
+        """
+        return {address: self.copy_node(node) for address, node in self.copy().items()}
+
+    def restore(self, snapshot):
+        """Replace all devices info with a snapshot
+
+        Parameters
+        ----------
+        snapshot (dict): a snapshot of devices info
+        """
+        with self.batch():
+            self.clear()
+            self.update({address: self.copy_node(node) for address, node in snapshot.items()})
+
+    @classmethod
+    def copy_node(cls, node):
+        """Copy dictionaries and lists of a device info.  Outputs are immutable,
+        so they are shared instead of being copied."""
+        if isinstance(node, dict):
+            return {key: cls.copy_node(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [cls.copy_node(item) for item in node]
+        return node
+
+    @contextlib.contextmanager
+    def lock(self):
+        """Hold the inter-process lock of devices info file
+
+        Yields
+        ------
+        DevicesData: this devices data
+        """
+        filename = '{}.lock'.format(path.expanduser(Data.devices_info_filename))
+        if self._file_lock is None or self._file_lock.filename != filename:
+            self._file_lock = FileLock(filename)
+        with self._file_lock.acquire():
+            yield self
+
+    def get_file_signature(self):     # noqa
+        """Get signature of devices info file which changes on every rewrite"""
+        try:
+            stat = os.stat(path.expanduser(Data.devices_info_filename))
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
 
     def load_default(self):
         """Load devices info from ~/.geekstrident/gtunrealdevice/devices_info.yaml
@@ -77,22 +468,108 @@ class DevicesData(dict):
         ------
         DevicesInfoError: raise exception if devices_info_file contains invalid format
         """
-        if not Data.is_devices_info_file_exist():
-            Data.create_devices_info_file()
-        with open(Data.devices_info_filename) as stream:
-            content = stream.read()
-            if content.strip():
-                data = yaml.safe_load(content)
+        self._is_loaded = True
+        if Data.is_in_memory:
+            self._dirty.clear()
+            self._is_cleared = False
+            return
+
+        with self.lock():
+            if not Data.is_devices_info_file_exist():
+                Data.create_devices_info_file()
+            data = YamlCache.load(Data.devices_info_filename)
+            if data is not None:
                 if isinstance(data, dict):
                     self.clear()
                     self.update(data)
                 else:
+                    self._is_loaded = False
                     fmt = '{} file has an invalid format.  Check with developer.'
                     raise DevicesInfoError(fmt.format(Data.devices_info_filename))
+            self.replay_journal()
+            self._file_signature = self.get_file_signature()
+        self._dirty.clear()
+        self._is_cleared = False
+
+    def replay_journal(self, offset=0, skipped=()):
+        """Apply journal of devices info file to devices data.  A partially
+        written record at the end of journal is truncated.
+
+        Parameters
+        ----------
+        offset (int): a journal offset from which records are applied.  Default is 0.
+        skipped (set): addresses of devices which are not changed.  Default is empty.
+        """
+        self._journal_offset = 0
+        if not path.isfile(self.journal_filename):
+            return
+
+        with open(self.journal_filename, 'rb+') as stream:
+            stream.seek(offset)
+            for line in stream:
+                try:
+                    record = json.loads(line) if line.endswith(b'\n') else None
+                    record = DataFormat.decode_json(record)
+                except ValueError:
+                    record = None
+                if not isinstance(record, dict):
+                    stream.truncate(offset)
+                    break
+                offset += len(line)
+
+                op, address = record.get('op'), record.get('address')
+                if address in skipped:
+                    continue
+                if op == 'clear':
+                    for key in [key for key in super().keys() if key not in skipped]:
+                        super().pop(key)
+                elif op == 'set':
+                    super().__setitem__(address, self.intern_node(record.get('node')))
+                elif op == 'delete':
+                    super().pop(address, None)
+        self._journal_offset = offset
+        self._command_indexes.clear()
+
+    def sync(self):
+        """Merge devices which other processes saved to devices info file
+        since it was loaded or saved.  Changed devices of this devices data
+        are kept.  It must be called while holding lock()."""
+        if self._is_cleared:
+            return
+
+        self.detect_changes()
+        offset = self._journal_offset
+        if self.get_file_signature() != self._file_signature:
+            data = YamlCache.load(Data.devices_info_filename)
+            get = super().get
+            changes = {address: get(address, MISSING) for address in self._dirty}
+            super().clear()
+            for address, node in (data if isinstance(data, dict) else dict()).items():
+                super().__setitem__(address, self.intern_node(node))
+            for address, node in changes.items():
+                if node is MISSING:
+                    super().pop(address, None)
+                else:
+                    super().__setitem__(address, node)
+            self._file_signature = self.get_file_signature()
+            offset = 0
+        self.replay_journal(offset, skipped=self._dirty)
+
+    def refresh(self):
+        """Merge devices which other processes saved to devices info file,
+        e.g. before a long-running process serves a request.  Nothing is
+        done if devices info is not loaded yet, is in memory, or is in a batch."""
+        if not self._is_loaded or Data.is_in_memory or self.is_batching:
+            return
+        with self.lock():
+            self.sync()
 
     def load(self, filename):
         """Load devices info from user provided filename
 
+        A file which is not smaller than stream_min_size is streamed
+        one device at a time instead of being parsed as a whole.
+
         Parameters
         ----------
         filename (str): a file name
@@ -101,19 +578,91 @@ class DevicesData(dict):
         ------
         DevicesInfoError: raise exception if devices_info_file contains invalid format
         """
+        fn = path.expanduser(filename)
+        if path.isfile(fn) and path.getsize(fn) >= self.stream_min_size:
+            self.load_stream(filename)
+            return
 
         is_valid = self.is_valid_file(filename)
         if not is_valid:
             raise DevicesInfoError(self.message)
 
-        with open(path.expanduser(filename)) as stream:
-            filename not in self.filenames and self.filenames.append(filename)
-            node = yaml.safe_load(stream)
-            self.update(node)
+        _, node, _ = self._parsed
+        self._parsed = None
+        filename not in self.filenames and self.filenames.append(filename)
+        self.update(node)
+
+    def load_stream(self, filename):
+        """Load devices info from user provided filename one device at a time
+
+        Every device is validated and merged as soon as it is parsed, and
+        all devices are rolled back if any error is found.
+
+        Parameters
+        ----------
+        filename (str): a file name
+
+        Raises
+        ------
+        DevicesInfoError: raise exception if devices_info_file contains invalid format
+        """
+        errors = []
+        with self.batch():
+            self.stream_devices(filename, errors)
+            if errors:
+                self.message = '\n'.join(errors)
+                raise DevicesInfoError(self.message)
+        filename not in self.filenames and self.filenames.append(filename)
+
+    def stream_devices(self, filename, errors, on_cmdline=None):
+        """Stream, validate, and merge devices of filename
+
+        Parameters
+        ----------
+        filename (str): a file name
+        errors (list): a list which collects errors
+        on_cmdline (callable): a callback with address, cmdline, output,
+                and a root node which receives every cmdline instead of
+                device info.  Default is None.
+
+        Returns
+        -------
+        int: a number of streamed devices
+        """
+        total = 0
+        try:
+            with open(path.expanduser(filename)) as stream:
+                items = DataFormat.iter_items(stream, streamed_key='cmdlines',
+                                              on_item=on_cmdline)
+                for address, node, root in items:
+                    total += 1
+                    errors.extend(self.validate({address: node}, root=root))
+                    errors or self.store_device(address, node)
+        except ValueError:
+            errors.append('Invalid device info format.')
+        except Exception as ex:
+            errors.append(self.get_parse_error(ex))
+
+        if not total and not errors:
+            errors.append('"{}" file is empty.'.format(path.expanduser(filename)))
+        return total
+
+    def store_device(self, address, node):
+        """Store a streamed device
+
+        Parameters
+        ----------
+        address (str): an address of device
+        node (dict): device info
+        """
+        self[address] = node
 
     def save(self, filename=''):
         """Save device info to filename
 
+        Saving to devices info file appends only changed devices to its
+        journal, and other filename is written with all devices.
+
         Parameters
         ----------
         filename (str): a file name
@@ -122,12 +671,129 @@ class DevicesData(dict):
         -------
         bool: True if filename is successfully saved, otherwise, False.
         """
-        filename = filename or Data.devices_info_filename
+        default_filename = path.expanduser(Data.devices_info_filename)
+        filename = path.expanduser(filename or default_filename)
+
+        if filename != default_filename:
+            self.write_file(filename)
+            return True
 
-        with open(path.expanduser(filename), 'w') as stream:
-            self and yaml.safe_dump(dict(self), stream)
+        if self.is_batching:
+            self._is_save_deferred = True
             return True
 
+        self.detect_changes()
+        if not self.is_dirty:
+            return True
+
+        if Data.is_in_memory:
+            self._dirty.clear()
+            self._is_cleared = False
+            return True
+
+        with self.lock():
+            self.sync()
+            self.append_journal()
+
+            journal_size = path.getsize(self.journal_filename)
+            file_size = path.getsize(filename) if path.isfile(filename) else 0
+            if journal_size > max(file_size, self.journal_min_size):
+                self.compact()
+        return True
+
+    def append_journal(self):
+        """Append changed devices to journal of devices info file"""
+        lst = [dict(op='clear')] if self._is_cleared else []
+        for address in self._dirty:
+            if super().__contains__(address):
+                node = super().__getitem__(address)
+                lst.append(dict(op='set', address=address, node=node))
+            else:
+                lst.append(dict(op='delete', address=address))
+
+        text = ''.join(json.dumps(DataFormat.encode_json(record)) + '\n' for record in lst)
+        with open(self.journal_filename, 'a') as stream:
+            stream.write(text)
+            stream.flush()
+            os.fsync(stream.fileno())
+            self._journal_offset = stream.tell()
+
+        self._dirty.clear()
+        self._is_cleared = False
+
+    def compact(self):
+        """Write all devices to devices info file and remove its journal"""
+        if Data.is_in_memory:
+            self._dirty.clear()
+            self._is_cleared = False
+            return
+
+        with self.lock():
+            self.sync()
+            self.write_file(Data.devices_info_filename)
+            path.isfile(self.journal_filename) and os.remove(self.journal_filename)
+            self._file_signature = self.get_file_signature()
+            self._journal_offset = 0
+        self._dirty.clear()
+        self._is_cleared = False
+
+    def write_file(self, filename):
+        """Write all devices to a yaml file atomically
+
+        Parameters
+        ----------
+        filename (str): a file name
+        """
+        filename = path.expanduser(filename)
+        mode = os.stat(filename).st_mode & 0o777 if path.isfile(filename) else 0o644
+        directory = path.dirname(path.abspath(filename))
+        fd, tmp_filename = tempfile.mkstemp(suffix='.tmp', dir=directory)
+        data = dict(self)
+        try:
+            with os.fdopen(fd, 'w') as stream:
+                is_json = DataFormat.is_json_filename(filename)
+                data and DataFormat.dump(data, stream, is_json=is_json, is_aliased=True)
+                stream.flush()
+                os.fsync(stream.fileno())
+            os.chmod(tmp_filename, mode)
+            os.replace(tmp_filename, filename)
+        except BaseException:
+            path.isfile(tmp_filename) and os.remove(tmp_filename)
+            raise
+        YamlCache.dump(filename, data or None)
+
+    def intern_node(self, node):
+        """Replace outputs of device info with pooled outputs in place
+
+        Parameters
+        ----------
+        node (dict): a device info
+
+        Returns
+        -------
+        dict: the device info
+        """
+        return self.pool.intern_node(node)
+
+    def intern_output(self, output):
+        return self.pool.intern(output)
+
+    @materialized
+    def get_output_stats(self):
+        """Count referenced and unique outputs of devices
+
+        Returns
+        -------
+        dict: total, unique, size, and unique_size of outputs
+        """
+        return OutputPool.get_stats(self._iter_outputs())
+
+    def _iter_outputs(self):
+        return (
+            output for node in super().values() if isinstance(node, dict)
+            for output in (node.get('cmdlines') or dict()).values()
+        )
+
     def remove_device(self, name):
         """remove device info
 
@@ -151,6 +817,7 @@ class DevicesData(dict):
             addr = self.get_address_from_name(name)
             if addr in self:
                 self.pop(addr)
+                self._undo is None and self.pool.prune(self._iter_outputs())
                 self.save()
                 return True
             else:
@@ -180,9 +847,36 @@ class DevicesData(dict):
                     return addr
             return name
 
+    def get_addresses_from_names(self, names):
+        """Get device addresses from a list of device names in one pass
+
+        Parameters
+        ----------
+        names (list): a list of device names or addresses
+
+        Returns
+        -------
+        list: a list of device addresses or original names
+        """
+        tbl = dict()
+        for addr, node in self.items():
+            if isinstance(node, dict) and node.get('name'):
+                tbl.setdefault(node.get('name'), addr)
+
+        lst = []
+        for name in names:
+            name = str(name).strip()
+            if name in self or not name:
+                lst.append(self.get_address_from_name(name))
+            else:
+                lst.append(tbl.get(name, name))
+        return lst
+
     def is_valid_file(self, filename):
         """Check filename
 
+        Every structural error is collected to message, one per line.
+
         Parameters
         ----------
         filename (str): a file name
@@ -192,18 +886,14 @@ class DevicesData(dict):
         bool: True if filename has proper format, otherwise, False.
         """
         try:
-            with open(path.expanduser(filename)) as stream:
-                content = stream.read().strip()
-                if not content:
-                    self.message = '"{}" file is empty.'.format(filename)
-                    return False
-
-                is_valid = self.is_valid_structure(content)
-                return is_valid
+            _, errors = self.parse_file(filename)
         except Exception as ex:
             self.message = '{} - {}'.format(type(ex).__name__, ex)
             return False
 
+        self.message = '\n'.join(errors)
+        return not errors
+
     def is_valid_structure(self, data):
         """Check structure of data
 
@@ -215,58 +905,194 @@ class DevicesData(dict):
         -------
         bool: True if data has proper format, otherwise, False.
         """
-        node = yaml.safe_load(data)
-        if not isinstance(node, dict):
-            self.message = 'Invalid device info format.'
-            return False
+        node, errors = self.parse(data)
+        if node is None and not errors:
+            errors = ['Invalid device info format.']
+        self.message = '\n'.join(errors)
+        return not errors
 
-        cmdlines = node.get('cmdlines', None)
-        if cmdlines:
-            if not isinstance(cmdlines, dict):
-                self.message = 'Invalid cmdlines format.'
-                return False
+    def parse_file(self, filename):
+        """Parse and validate devices info file in a single pass
 
-            for cmdline in cmdlines:
-                if isinstance(cmdline, (list, str)):
-                    continue
-                self.message = 'Invalid cmdline format.'
-                return False
+        A parsed file is kept until it is loaded, so load(filename) after
+        is_valid_file(filename) does not parse the file again.  A valid
+        parsed yaml cache of file is validated without parsing.
 
-        configs = node.get('configs', None)
-        if configs:
-            if not isinstance(configs, dict):
-                self.message = 'Invalid configs format.'
-                return False
+        Parameters
+        ----------
+        filename (str): a file name
 
-        return True
+        Returns
+        -------
+        tuple: parsed data and a list of errors
+        """
+        filename = path.expanduser(filename)
+        signature = YamlCache.get_signature(filename)
+        key = [filename, signature]
+        if self._parsed and self._parsed[0] == key:
+            return self._parsed[1], self._parsed[2]
+
+        is_hit, data = YamlCache.get(filename, signature=signature)
+        errors = self.validate(data) if is_hit and data is not None else None
+        if errors is None or errors:
+            with open(filename) as stream:
+                data, errors = self.parse(stream)
+            if data is None and not errors:
+                errors = ['"{}" file is empty.'.format(filename)]
+            errors or YamlCache.dump(filename, data, signature=signature)
+
+        self._parsed = [key, data, errors]
+        return data, errors
+
+    def parse(self, data):
+        """Parse and validate devices info
+
+        Parameters
+        ----------
+        data (str, stream): data for devices info
+
+        Returns
+        -------
+        tuple: parsed data and a list of errors
+        """
+        try:
+            root, node = DataFormat.compose(data)
+        except Exception as ex:
+            return None, [self.get_parse_error(ex)]
+
+        if root is None:
+            return None, []
+        return node, self.validate(node, root=root)
+
+    def get_parse_error(self, ex):     # noqa
+        """Format a parsing exception with its position if available
+
+        Parameters
+        ----------
+        ex (Exception): a parsing exception
+
+        Returns
+        -------
+        str: an error, e.g. 'line 3, column 1: ParserError - ...'
+        """
+        mark = getattr(ex, 'problem_mark', None)
+        problem = getattr(ex, 'problem', None) or ex
+        if mark:
+            fmt = 'line {}, column {}: {} - {}'
+            return fmt.format(mark.line + 1, mark.column + 1, type(ex).__name__, problem)
+        return '{} - {}'.format(type(ex).__name__, problem)
+
+    def validate(self, data, root=None):     # noqa
+        """Validate structure of devices info and collect every error
+
+        Parameters
+        ----------
+        data (object): parsed devices info
+        root (yaml.Node): a root node for locating errors.  Default is None.
+
+        Returns
+        -------
+        list: a list of errors, e.g.
+                'line 5, column 5: Invalid cmdlines format of "1.1.1.1" device.'
+        """
+        errors = []
+
+        def add_error(keys, msg, is_key=False):
+            position = DataFormat.locate(root, keys, is_key=is_key)
+            errors.append('{}: {}'.format(position, msg) if position else msg)
+
+        def is_scalar(obj):
+            return not isinstance(obj, (dict, list))
+
+        if not isinstance(data, dict):
+            add_error((), 'Invalid device info format.')
+            return errors
+
+        for addr, node in data.items():
+            if not isinstance(node, dict):
+                add_error((addr,), 'Invalid device info format of "{}" device.'.format(addr))
+                continue
+
+            for field in ['name', 'description', 'login']:
+                if not is_scalar(node.get(field)):
+                    fmt = 'Invalid {} format of "{}" device.'
+                    add_error((addr, field), fmt.format(field, addr))
+
+            cmdlines = node.get('cmdlines', None)
+            if cmdlines and not isinstance(cmdlines, dict):
+                fmt = 'Invalid cmdlines format of "{}" device.'
+                add_error((addr, 'cmdlines'), fmt.format(addr))
+            elif cmdlines:
+                for cmdline, output in cmdlines.items():
+                    if not isinstance(cmdline, str):
+                        fmt = 'Invalid cmdline format of "{}" device.'
+                        add_error((addr, 'cmdlines', cmdline), fmt.format(addr), is_key=True)
+                    elif not is_scalar(output) and not (
+                        isinstance(output, list) and all(is_scalar(i) for i in output)
+                    ):
+                        fmt = 'Invalid output format of "{}" cmdline of "{}" device.'
+                        add_error((addr, 'cmdlines', cmdline), fmt.format(cmdline, addr))
+
+            configs = node.get('configs', None)
+            if configs and not isinstance(configs, dict):
+                fmt = 'Invalid configs format of "{}" device.'
+                add_error((addr, 'configs'), fmt.format(addr))
+
+        return errors
 
     def get_sample_device_info_format(self):    # noqa
         text = Data.sample_devices_info_text
         return text
 
     def get_data(self, data):       # noqa
-        pattern = r'(?i) *file(name)?:: *(?P<fn>[^\r\n]*[a-z][^\r\n]*) *$'
-        match = re.match(pattern, data)
-        if match and len(data.strip()) == 1:
-            try:
-                with open(match.group('fn')) as stream:
-                    result = stream.read()
-            except Exception as ex:     # noqa
-                result = data
-        else:
-            result = data
-        return result
+        """Get output of command line.  A single line file::path or
+        filename::path of an existing file is kept as a file reference
+        with an absolute path, and the file is read on execution.
+
+        Parameters
+        ----------
+        data (str): an output or a file::path line
+
+        Returns
+        -------
+        object: an output or a FileReference
+        """
+        filename = FileOutput.match_filename(data)
+        if filename and path.isfile(filename):
+            return FileOutput.get_reference(filename)
+        return data
+
+    def get_command_index(self, device, cmdlines):
+        """Get command line index of device
+
+        Parameters
+        ----------
+        device (str): device address
+        cmdlines (dict): command lines of device
+
+        Returns
+        -------
+        CommandIndex: a command line index which is cached per device
+        """
+        index = self._command_indexes.get(device)
+        if index is None or not index.is_built_from(cmdlines):
+            index = CommandIndex(cmdlines)
+            self._command_indexes[device] = index
+        return index
 
     def update_command_line(self, cmdline, output, device, appended=False):
 
-        output = self.get_data(output)
+        output = self.intern_output(self.get_data(output))
+        self.remember(device)
 
         if device in self:
             cmdlines = self[device].get('cmdlines', dict())
             if cmdline in cmdlines:
                 if appended:
+                    # assign a new list instead of appending in place, so
+                    # the change is written through SqliteCmdlines too
                     if isinstance(cmdlines[cmdline], list):
-                        cmdlines[cmdline].append(output)
+                        cmdlines[cmdline] = cmdlines[cmdline] + [output]
                     else:
                         cmdlines[cmdline] = [cmdlines[cmdline], output]
                 else:
@@ -274,6 +1100,9 @@ class DevicesData(dict):
             else:
                 cmdlines[cmdline] = output
             cmdlines and self[device].update(cmdlines=cmdlines)
+            self.mark_dirty(device)
+            index = self._command_indexes.get(device)
+            index and index.add(cmdline)
         else:
             self[device] = dict(cmdlines={cmdline: output})
 
@@ -290,15 +1119,28 @@ class DevicesData(dict):
 
         if device:
             if device in self:
-                print(yaml.dump(self[device]))
+                print(DataFormat.dump(CompressedOutput.expand(self[device])))
             else:
                 print('There is no {!r} device.'.format(device))
         else:
-            self and print(yaml.dump(dict(self)))
+            self and print(DataFormat.dump(CompressedOutput.expand(dict(self))))
+
 
+def create_devices_data():
+    """Create devices data per storage backend of Data.storage_backend
 
-DEVICES_DATA = DevicesData()
-DEVICES_DATA.load_default()
+    Returns
+    -------
+    DevicesData: a yaml devices data, or a sqlite devices data if
+            environment variable GTUNREALDEVICE_STORAGE is sqlite
+    """
+    if Data.storage_backend == 'sqlite':
+        from gtunrealdevice.sqlitedata import SqliteDevicesData
+        return SqliteDevicesData()
+    return DevicesData()
+
+
+DEVICES_DATA = create_devices_data()
 
 
 class UnrealDevice:
@@ -317,6 +1159,8 @@ class UnrealDevice:
     Methods
     -------
     connect(**kwargs) -> bool
+    get_login_output(is_timestamp=True) -> str
+    get_logout_output(is_timestamp=True) -> str
     reconnect(**kwargs) -> bool
     disconnect(**kwargs) -> bool
     execute(cmdline, **kwargs) -> str
@@ -326,7 +1170,15 @@ class UnrealDevice:
     Raises
     ------
     UnrealDeviceConnectionError: raise exception if device can not connect
+
+    Notes
+    -----
+    A pickled unreal device is a compact session state of version
+    state_version.  Device data is not pickled, and it is re-attached
+    from DEVICES_DATA when a connected device is unpickled.
     """
+    state_version = 1
+
     def __init__(self, address, name='', **kwargs):
         self.address = str(address).strip()
         self.name = str(name).strip() or self.address
@@ -336,6 +1188,46 @@ class UnrealDevice:
         self.table = dict()
         self.success_code = ECODE.SUCCESS
 
+    def __getstate__(self):
+        """Get a compact session state without device data
+
+        Returns
+        -------
+        dict: version, address, name, connection status, output-cycling
+                cursors, success code, and other keyword attributes
+        """
+        attrs = ['address', 'name', '_is_connected', 'data', 'table', 'success_code']
+        extra = {k: v for k, v in self.__dict__.items() if k not in attrs}
+        state = dict(
+            version=self.state_version, address=self.address, name=self.name,
+            is_connected=self._is_connected, table=dict(self.table),
+            success_code=self.success_code, extra=extra,
+        )
+        return state
+
+    def __setstate__(self, state):
+        """Restore a session state and re-attach device data from
+        DEVICES_DATA, so a disconnected device still knows whether it is
+        auto-generated.  A legacy pickled device keeps its data.
+
+        Parameters
+        ----------
+        state (dict): a session state
+        """
+        if 'version' not in state:
+            self.__dict__.update(state)
+            return
+
+        self.__dict__.update(state.get('extra', dict()))
+        self.address = state['address']
+        self.name = state['name']
+        self._is_connected = state['is_connected']
+        self.table = state['table']
+        self.success_code = state['success_code']
+        self.data = DEVICES_DATA.get(self.address)
+        if self._is_connected and self.data is None:
+            self.data = dict()
+
     @property
     def is_connected(self):
         """Return device connection status"""
@@ -373,16 +1265,8 @@ class UnrealDevice:
             self._is_connected = True
 
             if kwargs.get('showed', True):
-                login_result = self.data.get('login', '')
-                fmt = 'login unreal-device {}@dummy_username:dummy_password'
-                extra = fmt.format(self.address)
-
                 is_timestamp = kwargs.get('is_timestamp', True)
-                login_result = self.render_data(
-                    login_result, is_timestamp=is_timestamp,
-                    service='authentication',
-                    extra=extra
-                )
+                login_result = self.get_login_output(is_timestamp=is_timestamp)
                 print(login_result)
             self.success_code = ECODE.SUCCESS
             return self.is_connected
@@ -392,7 +1276,7 @@ class UnrealDevice:
                 DEVICES_DATA.update({self.address: bare_device})
                 DEVICES_DATA.save()
                 try:
-                    self.connect()
+                    self.connect(**kwargs)
                 except Exception as ex:
                     failure = '<<< {}: {} >>>'.format(type(ex).__name__, ex)
                     raise UnrealDeviceConnectionError(failure)
@@ -401,6 +1285,47 @@ class UnrealDevice:
                 fmt = '"{}" is unavailable for connection.'
                 raise UnrealDeviceConnectionError(fmt.format(self.name))
 
+    def get_login_output(self, is_timestamp=True):
+        """Get login output of an unreal device
+
+        Parameters
+        ----------
+        is_timestamp (bool): showing timestamp.  Default is True.
+
+        Returns
+        -------
+        str: login output
+        """
+        login_result = self.data.get('login', '') if self.data else ''
+        fmt = 'login unreal-device {}@dummy_username:dummy_password'
+        extra = fmt.format(self.address)
+
+        login_result = self.render_data(
+            login_result, is_timestamp=is_timestamp,
+            service='authentication',
+            extra=extra
+        )
+        return login_result
+
+    def get_logout_output(self, is_timestamp=True):
+        """Get logout output of an unreal device
+
+        Parameters
+        ----------
+        is_timestamp (bool): showing timestamp.  Default is True.
+
+        Returns
+        -------
+        str: logout output
+        """
+        msg = '{} is disconnected.'.format(self.name)
+        msg = self.render_data(
+            msg, is_timestamp=is_timestamp,
+            service='authentication',
+            extra='logout unreal-device {}'.format(self.address),
+        )
+        return msg
+
     def reconnect(self, **kwargs):
         """Reconnect an unreal device
 
@@ -429,7 +1354,7 @@ class UnrealDevice:
                     print('{}\n\n'.format(reconnect_txt))
 
             self._is_connected = False
-            self.connect()
+            self.connect(**kwargs)
 
             return self.is_connected
         else:
@@ -451,12 +1376,7 @@ class UnrealDevice:
         self._is_connected = False
         if kwargs.get('showed', True):
             is_timestamp = kwargs.get('is_timestamp', True)
-            msg = '{} is disconnected.'.format(self.name)
-            msg = self.render_data(
-                msg, is_timestamp=is_timestamp,
-                service='authentication',
-                extra='logout unreal-device {}'.format(self.address),
-            )
+            msg = self.get_logout_output(is_timestamp=is_timestamp)
             print(msg)
         self.success_code = ECODE.SUCCESS
         return self._is_connected
@@ -488,25 +1408,44 @@ class UnrealDevice:
 
         data = self.data.get('cmdlines', dict())
 
-        no_output = Printer.get_message('"{}" does not have output', cmdline,
-                                        prefix='UnrealDeviceCmdline:')
+        base_cmdline, pipes, pipe_error = cmdline, [], ''
+        if '|' in cmdline and cmdline not in data:
+            try:
+                base_cmdline, pipes = OutputPipe.parse(cmdline)
+            except OutputPipeError as ex:
+                pipe_error = '% {}'.format(ex)
 
-        lookup = self.search_command_line(cmdline)
-        result = data.get(lookup, self.data.get('cmdlines').get(lookup, no_output))
+        cmd_index = DEVICES_DATA.get_command_index(self.address, data)
+        lookup, captures = (None, dict()) if pipe_error else cmd_index.resolve(base_cmdline)
 
-        is_no_output = str(result).endswith('" does not have output')
-        self.success_code = ECODE.BAD if is_no_output else ECODE.SUCCESS
+        if lookup in data:
+            result = data.get(lookup)
+            self.success_code = ECODE.SUCCESS
+        elif pipe_error:
+            result = pipe_error
+            self.success_code = ECODE.BAD
+        else:
+            result = self.get_unavailable_output(base_cmdline)
+            self.success_code = ECODE.BAD
 
         if not isinstance(result, (list, tuple)):
-            output = str(result)
+            output = str(CompressedOutput.expand(result))
         else:
-            index = 0 if cmdline not in self.table else self.table.get(cmdline) + 1
+            index = 0 if base_cmdline not in self.table else self.table.get(base_cmdline) + 1
             index = index % len(result)
-            self.table.update({cmdline: index})
-            output = result[index]
+            self.table.update({base_cmdline: index})
+            result = result[index]
+            output = CompressedOutput.expand(result)
 
         is_timestamp = kwargs.get('is_timestamp', True)
         output = get_builtin_output(output)
+        filename = FileOutput.get_filename(result) if self.success_code == ECODE.SUCCESS else ''
+        if filename:
+            output = self.get_file_output(filename, pipes, captures)
+        else:
+            output = cmd_index.substitute(output, captures)
+            if pipes and self.success_code == ECODE.SUCCESS:
+                output = '\n'.join(OutputPipe.apply(output, pipes))
         output = self.render_data(
             output, is_timestamp=is_timestamp,
             service='execution', extra=cmdline,
@@ -516,6 +1455,54 @@ class UnrealDevice:
 
         return output
 
+    def get_file_output(self, filename, pipes, captures):
+        """Get output of a file reference.  Lines of file are streamed
+        from its memory map through output pipes, or to render_data if
+        there is no output pipe.
+
+        Parameters
+        ----------
+        filename (str): a file name
+        pipes (list): a list of OutputPipe
+        captures (dict): captured values of a command line pattern
+
+        Returns
+        -------
+        str or generator: an output, or a generator of lines of output
+        """
+        try:
+            lines = FileOutput.iter_lines(filename)
+            if captures:
+                lines = (CommandIndex.substitute(line, captures) for line in lines)
+            return '\n'.join(OutputPipe.apply(lines, pipes)) if pipes else lines
+        except OSError as ex:
+            self.success_code = ECODE.BAD
+            return '% Cannot read "{}" file - {}'.format(filename, ex.strerror or ex)
+
+    def get_unavailable_output(self, cmdline):
+        """Get output of unavailable command line
+
+        Parameters
+        ----------
+        cmdline (str): command line
+
+        Returns
+        -------
+        str: an ambiguous or incomplete message as a real device does,
+                otherwise, a no output message
+        """
+        cmdlines = self.data.get('cmdlines', dict())
+        index = DEVICES_DATA.get_command_index(self.address, cmdlines)
+        _, status = index.resolve_abbreviation(cmdline)
+        if status == index.AMBIGUOUS:
+            return '% Ambiguous command:  "{}"'.format(cmdline)
+        elif status == index.INCOMPLETE:
+            return '% Incomplete command.'
+        else:
+            no_output = Printer.get_message('"{}" does not have output', cmdline,
+                                            prefix='UnrealDeviceCmdline:')
+            return no_output
+
     @check_active_device
     def configure(self, config, **kwargs):
         """Configure an unreal device
@@ -567,9 +1554,10 @@ class UnrealDevice:
             lst = []
             for item in data:
                 if isinstance(item, str):
-                    lst.extend(item.splitlines())
+                    lst.extend(item.splitlines() or [''])
                 else:
                     lst.extend(item)
+            lst = lst or ['']
 
         if service == 'configuration':
             prompt = '{}(configure)#'.format(self.name)
@@ -616,40 +1604,10 @@ class UnrealDevice:
         -------
         str: the full command line if found, otherwise, cmdline
         """
-        if not cmdline.strip():
-            return cmdline
-
-        other_cmdline = '{}s'.format(cmdline)
-        another_cmdline = '{}es'.format(cmdline)
-        simplified_cmdline = re.sub(' +', ' ', cmdline)
-        other_simplified_cmdline = '{}s'.format(simplified_cmdline)
-        another_simplified_cmdline = '{}es'.format(simplified_cmdline)
-
-        lst_of_command_lines = self.list_command_lines()
-        if cmdline in lst_of_command_lines:
-            return cmdline
-        elif other_cmdline in lst_of_command_lines:
-            return other_cmdline
-        elif another_cmdline in lst_of_command_lines:
-            return another_cmdline
-        elif simplified_cmdline in lst_of_command_lines:
-            return simplified_cmdline
-        elif other_simplified_cmdline in lst_of_command_lines:
-            return other_simplified_cmdline
-        elif another_simplified_cmdline in lst_of_command_lines:
-            return another_simplified_cmdline
-        else:
-            chk_lst = []
-            for command_line in lst_of_command_lines:
-                is_subcommand = command_line.startswith(cmdline)
-                is_subcommand |= command_line.startswith(simplified_cmdline)
-                if is_subcommand:
-                    command_line not in chk_lst and chk_lst.append(command_line)
-
-            if len(chk_lst) == 1:
-                return chk_lst[0]
-            else:
-                return cmdline
+        cmdlines = self.data.get('cmdlines', dict())
+        index = DEVICES_DATA.get_command_index(self.address, cmdlines)
+        result = index.search(cmdline)
+        return result
 
 
 def create(address, name='', **kwargs):
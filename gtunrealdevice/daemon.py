@@ -0,0 +1,242 @@
+"""Module containing the logic for unreal-device daemon.
+
+The daemon keeps devices data in memory, writes sessions of connected
+unreal-devices through to serialized database like any CLI process, and
+serves unreal-device console commands over a local Unix domain
+socket.  The unreal-device console forwards a command to the daemon
+through gtunrealdevice.client if it is running, otherwise, the command
+is processed in-process.  Before every command, the daemon merges
+devices which other processes saved to devices info file, so it never
+overwrites them with its stale copy.  Relative file names of a
+forwarded command are resolved against the working directory of the
+console.
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import subprocess
+import socketserver
+
+from contextlib import redirect_stdout
+from contextlib import redirect_stderr
+
+from gtunrealdevice.config import Data
+from gtunrealdevice.client import Client
+from gtunrealdevice.utils import File
+from gtunrealdevice.utils import Text
+from gtunrealdevice.utils import DictObject
+
+from gtunrealdevice.constant import ECODE
+
+
+class DaemonRequestHandler(socketserver.StreamRequestHandler):
+    """Handle a single JSON request per connection."""
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline().decode('utf-8'))
+            action = request.get('action', 'execute')
+            if action == 'execute':
+                response = self.server.run_command(
+                    request.get('args', []), cwd=request.get('cwd', '')
+                )
+            elif action == 'shutdown':
+                self.server.is_stopped = True
+                response = DictObject(exit_code=ECODE.SUCCESS, output='', error='')
+            else:
+                response = DictObject(exit_code=ECODE.SUCCESS, output='', error='')
+        except Exception as ex:
+            error = '{}\n'.format(Text(ex))
+            response = DictObject(exit_code=ECODE.BAD, output='', error=error)
+
+        self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """Unreal-device daemon server
+
+    Requests are processed sequentially so that console output of
+    a command can be captured by redirecting stdout and stderr.
+    """
+    def __init__(self, filename):
+        super().__init__(filename, DaemonRequestHandler)
+        self.is_stopped = False
+
+    def run_command(self, args, cwd=''):    # noqa
+        from gtunrealdevice.main import Cli
+        from gtunrealdevice.core import DEVICES_DATA
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        exit_code = ECODE.SUCCESS
+        try:
+            DEVICES_DATA.refresh()
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                Cli(args, cwd=cwd, is_forwarding=False).run()
+        except SystemExit as ex:
+            if isinstance(ex.code, int):
+                exit_code = ex.code
+            else:
+                exit_code = ECODE.BAD if ex.code else ECODE.SUCCESS
+        except Exception as ex:
+            stderr.write('{}\n'.format(Text(ex)))
+            exit_code = ECODE.BAD
+
+        response = DictObject(exit_code=int(exit_code),
+                              output=stdout.getvalue(),
+                              error=stderr.getvalue())
+        return response
+
+    def serve_until_stopped(self):
+        while not self.is_stopped:
+            self.handle_request()
+
+
+class Daemon:
+    """Unreal-device daemon class
+
+    Methods
+    -------
+    Daemon.is_supported() -> bool
+    Daemon.is_running() -> bool
+    Daemon.send(request, timeout=None) -> dict
+    Daemon.forward(args) -> int or None
+    Daemon.serve() -> None
+    Daemon.start(timeout=5) -> bool
+    Daemon.stop(timeout=5) -> bool
+    """
+    filename = Data.daemon_socket_filename
+    is_serving = False
+    message = ''
+
+    @classmethod
+    def is_supported(cls):
+        return Client.is_supported()
+
+    @classmethod
+    def send(cls, request, timeout=None):
+        """Send a request to daemon
+
+        Parameters
+        ----------
+        request (dict): a request
+        timeout (float): socket timeout in seconds.  Default is None.
+
+        Returns
+        -------
+        dict: a response from daemon
+
+        Raises
+        ------
+        OSError: raise exception if daemon is unavailable
+        """
+        return Client.send(request, timeout=timeout, filename=cls.filename)
+
+    @classmethod
+    def is_running(cls):
+        if not cls.is_supported() or not File.is_exist(cls.filename):
+            return False
+        try:
+            cls.send(dict(action='ping'), timeout=1)
+            return True
+        except (OSError, ValueError):
+            return False
+
+    @classmethod
+    def forward(cls, args):
+        """Forward console arguments to daemon if it is running
+
+        Parameters
+        ----------
+        args (list): a list of console arguments
+
+        Returns
+        -------
+        int: exit code of forwarded command or None if daemon is not running
+        """
+        if cls.is_serving:
+            return None
+        return Client.forward(args, filename=cls.filename)
+
+    @classmethod
+    def serve(cls):
+        """Run daemon in foreground until it receives a shutdown request"""
+        os.makedirs(os.path.dirname(cls.filename), exist_ok=True)
+        File.is_exist(cls.filename) and os.remove(cls.filename)
+
+        cls.is_serving = True
+        server = DaemonServer(cls.filename)
+        try:
+            server.serve_until_stopped()
+        finally:
+            server.server_close()
+            cls.is_serving = False
+            File.is_exist(cls.filename) and os.remove(cls.filename)
+
+    @classmethod
+    def start(cls, timeout=5):
+        """Start daemon in background
+
+        Parameters
+        ----------
+        timeout (float): waiting time for daemon to be ready.  Default is 5 seconds.
+
+        Returns
+        -------
+        bool: True if daemon is running, otherwise, False.
+        """
+        if not cls.is_supported():
+            cls.message = 'unreal-device daemon requires Unix domain socket support.'
+            return False
+
+        if cls.is_running():
+            cls.message = 'unreal-device daemon is already running.'
+            return True
+
+        subprocess.Popen(
+            [sys.executable, '-m', 'gtunrealdevice', 'daemon', 'run'],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+
+        expired_time = time.time() + timeout
+        while time.time() < expired_time:
+            if cls.is_running():
+                cls.message = 'unreal-device daemon is started.'
+                return True
+            time.sleep(0.05)
+
+        cls.message = 'CANT start unreal-device daemon.'
+        return False
+
+    @classmethod
+    def stop(cls, timeout=5):
+        """Stop running daemon
+
+        Parameters
+        ----------
+        timeout (float): waiting time for daemon to stop.  Default is 5 seconds.
+
+        Returns
+        -------
+        bool: True if daemon is stopped, otherwise, False.
+        """
+        if not cls.is_running():
+            cls.message = 'unreal-device daemon is not running.'
+            return True
+
+        cls.send(dict(action='shutdown'), timeout=timeout)
+
+        expired_time = time.time() + timeout
+        while time.time() < expired_time:
+            if not File.is_exist(cls.filename):
+                cls.message = 'unreal-device daemon is stopped.'
+                return True
+            time.sleep(0.05)
+
+        cls.message = 'CANT stop unreal-device daemon.'
+        return False
+
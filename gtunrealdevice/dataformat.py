@@ -0,0 +1,451 @@
+"""Module containing the serialization backend of gtunrealdevice.
+
+Every yaml or json parsing and dumping of gtunrealdevice goes through
+DataFormat.  The libyaml based CSafeLoader and CSafeDumper are preferred
+when PyYAML is built with libyaml, and json formatted data is handled
+with the json module.
+"""
+
+import json
+import base64
+
+import yaml
+from yaml.composer import Composer
+
+IS_LIBYAML = bool(getattr(yaml, '__with_libyaml__', False))
+
+
+class _PureLoader(yaml.SafeLoader):
+    """Pure python safe yaml loader of DataFormat"""
+
+
+class _PureDumper(yaml.SafeDumper):
+    """Pure python safe yaml dumper of DataFormat"""
+
+
+if IS_LIBYAML:
+    class _CLoader(yaml.CSafeLoader):
+        """libyaml safe yaml loader of DataFormat"""
+
+    class _CDumper(yaml.CSafeDumper):
+        """libyaml safe yaml dumper of DataFormat"""
+else:
+    _CLoader, _CDumper = _PureLoader, _PureDumper
+
+
+class DataFormat:
+    """Serialization backend for yaml and json data
+
+    Attributes
+    ----------
+    is_libyaml (bool): True if libyaml loader and dumper are available
+    loader (type): a safe yaml loader
+    dumper (type): a safe yaml dumper
+    dumpers (list): private yaml dumpers which custom representers are
+            registered to, so the global yaml dumpers are not changed
+    loaders (list): private yaml loaders which custom constructors are
+            registered to, so the global yaml loaders are not changed
+    alias_min_size (int): a minimum length of a repeated text which is
+            dumped once with an anchor when dumping with aliases
+    json_types (dict): tagged types of json encoding, i.e. a tag and its
+            data type, encoder, and decoder
+
+    Methods
+    -------
+    DataFormat.is_json_filename(filename) -> bool
+    DataFormat.is_json_text(text) -> bool
+    DataFormat.load(data, is_json=None) -> object
+    DataFormat.load_file(filename) -> object
+    DataFormat.compose(data) -> tuple
+    DataFormat.iter_items(stream, streamed_key='', on_item=None) -> generator
+    DataFormat.locate(node, path, is_key=False) -> str
+    DataFormat.dump(data, stream=None, is_json=False, is_aliased=False, **kwargs) -> str
+    DataFormat.dump_file(filename, data) -> None
+    DataFormat.add_representer(data_type, representer) -> None
+    DataFormat.add_constructor(tag, constructor) -> None
+    DataFormat.add_multi_constructor(tag_prefix, constructor) -> None
+    DataFormat.add_json_type(tag, data_type, encoder, decoder) -> None
+    DataFormat.encode_json(obj) -> object
+    DataFormat.decode_json(obj) -> object
+    DataFormat.get_backend_name() -> str
+    """
+    is_libyaml = IS_LIBYAML
+    loader = _CLoader if is_libyaml else _PureLoader
+    dumper = _CDumper if is_libyaml else _PureDumper
+    dumpers = list({_PureDumper, _CDumper})
+    loaders = list({_PureLoader, _CLoader})
+    alias_min_size = 64
+    json_types = dict()
+
+    @classmethod
+    def is_json_filename(cls, filename):
+        return str(filename).lower().endswith('.json')
+
+    @classmethod
+    def is_json_text(cls, text):
+        return text.lstrip()[:1] in ['{', '[']
+
+    @classmethod
+    def load(cls, data, is_json=None):
+        """Parse yaml or json data
+
+        Parameters
+        ----------
+        data (str, stream): yaml or json data
+        is_json (bool): parsing with json.  Default is None which detects
+                json by the first non-whitespace character of data.
+
+        Returns
+        -------
+        object: parsed data
+        """
+        if not isinstance(data, str):
+            data = data.read()
+
+        if is_json is None:
+            is_json = cls.is_json_text(data)
+
+        if is_json:
+            try:
+                return json.loads(data)
+            except ValueError:
+                pass
+        return yaml.load(data, Loader=cls.loader)
+
+    @classmethod
+    def load_file(cls, filename):
+        """Parse yaml or json file.  A .json file is parsed with json.
+
+        Parameters
+        ----------
+        filename (str): a file name
+
+        Returns
+        -------
+        object: parsed data
+        """
+        with open(filename) as stream:
+            is_json = True if cls.is_json_filename(filename) else None
+            return cls.load(stream, is_json=is_json)
+
+    @classmethod
+    def compose(cls, data):
+        """Parse yaml or json data and keep its node tree whose nodes
+        carry line and column positions
+
+        Parameters
+        ----------
+        data (str, stream): yaml or json data
+
+        Returns
+        -------
+        tuple: a root node or None, and parsed data
+
+        Raises
+        ------
+        yaml.YAMLError: raise exception if data is not well-formed
+        """
+        loader = cls.loader(data)
+        try:
+            node = loader.get_single_node()
+            result = None if node is None else loader.construct_document(node)
+            return node, result
+        finally:
+            loader.dispose()
+
+    @classmethod
+    def iter_items(cls, stream, streamed_key='', on_item=None):
+        """Parse a top-level yaml or json mapping one item at a time
+
+        Only a node tree of the current item is composed from parser
+        events, so memory is bounded by the largest item instead of the
+        whole document.  If streamed_key and on_item are provided, the
+        mapping under streamed_key of every item is not collected, but
+        each of its items is passed to on_item as soon as it is parsed.
+
+        Parameters
+        ----------
+        stream (str, stream): yaml or json data
+        streamed_key (str): a key of item whose mapping is streamed.  Default is empty.
+        on_item (callable): a callback with key of item, key and value of
+                streamed item, and a root node for locating errors.  Default is None.
+
+        Returns
+        -------
+        generator: key, value, and a root node of every item
+
+        Raises
+        ------
+        yaml.YAMLError: raise exception if data is not well-formed
+        ValueError: raise exception if data is not a mapping
+        """
+        loader = StreamLoader(stream)
+        try:
+            loader.get_event()
+            if loader.check_event(yaml.StreamEndEvent):
+                return
+            loader.get_event()
+            if not loader.check_event(yaml.MappingStartEvent):
+                node = loader.compose_node(None, None)
+                if isinstance(node, yaml.ScalarNode) and node.tag.endswith(':null'):
+                    return
+                raise ValueError('data is not a mapping')
+
+            loader.get_event()
+            while not loader.check_event(yaml.MappingEndEvent):
+                key_node = loader.compose_node(None, None)
+                key = loader.construct_document(key_node)
+                if streamed_key and on_item and loader.check_event(yaml.MappingStartEvent):
+                    node, value = cls._compose_streamed(loader, key_node, streamed_key, on_item)
+                else:
+                    node = loader.compose_node(None, None)
+                    value = loader.construct_document(node)
+                yield key, value, yaml.MappingNode(MAP_TAG, [(key_node, node)])
+        finally:
+            loader.dispose()
+
+    @classmethod
+    def _compose_streamed(cls, loader, key_node, streamed_key, on_item):
+        key = loader.construct_document(key_node)
+        start_mark = loader.get_event().start_mark
+        pairs, value = [], {}
+        while not loader.check_event(yaml.MappingEndEvent):
+            sub_key_node = loader.compose_node(None, None)
+            sub_key = loader.construct_document(sub_key_node)
+            if sub_key != streamed_key or not loader.check_event(yaml.MappingStartEvent):
+                sub_node = loader.compose_node(None, None)
+                value[sub_key] = loader.construct_document(sub_node)
+                pairs.append((sub_key_node, sub_node))
+                continue
+
+            loader.get_event()
+            while not loader.check_event(yaml.MappingEndEvent):
+                item_key_node = loader.compose_node(None, None)
+                item_node = loader.compose_node(None, None)
+                root = yaml.MappingNode(MAP_TAG, [(item_key_node, item_node)])
+                for node_key in [sub_key_node, key_node]:
+                    root = yaml.MappingNode(MAP_TAG, [(node_key, root)])
+                on_item(key, loader.construct_document(item_key_node),
+                        loader.construct_document(item_node), root)
+            loader.get_event()
+        end_mark = loader.get_event().end_mark
+        return yaml.MappingNode(MAP_TAG, pairs, start_mark, end_mark), value
+
+    @classmethod
+    def locate(cls, node, path, is_key=False):
+        """Locate the position of a path of keys in a node tree
+
+        Parameters
+        ----------
+        node (yaml.Node): a root node
+        path (tuple): a path of mapping keys
+        is_key (bool): locating the last key instead of its value.  Default is False.
+
+        Returns
+        -------
+        str: a position, e.g. "line 3, column 5", or empty if node is None
+        """
+        if node is None:
+            return ''
+
+        for index, key in enumerate(path):
+            if not isinstance(node, yaml.MappingNode):
+                break
+            pair = next((p for p in node.value if p[0].value == str(key)), None)
+            if pair is None:
+                break
+            is_last = index == len(path) - 1
+            node = pair[0] if is_last and is_key else pair[1]
+
+        mark = node.start_mark
+        if mark is None:
+            return ''
+        return 'line {}, column {}'.format(mark.line + 1, mark.column + 1)
+
+    @classmethod
+    def dump(cls, data, stream=None, is_json=False, is_aliased=False, **kwargs):
+        """Dump data to yaml or json
+
+        Parameters
+        ----------
+        data (object): data
+        stream (stream): a writable stream.  Default is None.
+        is_json (bool): dumping with json.  Default is False.
+        is_aliased (bool): dumping a long text which is referenced more than
+                once with an anchor and aliases.  Default is False.
+        kwargs (dict): keyword arguments of yaml.dump or json.dump
+
+        Returns
+        -------
+        str: dumped data if stream is None, otherwise, None
+        """
+        if is_json:
+            kwargs.setdefault('indent', 2)
+            kwargs.setdefault('default', str)
+            if stream is None:
+                return json.dumps(data, **kwargs)
+            json.dump(data, stream, **kwargs)
+            return None
+
+        kwargs.setdefault('default_flow_style', False)
+        dumper = AliasDumper if is_aliased else cls.dumper
+        return yaml.dump(data, stream, Dumper=dumper, **kwargs)
+
+    @classmethod
+    def dump_file(cls, filename, data):
+        """Dump data to a file.  A .json file is dumped with json.
+
+        Parameters
+        ----------
+        filename (str): a file name
+        data (object): data
+        """
+        with open(filename, 'w') as stream:
+            cls.dump(data, stream, is_json=cls.is_json_filename(filename))
+
+    @classmethod
+    def add_representer(cls, data_type, representer):
+        """Register a yaml representer to dumpers of DataFormat
+
+        Parameters
+        ----------
+        data_type (type): a data type
+        representer (callable): a representer function
+        """
+        for dumper in cls.dumpers:
+            yaml.add_representer(data_type, representer, Dumper=dumper)
+
+    @classmethod
+    def add_constructor(cls, tag, constructor):
+        """Register a yaml constructor to loaders of DataFormat
+
+        Parameters
+        ----------
+        tag (str): a yaml tag
+        constructor (callable): a constructor function
+        """
+        for loader in cls.loaders:
+            yaml.add_constructor(tag, constructor, Loader=loader)
+
+    @classmethod
+    def add_multi_constructor(cls, tag_prefix, constructor):
+        """Register a yaml multi constructor to loaders of DataFormat
+
+        Parameters
+        ----------
+        tag_prefix (str): a prefix of yaml tags
+        constructor (callable): a constructor function
+        """
+        for loader in cls.loaders:
+            yaml.add_multi_constructor(tag_prefix, constructor, Loader=loader)
+
+    @classmethod
+    def add_json_type(cls, tag, data_type, encoder, decoder):
+        """Register a tagged type of json encoding
+
+        Parameters
+        ----------
+        tag (str): a tag of encoded object
+        data_type (type): a data type
+        encoder (callable): a function which encodes an object to json data
+        decoder (callable): a function which decodes json data to an object
+        """
+        cls.json_types[tag] = data_type, encoder, decoder
+
+    @classmethod
+    def encode_json(cls, obj):
+        """Encode an object to json data without losing its types
+
+        An object which json does not support, e.g. bytes or a compressed
+        output, is encoded to a mapping with its tag under JSON_TYPE_KEY.
+        A type which is not registered is encoded to yaml.
+
+        Parameters
+        ----------
+        obj (object): an object
+
+        Returns
+        -------
+        object: json data which is decoded with DataFormat.decode_json
+        """
+        if obj is None or isinstance(obj, (str, int, float)):
+            return obj
+        if isinstance(obj, dict):
+            if JSON_TYPE_KEY not in obj and all(isinstance(key, str) for key in obj):
+                return {key: cls.encode_json(value) for key, value in obj.items()}
+            items = [[cls.encode_json(key), cls.encode_json(value)] for key, value in obj.items()]
+            return {JSON_TYPE_KEY: 'dict', 'value': items}
+        if isinstance(obj, (list, tuple)):
+            return [cls.encode_json(item) for item in obj]
+        for tag, (data_type, encoder, _) in cls.json_types.items():
+            if isinstance(obj, data_type):
+                return {JSON_TYPE_KEY: tag, 'value': encoder(obj)}
+        return {JSON_TYPE_KEY: 'yaml', 'value': cls.dump(obj)}
+
+    @classmethod
+    def decode_json(cls, obj):
+        """Decode json data of DataFormat.encode_json
+
+        Parameters
+        ----------
+        obj (object): json data
+
+        Returns
+        -------
+        object: a decoded object
+
+        Raises
+        ------
+        ValueError: raise exception if json data has an unsupported tag
+        """
+        if isinstance(obj, list):
+            return [cls.decode_json(item) for item in obj]
+        if not isinstance(obj, dict):
+            return obj
+
+        tag = obj.get(JSON_TYPE_KEY)
+        if tag is None:
+            return {key: cls.decode_json(value) for key, value in obj.items()}
+        value = obj.get('value')
+        if tag == 'dict':
+            return {cls.decode_json(key): cls.decode_json(val) for key, val in value}
+        if tag == 'yaml':
+            return cls.load(value, is_json=False)
+        if tag not in cls.json_types:
+            raise ValueError('unsupported {!r} tag of json data'.format(tag))
+        return cls.json_types[tag][2](value)
+
+    @classmethod
+    def get_backend_name(cls):
+        return 'libyaml' if cls.is_libyaml else 'pure python'
+
+
+MAP_TAG = 'tag:yaml.org,2002:map'
+JSON_TYPE_KEY = '!type'
+
+
+class StreamLoader(DataFormat.loader, Composer):
+    """Safe yaml loader which composes nodes from parser events on demand"""
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.anchors = getattr(self, 'anchors', {})
+
+
+class AliasDumper(DataFormat.dumper):
+    """Safe yaml dumper which dumps a long text referenced more than once
+    with an anchor and aliases"""
+    def ignore_aliases(self, data):
+        if isinstance(data, (str, bytes)) and len(data) >= DataFormat.alias_min_size:
+            return False
+        return super().ignore_aliases(data)
+
+
+def encode_bytes(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+def decode_bytes(text):
+    return base64.b64decode(text.encode('ascii'))
+
+
+DataFormat.add_json_type('bytes', bytes, encode_bytes, decode_bytes)
@@ -1,14 +1,32 @@
 """Module containing the logic for console command line examples"""
 
-from yaml import safe_load
+import functools
+
 from pathlib import Path
 from gtunrealdevice.utils import Printer
+from gtunrealdevice.yamlcache import YamlCache
+
+
+EXAMPLE_DATA_FILENAME = str(Path(Path(__file__).parent, 'exampledata.yaml'))
+
+
+@functools.lru_cache(maxsize=None)
+def load_example_data():
+    """Load exampledata.yaml once per process.
+
+    The parsed data is cached in the cache directory and reused as long as
+    exampledata.yaml is unchanged.  Nothing is cached in in-memory mode.
+
+    Returns
+    -------
+    dict: example data
+    """
+    dict_obj = YamlCache.load(EXAMPLE_DATA_FILENAME)
+    return dict_obj
 
 
 def get_number_of_example(name, default=1):
-    file_obj = Path(Path(__file__).parent, 'exampledata.yaml')
-    content = file_obj.read_text()
-    dict_obj = safe_load(content)
+    dict_obj = load_example_data()
     result = dict_obj.get(name, dict())
     total = len(result) or default
     return total
@@ -19,9 +37,7 @@ class Example:
 
     @classmethod
     def get(cls, index):
-        file_obj = Path(Path(__file__).parent, 'exampledata.yaml')
-        content = file_obj.read_text()
-        dict_obj = safe_load(content)
+        dict_obj = load_example_data()
         node = dict_obj.get(cls.name).get('example{}'.format(index))
         header = node.get('header')
         header = Printer.get(header)
@@ -46,6 +62,10 @@ class ConfigureExample(Example):
     name = 'configure'
 
 
+class DaemonExample(Example):
+    name = 'daemon'
+
+
 class ReloadExample(Example):
     name = 'reload'
 
@@ -31,3 +31,7 @@ class InvalidSerializedFile(SerializedError):
 
 class InvalidSerializedInstance(SerializedError):
     """Use to capture error for serialized file."""
+
+
+class OutputPipeError(UnrealDeviceError):
+    """Use to capture error for invalid output pipe of command line."""
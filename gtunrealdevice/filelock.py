@@ -0,0 +1,66 @@
+"""Module containing the inter-process file lock of gtunrealdevice.
+
+Devices info files are shared by parallel CLI workers on one host, so
+their read-modify-write sections are serialized with an advisory fcntl
+lock on a side file, e.g. devices_info.yaml.lock.  A lock is reentrant
+within a process.  Where fcntl is unavailable, locking is a no-op.
+"""
+
+import os
+import threading
+import contextlib
+
+try:
+    import fcntl
+except ImportError:     # pragma: no cover
+    fcntl = None
+
+
+class FileLock:
+    """Reentrant inter-process lock on a side file
+
+    Attributes
+    ----------
+    filename (str): a lock file name
+    is_supported (bool): True if fcntl is available
+
+    Methods
+    -------
+    acquire() -> contextmanager
+    """
+    is_supported = fcntl is not None
+
+    def __init__(self, filename):
+        self.filename = os.path.expanduser(filename)
+        self._lock = threading.RLock()
+        self._stream = None
+        self._count = 0
+
+    @contextlib.contextmanager
+    def acquire(self):
+        """Hold an exclusive lock until exit
+
+        Yields
+        ------
+        FileLock: this lock
+        """
+        with self._lock:
+            if self._count == 0 and self.is_supported:
+                directory = os.path.dirname(os.path.abspath(self.filename))
+                os.makedirs(directory, exist_ok=True)
+                stream = open(self.filename, 'a')
+                try:
+                    fcntl.flock(stream.fileno(), fcntl.LOCK_EX)
+                except BaseException:
+                    stream.close()
+                    raise
+                self._stream = stream
+            self._count += 1
+            try:
+                yield self
+            finally:
+                self._count -= 1
+                if self._count == 0 and self._stream is not None:
+                    fcntl.flock(self._stream.fileno(), fcntl.LOCK_UN)
+                    self._stream.close()
+                    self._stream = None
@@ -0,0 +1,283 @@
+"""Module containing the logic for file-backed command outputs.
+
+An output of a command line can be a reference to an external file, so
+a large capture stays out of devices data and devices_info.yaml.  A file
+reference is an explicit !file yaml tag, e.g.
+
+    show tech-support: !file /captures/show_tech.txt
+
+or a single line file::path output of an existing file which is passed
+to DevicesData.update_command_line.  A literal file:: line of any other
+output is a plain output.  The file is mapped with mmap on demand when
+its command line is executed, and its lines are streamed without reading
+the whole file to memory.  Mapped files are kept in a bounded LRU, and
+an evicted file is unmapped once it is not used, so file descriptor use
+stays bounded.
+"""
+
+import os
+import re
+import mmap
+import threading
+from collections import OrderedDict
+
+from gtunrealdevice.dataformat import DataFormat
+
+TAG = '!file'
+
+
+class FileReference:
+    """Reference to a file whose content is an output of command line
+
+    Attributes
+    ----------
+    filename (str): a file name
+    """
+    __slots__ = ('filename',)
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def __eq__(self, other):
+        if not isinstance(other, FileReference):
+            return NotImplemented
+        return self.filename == other.filename
+
+    def __hash__(self):
+        return hash((type(self).__name__, self.filename))
+
+    def __str__(self):
+        return 'file::{}'.format(self.filename)
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.filename)
+
+    def __getstate__(self):
+        return self.filename
+
+    def __setstate__(self, state):
+        self.filename = state
+
+
+class MappedFile:
+    """Memory map of a file which is shared through the LRU of FileOutput
+
+    Attributes
+    ----------
+    signature (tuple): mtime and size of file
+    data (mmap.mmap): a read-only memory map, or None if file is empty
+    users (int): a number of callers which use the memory map
+    is_evicted (bool): True if it is evicted from the LRU, otherwise, False.
+    """
+    __slots__ = ('signature', 'data', 'users', 'is_evicted')
+
+    def __init__(self, signature, data):
+        self.signature = signature
+        self.data = data
+        self.users = 0
+        self.is_evicted = False
+
+    def close(self):
+        self.data is not None and self.data.close()
+
+
+class FileOutput:
+    """File-backed command output
+
+    Attributes
+    ----------
+    pattern (str): a regular expression of a file::path output
+    max_handles (int): a maximum number of mapped files
+    encoding (str): an encoding of referenced files
+
+    Methods
+    -------
+    FileOutput.match_filename(text) -> str
+    FileOutput.get_filename(output) -> str
+    FileOutput.get_reference(filename) -> FileReference
+    FileOutput.open(filename) -> MappedFile
+    FileOutput.close(handle) -> None
+    FileOutput.read(filename) -> str
+    FileOutput.iter_lines(filename) -> generator
+    FileOutput.clear() -> None
+    """
+    pattern = r'(?i) *file(name)?:: *(?P<fn>[^\r\n]*[a-z][^\r\n]*?) *$'
+    max_handles = 64
+    encoding = 'utf-8'
+    _handles = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def match_filename(cls, text):
+        """Get file name of a single line file::path or filename::path text
+
+        Parameters
+        ----------
+        text (object): a text
+
+        Returns
+        -------
+        str: an expanded file name if text is a file::path line, otherwise, empty
+        """
+        if not isinstance(text, str) or '::' not in text[:256]:
+            return ''
+        match = re.match(cls.pattern, text)
+        return os.path.expanduser(match.group('fn')) if match else ''
+
+    @classmethod
+    def get_filename(cls, output):
+        """Get file name of a file reference
+
+        Parameters
+        ----------
+        output (object): an output of command line
+
+        Returns
+        -------
+        str: an expanded file name if output is a file reference, otherwise, empty
+        """
+        if not isinstance(output, FileReference):
+            return ''
+        return os.path.expanduser(output.filename)
+
+    @classmethod
+    def get_reference(cls, filename):
+        return FileReference(os.path.abspath(os.path.expanduser(filename)))
+
+    @classmethod
+    def open(cls, filename):
+        """Map a file through the LRU of mapped files.  A changed file is
+        mapped again.  A handle must be closed with FileOutput.close, and
+        an evicted file is unmapped once every handle is closed.
+
+        Parameters
+        ----------
+        filename (str): a file name
+
+        Returns
+        -------
+        MappedFile: a mapped file handle
+
+        Raises
+        ------
+        OSError: raise exception if file cannot be opened
+        """
+        stat = os.stat(filename)
+        signature = stat.st_mtime_ns, stat.st_size
+        with cls._lock:
+            handle = cls._handles.get(filename)
+            if handle and handle.signature == signature:
+                cls._handles.move_to_end(filename)
+                handle.users += 1
+                return handle
+
+        if stat.st_size:
+            with open(filename, 'rb') as stream:
+                data = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = None
+
+        handle = MappedFile(signature, data)
+        handle.users = 1
+        with cls._lock:
+            evicted = [cls._handles.pop(filename, None)]
+            cls._handles[filename] = handle
+            while len(cls._handles) > cls.max_handles:
+                evicted.append(cls._handles.popitem(last=False)[1])
+            for item in evicted:
+                item and cls._evict(item)
+        return handle
+
+    @classmethod
+    def close(cls, handle):
+        """Release a mapped file handle of FileOutput.open
+
+        Parameters
+        ----------
+        handle (MappedFile): a mapped file handle
+        """
+        with cls._lock:
+            handle.users -= 1
+            handle.is_evicted and not handle.users and handle.close()
+
+    @classmethod
+    def _evict(cls, handle):
+        handle.is_evicted = True
+        not handle.users and handle.close()
+
+    @classmethod
+    def read(cls, filename):
+        """Read a whole file
+
+        Parameters
+        ----------
+        filename (str): a file name
+
+        Returns
+        -------
+        str: a content of file
+        """
+        handle = cls.open(filename)
+        try:
+            data = handle.data
+            return str(data, cls.encoding, 'replace') if data is not None else ''
+        finally:
+            cls.close(handle)
+
+    @classmethod
+    def iter_lines(cls, filename):
+        """Iterate lines of a file from its memory map.  The file is mapped
+        by this call, so a file which cannot be opened raises OSError here
+        instead of at the first line.
+
+        Parameters
+        ----------
+        filename (str): a file name
+
+        Returns
+        -------
+        generator: a generator of lines
+
+        Raises
+        ------
+        OSError: raise exception if file cannot be opened
+        """
+        return cls._iter_lines(cls.open(filename))
+
+    @classmethod
+    def _iter_lines(cls, handle):
+        try:
+            data = handle.data
+            start, size = 0, len(data) if data is not None else 0
+            while start < size:
+                end = data.find(b'\n', start)
+                end = size if end == -1 else end
+                yield data[start:end].decode(cls.encoding, 'replace').rstrip('\r')
+                start = end + 1
+        finally:
+            cls.close(handle)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            handles = list(cls._handles.values())
+            cls._handles.clear()
+            for handle in handles:
+                cls._evict(handle)
+
+
+def represent_file_reference(dumper, data):
+    return dumper.represent_scalar(TAG, data.filename)
+
+
+def construct_file_reference(loader, node):
+    return FileReference(loader.construct_scalar(node))
+
+
+def encode_file_reference(data):
+    return data.filename
+
+
+DataFormat.add_representer(FileReference, represent_file_reference)
+DataFormat.add_constructor(TAG, construct_file_reference)
+DataFormat.add_json_type('file', FileReference, encode_file_reference, FileReference)
@@ -0,0 +1,226 @@
+"""Module containing the logic for running unreal devices as a group."""
+
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+
+from gtunrealdevice.core import UnrealDevice
+from gtunrealdevice.core import DEVICES_DATA
+from gtunrealdevice.memorymode import MemoryMode
+
+from gtunrealdevice.utils import DictObject
+from gtunrealdevice.utils import Text
+
+from gtunrealdevice.constant import ECODE
+
+
+def init_worker(snapshot):
+    """Load devices data once in a process pool worker.
+
+    Devices data of worker is kept in memory, so a worker does not write
+    devices info or sessions files of the parent process.
+
+    Parameters
+    ----------
+    snapshot (dict): a snapshot of devices data of the parent process
+    """
+    MemoryMode.enable()
+    DEVICES_DATA.restore(snapshot)
+
+
+def run_device_method(device, method_name, args, kwargs):
+    """Run an UnrealDevice method and collect its result.
+
+    It is a module-level function so that it can be pickled for
+    a process pool.  A device is pickled as its session state, and its
+    device data is re-attached from devices data of worker.
+
+    Parameters
+    ----------
+    device (UnrealDevice): an unreal device instance
+    method_name (str): a method name of UnrealDevice
+    args (tuple): positional arguments of method
+    kwargs (dict): keyword arguments of method
+
+    Returns
+    -------
+    DictObject: output, success_code, and table of output-cycling cursors
+    """
+    try:
+        method = getattr(device, method_name)
+        output = method(*args, **kwargs)
+        success_code = device.success_code
+    except Exception as ex:
+        output = Text(ex)
+        success_code = ECODE.BAD
+    return DictObject(output=output, success_code=success_code, table=device.table)
+
+
+class DeviceGroup:
+    """Device Group class
+
+    Run connect, execute, configure, and disconnect across many unreal
+    devices on a thread pool or a process pool.  All devices share
+    DEVICES_DATA and nothing is printed unless showed=True is provided.
+    A process pool worker loads a snapshot of DEVICES_DATA once when the
+    pool starts, and every call sends only the session state of device.
+
+    Attributes
+    ----------
+    hosts (list): a list of device addresses or names
+    max_workers (int): a maximum number of workers.  Default is None.
+    is_process (bool): using process pool instead of thread pool.  Default is False.
+
+    Methods
+    -------
+    connect(default=True, **kwargs) -> dict
+    disconnect(**kwargs) -> dict
+    execute(cmdline, **kwargs) -> dict
+    configure(config, **kwargs) -> dict
+    close() -> None
+    """
+    def __init__(self, hosts, max_workers=None, is_process=False):
+        self.hosts = list(hosts)
+        self.max_workers = max_workers
+        self.is_process = is_process
+        self.devices = dict()
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self.devices)
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            if self.is_process:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, initializer=init_worker,
+                    initargs=(DEVICES_DATA.snapshot(),)
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def run(self, method_name, *args, **kwargs):
+        """Run an UnrealDevice method across devices in group
+
+        Parameters
+        ----------
+        method_name (str): a method name of UnrealDevice
+        args (tuple): positional arguments of method
+        kwargs (dict): keyword arguments of method
+
+        Returns
+        -------
+        dict: a mapping of device address to DictObject(output, success_code)
+        """
+        kwargs.setdefault('showed', False)
+        futures = dict()
+        for address, device in self.devices.items():
+            future = self.executor.submit(run_device_method, device,
+                                          method_name, args, kwargs)
+            futures[address] = future
+
+        tbl = dict()
+        for address, future in futures.items():
+            result = future.result()
+            if self.is_process:
+                device = self.devices[address]
+                device.table.update(result.table)
+                device.success_code = result.success_code
+            tbl[address] = DictObject(output=result.output,
+                                      success_code=result.success_code)
+        return tbl
+
+    def connect(self, default=True, **kwargs):
+        """Connect all devices in group in one batch of DEVICES_DATA, so
+        auto-generated devices are saved once, and they are rolled back
+        together if connecting is interrupted.
+
+        Parameters
+        ----------
+        default (bool): connect to default device if host is not found.
+        kwargs (dict): keyword arguments
+
+        Returns
+        -------
+        dict: a mapping of device address to DictObject(output, success_code)
+        """
+        tbl = dict()
+        is_timestamp = kwargs.get('is_timestamp', True)
+        kwargs.setdefault('showed', False)
+        addresses = DEVICES_DATA.get_addresses_from_names(self.hosts)
+        added = []
+        try:
+            with DEVICES_DATA.batch():
+                for address in addresses:
+                    if address in tbl:
+                        continue
+                    device = self.devices.get(address) or UnrealDevice(address)
+                    try:
+                        device.connect(default=default, **kwargs)
+                        address in self.devices or added.append(address)
+                        self.devices[address] = device
+                        output = device.get_login_output(is_timestamp=is_timestamp)
+                        tbl[address] = DictObject(output=output, success_code=device.success_code)
+                    except Exception as ex:
+                        tbl[address] = DictObject(output=Text(ex), success_code=ECODE.BAD)
+        except BaseException:
+            for address in added:
+                self.devices.pop(address)
+            raise
+        return tbl
+
+    def disconnect(self, **kwargs):
+        """Disconnect all devices in group
+
+        Returns
+        -------
+        dict: a mapping of device address to DictObject(output, success_code)
+        """
+        tbl = dict()
+        is_timestamp = kwargs.get('is_timestamp', True)
+        kwargs.setdefault('showed', False)
+        for address, device in self.devices.items():
+            device.disconnect(**kwargs)
+            output = device.get_logout_output(is_timestamp=is_timestamp)
+            tbl[address] = DictObject(output=output, success_code=device.success_code)
+        return tbl
+
+    def execute(self, cmdline, **kwargs):
+        """Execute command line across devices in group
+
+        Parameters
+        ----------
+        cmdline (str): command line
+        kwargs (dict): keyword arguments
+
+        Returns
+        -------
+        dict: a mapping of device address to DictObject(output, success_code)
+        """
+        return self.run('execute', cmdline, **kwargs)
+
+    def configure(self, config, **kwargs):
+        """Configure devices in group
+
+        Parameters
+        ----------
+        config (str): configuration data for device
+        kwargs (dict): keyword arguments
+
+        Returns
+        -------
+        dict: a mapping of device address to DictObject(output, success_code)
+        """
+        return self.run('configure', config, **kwargs)
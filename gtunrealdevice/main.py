@@ -1,5 +1,6 @@
 """Module containing the logic for the gtunrealdevice entry-points."""
 
+import os
 import sys
 import argparse
 
@@ -10,6 +11,9 @@ from gtunrealdevice.core import DEVICES_DATA
 from gtunrealdevice.utils import Printer
 
 from gtunrealdevice.serialization import SerializedFile
+from gtunrealdevice.daemon import Daemon
+from gtunrealdevice.yamlcache import YamlCache
+from gtunrealdevice.outputpool import OutputPool
 
 from gtunrealdevice.operation import do_device_connect
 from gtunrealdevice.operation import do_device_disconnect
@@ -29,8 +33,10 @@ from gtunrealdevice.utils import File
 from gtunrealdevice.utils import MiscDevice
 from gtunrealdevice.utils import DictObject
 from gtunrealdevice.utils import Text
+from gtunrealdevice.utils import Misc
 
 from gtunrealdevice.constant import ECODE
+from gtunrealdevice.exceptions import DevicesInfoError
 
 
 class ArgumentParser(argparse.ArgumentParser):
@@ -147,6 +153,9 @@ def show_info(options):
                 generic_fn = File.change_home_dir_to_generic(fn)
                 lst.append('  - Location: {}'.format(generic_fn))
             lst.append('  - Total devices: {}'.format(len(DEVICES_DATA)))
+            lst.append('  - Parsed yaml cache: {}'.format(YamlCache.get_info_text()))
+            stats = DEVICES_DATA.get_output_stats()
+            lst.append('  - Output dedup: {}'.format(OutputPool.get_info_text(stats)))
             if len(DEVICES_DATA):
                 fmt = '    ~ host: {:16} name: {}'
                 for host in DEVICES_DATA:
@@ -154,7 +163,7 @@ def show_info(options):
                     lst.append(fmt.format(host, name))
 
         if is_all or is_serialization:
-            tbl = SerializedFile.get_info()
+            tbl = SerializedFile.get_info(is_instance=False)
             lst and lst.append('--------------------')
             lst.append('Serialization File Info:')
             generic_fn = File.change_home_dir_to_generic(tbl.get('filename'))
@@ -179,6 +188,7 @@ def load_device_info(options):
         validate_example_usage(options.command, options.operands)
 
         fn = options.filename.strip() or operands[0] if len(operands) > 0 else ''
+        fn = fn and os.path.join(options.cwd, os.path.expanduser(fn))
         if fn:
             if not File.is_exist(fn):
                 print()
@@ -187,30 +197,80 @@ def load_device_info(options):
         else:
             show_usage(command, exit_code=ECODE.BAD)
 
-        is_valid = DEVICES_DATA.is_valid_file(fn)
-        if not is_valid:
-            sample_format = DEVICES_DATA.get_sample_device_info_format()
-            print(sample_format)
-            sys.exit(ECODE.BAD)
-
         txt = operands[1].lower() if len(operands) > 1 else ''
 
         is_saved = options.saved or txt.startswith('save')
 
+        try:
+            with DEVICES_DATA.batch():
+                DEVICES_DATA.load(fn)
+                is_saved and DEVICES_DATA.save()
+        except DevicesInfoError:
+            print('\n{}\n'.format(DEVICES_DATA.message))
+            sample_format = DEVICES_DATA.get_sample_device_info_format()
+            print(sample_format)
+            sys.exit(ECODE.BAD)
+
         if is_saved:
-            DEVICES_DATA.load(fn)
-            DEVICES_DATA.save()
             fmt = ('Successfully loaded "{}" device info and '
                    'saved to "{}" file')
-            Printer.print_unreal_device_msg(fmt, fn, Data.devices_info_filename)
+            Printer.print_unreal_device_msg(fmt, fn, DEVICES_DATA.filenames[0])
         else:
-            DEVICES_DATA.load(fn)
             fmt = ('loaded "{}" device info, but not '
                    'permanently save to devices info')
             Printer.print_unreal_device_msg(fmt, fn)
         sys.exit(ECODE.SUCCESS)
 
 
+def run_daemon(options):
+    command, operands = options.command, options.operands
+    if command == 'daemon':
+        validate_usage(command, operands)
+        validate_example_usage(command, operands)
+
+        if len(operands) > 1:
+            show_usage(command, exit_code=ECODE.BAD)
+
+        action = operands[0].strip().lower() if operands else 'status'
+
+        if action == 'start':
+            is_started = Daemon.start()
+            Printer.print_unreal_device_msg(Daemon.message)
+            sys.exit(ECODE.SUCCESS if is_started else ECODE.BAD)
+        elif action == 'stop':
+            is_stopped = Daemon.stop()
+            Printer.print_unreal_device_msg(Daemon.message)
+            sys.exit(ECODE.SUCCESS if is_stopped else ECODE.BAD)
+        elif action == 'status':
+            status = 'running' if Daemon.is_running() else 'not running'
+            generic_fn = File.change_home_dir_to_generic(Daemon.filename)
+            fmt = 'unreal-device daemon is {} (socket={})'
+            Printer.print_unreal_device_msg(fmt, status, generic_fn)
+            sys.exit(ECODE.SUCCESS)
+        elif action == 'run':
+            Daemon.serve()
+            sys.exit(ECODE.SUCCESS)
+        else:
+            show_usage(command, exit_code=ECODE.BAD)
+
+
+def forward_to_daemon(options, args):
+    """Forward command to unreal-device daemon if it is running.
+
+    Parameters
+    ----------
+    options (argparse.Namespace): argparse.Namespace instance.
+    args (list): a list of console arguments.
+
+    Returns
+    -------
+    None: will invoke ``sys.exit(exit_code)`` if command is processed by daemon
+    """
+    if options.command not in ['app', 'daemon', 'gui']:
+        exit_code = Daemon.forward(args)
+        Misc.is_integer(exit_code) and sys.exit(exit_code)
+
+
 def show_global_usage(options):
     if options.command == 'usage':
         print(get_global_usage())
@@ -221,11 +281,11 @@ class Cli:
     """gtunrealdevice console CLI application."""
     prog = 'unreal-device'
     prog_fn = 'geeks-trident-unreal-device-app'
-    commands = ['app', 'configure', 'connect', 'destroy',
+    commands = ['app', 'configure', 'connect', 'daemon', 'destroy',
                 'disconnect', 'execute', 'gui', 'info', 'list', 'load',
                 'release', 'reload', 'usage', 'version', 'view']
 
-    def __init__(self):
+    def __init__(self, args=None, cwd='', is_forwarding=True):
         # parser = argparse.ArgumentParser(
         parser = ArgumentParser(
             prog=self.prog,
@@ -296,7 +356,7 @@ class Cli:
 
         parser.add_argument(
             'command', type=str, nargs='?', default='',
-            help='command must be either app, configure, connect, '
+            help='command must be either app, configure, connect, daemon, '
                  'destroy, disconnect, execute, gui, info, list, load, '
                  'release, reload, usage, version, or view'
         )
@@ -308,7 +368,10 @@ class Cli:
         self.kwargs = dict()
         self.parser = parser
 
-        self.options = self.parser.parse_args()
+        self.args = sys.argv[1:] if args is None else list(args)
+        self.options = self.parser.parse_args(self.args)
+        self.options.cwd = cwd
+        self.is_forwarding = is_forwarding
 
     def validate_command(self):
         """Validate argparse `options.command`.
@@ -316,7 +379,7 @@ class Cli:
         Returns
         -------
         bool: show ``self.parser.print_help()`` and call ``sys.exit(ECODE.BAD)`` if
-        command is not  app, configure, connect, destroy,
+        command is not  app, configure, connect, daemon, destroy,
         disconnect, execute, gui, info, load, release, reload, usage,
         version, or view, otherwise, return True
         """
@@ -330,12 +393,14 @@ class Cli:
     def run(self):
         """Take CLI arguments, parse it, and process."""
         self.validate_command()
+        self.is_forwarding and forward_to_daemon(self.options, self.args)
         run_gui_application(self.options)
         show_version(self.options)
         show_info(self.options)
         view_device_info(self.options)
         load_device_info(self.options)
         show_global_usage(self.options)
+        run_daemon(self.options)
 
         # device action
         do_device_connect(self.options)
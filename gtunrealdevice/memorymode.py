@@ -0,0 +1,93 @@
+"""Module containing the in-memory mode of gtunrealdevice.
+
+In in-memory mode, devices info and sessions of unreal devices are kept
+in memory only, so test suites which connect many unreal devices do
+not read or write ~/.geekstrident/gtunrealdevice, and they do not
+interfere with each other or with CLI sessions.  It is enabled with
+environment variable GTUNREALDEVICE_IN_MEMORY or MemoryMode.enable(),
+and the whole store is copied and put back with snapshot and restore,
+e.g.
+
+    MemoryMode.enable()
+    with MemoryMode.isolated():
+        device = UnrealDevice('1.1.1.1')
+        device.connect()
+"""
+
+import contextlib
+
+from gtunrealdevice.config import Data
+from gtunrealdevice.core import DEVICES_DATA
+from gtunrealdevice.serialization import SerializedFile
+
+
+class MemoryMode:
+    """In-memory mode of devices info and sessions
+
+    Methods
+    -------
+    MemoryMode.is_enabled() -> bool
+    MemoryMode.enable() -> None
+    MemoryMode.disable() -> None
+    MemoryMode.reset() -> None
+    MemoryMode.snapshot() -> dict
+    MemoryMode.restore(snapshot) -> None
+    MemoryMode.isolated() -> contextmanager
+    """
+    @classmethod
+    def is_enabled(cls):
+        return Data.is_in_memory
+
+    @classmethod
+    def enable(cls):
+        """Keep devices info and sessions in memory starting with an empty store"""
+        Data.is_in_memory = True
+        cls.reset()
+
+    @classmethod
+    def disable(cls):
+        """Drop in-memory store, and use devices info and sessions files again"""
+        Data.is_in_memory = False
+        cls.reset()
+
+    @classmethod
+    def reset(cls):
+        """Forget devices info and close sessions without saving them"""
+        DEVICES_DATA.reset()
+        SerializedFile.close()
+
+    @classmethod
+    def snapshot(cls):
+        """Copy devices info and sessions
+
+        Returns
+        -------
+        dict: devices and sessions snapshots
+        """
+        return dict(devices=DEVICES_DATA.snapshot(), sessions=SerializedFile.snapshot())
+
+    @classmethod
+    def restore(cls, snapshot):
+        """Replace devices info and sessions with a snapshot
+
+        Parameters
+        ----------
+        snapshot (dict): a snapshot of MemoryMode.snapshot()
+        """
+        DEVICES_DATA.restore(snapshot['devices'])
+        SerializedFile.restore(snapshot['sessions'])
+
+    @classmethod
+    @contextlib.contextmanager
+    def isolated(cls):
+        """Restore devices info and sessions at exit
+
+        Yields
+        ------
+        dict: a snapshot which is restored at exit
+        """
+        snapshot = cls.snapshot()
+        try:
+            yield snapshot
+        finally:
+            cls.restore(snapshot)
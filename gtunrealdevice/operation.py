@@ -107,7 +107,8 @@ def do_device_destroy(options):
         host_addr = DEVICES_DATA.get_address_from_name(host)
 
         if host_addr:
-            result = SerializedFile.remove_instance(host_addr)
+            with DEVICES_DATA.batch():
+                result = SerializedFile.remove_instance(host_addr)
             Printer.print_unreal_device_msg(SerializedFile.message)
             sys.exit(int(result))
         else:
@@ -127,7 +128,8 @@ def do_device_release(options):
         host_addr = DEVICES_DATA.get_address_from_name(host)
 
         if host_addr:
-            result = SerializedFile.remove_instance(host_addr)
+            with DEVICES_DATA.batch():
+                result = SerializedFile.remove_instance(host_addr)
             Printer.print_unreal_device_msg(SerializedFile.message)
             sys.exit(int(result))
         else:
@@ -151,7 +153,10 @@ def do_device_execute(options):
             instance = SerializedFile.get_instance(host_addr)
             if instance:
                 if instance.is_connected:
+                    table = dict(instance.table)
                     instance.execute(cmdline)
+                    cursors = {k: v for k, v in instance.table.items() if table.get(k) != v}
+                    SerializedFile.update_cursors(host_addr, cursors)
                     sys.exit(instance.success_code)
                 else:
                     fmt = 'CANT execute cmdline because {} is disconnected.'
@@ -242,7 +247,7 @@ def do_list_device(options):
         validate_usage(options.command, options.operands)
         validate_example_usage(options.command, options.operands)
 
-        node = SerializedFile.get_info()
+        node = SerializedFile.get_info(is_instance=False)
         if not node.devices:
             print('*** CANT list device(s) because there is no connected device.')
             sys.exit(ECODE.SUCCESS)
@@ -255,7 +260,8 @@ def do_list_device(options):
                     Printer.print(fmt.format(device))
                     if device.is_connected:
                         lst = []
-                        for cmdline in device.list_command_lines():
+                        instance = SerializedFile.get_instance(device.address)
+                        for cmdline in instance.list_command_lines():
                             lst.append('  - {}'.format(cmdline))
 
                         lst and lst.insert(0, 'Command lines:')
@@ -276,7 +282,8 @@ def do_list_device(options):
                             Printer.print(fmt.format(device))
                             if device.is_connected:
                                 lst = []
-                                for cmdline in device.list_command_lines():
+                                instance = SerializedFile.get_instance(device.address)
+                                for cmdline in instance.list_command_lines():
                                     lst.append('  - {}'.format(cmdline))
 
                                 lst and lst.insert(0, 'Command lines:')
@@ -287,7 +294,8 @@ def do_list_device(options):
                     Printer.print(fmt.format(device))
                     if device.is_connected:
                         lst = []
-                        for cmdline in device.list_command_lines():
+                        instance = SerializedFile.get_instance(device.address)
+                        for cmdline in instance.list_command_lines():
                             lst.append('  - {}'.format(cmdline))
 
                         lst and lst.insert(0, 'Command lines:')
@@ -0,0 +1,148 @@
+"""Module containing the content-addressed pool of command outputs.
+
+Devices of a fleet often share byte-identical outputs, e.g. show version.
+Every output of devices data is interned through OutputPool, so each
+unique output is kept once in memory and every device cmdline refers to
+it.  A shared output is written once to devices_info.yaml with a yaml
+anchor, and every other occurrence is a yaml alias.  An output which is
+not smaller than compression_min_size is compressed if a codec is set.
+It is pooled by the digest of its content, so a shared output is
+compressed once, and outputs of removed devices are pruned.
+"""
+
+import sys
+import hashlib
+
+from gtunrealdevice.config import Data
+from gtunrealdevice.compression import CompressedOutput
+
+
+class OutputPool:
+    """Content-addressed pool of command outputs
+
+    Attributes
+    ----------
+    outputs (dict): unique outputs which are keyed by their content, or
+            by a digest of content if they are compressed
+    codec (str): a codec name of compression.  Default is environment
+            variable GTUNREALDEVICE_COMPRESSION.  Empty disables compression.
+    min_size (int): a minimum length of output which is compressed.
+            Default is environment variable GTUNREALDEVICE_COMPRESSION_MIN_SIZE or 65536.
+
+    Methods
+    -------
+    intern(output) -> object
+    intern_node(node) -> dict
+    prune(outputs) -> None
+    clear() -> None
+    OutputPool.get_stats(outputs) -> dict
+    OutputPool.get_info_text(stats) -> str
+    """
+    def __init__(self, codec=None, min_size=None):
+        self.outputs = dict()
+        self.codec = Data.output_codec if codec is None else codec
+        self.min_size = Data.compression_min_size if min_size is None else min_size
+        if self.codec and self.codec not in CompressedOutput.codecs:
+            self.codec = ''
+
+    def __len__(self):
+        return len(self.outputs)
+
+    def intern(self, output):
+        """Get the pooled output which is equal to output
+
+        Parameters
+        ----------
+        output (object): a text, binary, or a list of text or binary outputs
+
+        Returns
+        -------
+        object: a pooled output, or a new list of pooled outputs
+        """
+        if isinstance(output, (str, bytes)):
+            if self.codec and len(output) >= self.min_size:
+                data = output if isinstance(output, bytes) else output.encode('utf-8', 'surrogatepass')
+                key = type(output), hashlib.blake2b(data, digest_size=16).digest()
+                pooled = self.outputs.get(key)
+                if pooled is None:
+                    pooled = self.outputs.setdefault(key, CompressedOutput.compress(output, self.codec))
+                return pooled
+            return self.outputs.setdefault(output, output)
+        if isinstance(output, CompressedOutput):
+            return self.outputs.setdefault(output, output)
+        if isinstance(output, list):
+            return [self.intern(item) for item in output]
+        return output
+
+    def intern_node(self, node):
+        """Replace outputs of device info with pooled outputs in place
+
+        Parameters
+        ----------
+        node (dict): a device info
+
+        Returns
+        -------
+        dict: the device info
+        """
+        cmdlines = node.get('cmdlines') if isinstance(node, dict) else None
+        if isinstance(cmdlines, dict):
+            for cmdline, output in cmdlines.items():
+                cmdlines[cmdline] = self.intern(output)
+        return node
+
+    def prune(self, outputs):
+        """Drop pooled outputs which are not referenced anymore
+
+        Parameters
+        ----------
+        outputs (iterable): outputs of every device cmdline
+        """
+        ids = set()
+        for output in outputs:
+            items = output if isinstance(output, list) else [output]
+            ids.update(id(item) for item in items)
+        for key in [key for key, value in self.outputs.items() if id(value) not in ids]:
+            del self.outputs[key]
+
+    def clear(self):
+        self.outputs.clear()
+
+    @classmethod
+    def get_stats(cls, outputs):
+        """Count referenced and unique outputs with their memory sizes
+
+        Parameters
+        ----------
+        outputs (iterable): outputs of every device cmdline
+
+        Returns
+        -------
+        dict: total, unique, compressed, size, and unique_size of outputs
+        """
+        stats = dict(total=0, unique=0, compressed=0, size=0, unique_size=0)
+        ids = set()
+        for output in outputs:
+            items = output if isinstance(output, list) else [output]
+            for item in items:
+                if isinstance(item, CompressedOutput):
+                    size = sys.getsizeof(item) + sys.getsizeof(item.data)
+                    stats['compressed'] += 1
+                elif isinstance(item, (str, bytes)):
+                    size = sys.getsizeof(item)
+                else:
+                    continue
+                stats['total'] += 1
+                stats['size'] += size
+                if id(item) not in ids:
+                    ids.add(id(item))
+                    stats['unique'] += 1
+                    stats['unique_size'] += size
+        return stats
+
+    @classmethod
+    def get_info_text(cls, stats):
+        ratio = stats['total'] / stats['unique'] if stats['unique'] else 1.0
+        saved = (stats['size'] - stats['unique_size']) / 1024
+        fmt = 'outputs={}, unique={}, compressed={}, ratio={:.2f}, saved={:.1f} KB'
+        return fmt.format(stats['total'], stats['unique'], stats.get('compressed', 0), ratio, saved)
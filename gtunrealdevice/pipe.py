@@ -0,0 +1,231 @@
+"""Module containing the logic for IOS-style output pipes of unreal device.
+
+Output pipes, e.g. "show running-config | section interface | include ip",
+are applied as chained generators over output lines so that a large output
+is filtered without building intermediate lists.
+"""
+
+import re
+import functools
+import itertools
+from collections import deque
+
+from gtunrealdevice.exceptions import OutputPipeError
+
+
+@functools.lru_cache(maxsize=256)
+def compile_pattern(pattern):
+    """Compile a regular expression of output pipe and cache it across calls
+
+    Parameters
+    ----------
+    pattern (str): a regular expression
+
+    Returns
+    -------
+    re.Pattern: a compiled regular expression
+
+    Raises
+    ------
+    OutputPipeError: raise exception if pattern is invalid
+    """
+    try:
+        return re.compile(pattern)
+    except re.error as ex:
+        fmt = 'Invalid regular expression "{}" - {}'
+        raise OutputPipeError(fmt.format(pattern, ex))
+
+
+def iter_lines(output):
+    """Iterate lines of output without splitting the whole output.
+    A trailing newline does not start another line.
+
+    Parameters
+    ----------
+    output (str, iterable): an output or an iterable of lines
+
+    Returns
+    -------
+    generator: a generator of lines
+    """
+    if not isinstance(output, str):
+        for line in output:
+            yield line.rstrip('\r\n')
+        return
+
+    start = 0
+    while True:
+        end = output.find('\n', start)
+        if end == -1:
+            if start < len(output):
+                yield output[start:].rstrip('\r')
+            return
+        yield output[start:end].rstrip('\r')
+        start = end + 1
+
+
+class OutputPipe:
+    """IOS-style output pipe
+
+    Attributes
+    ----------
+    name (str): a filter name, i.e. begin, count, exclude, head, include,
+            section, or tail
+    argument (str): a filter argument
+
+    Methods
+    -------
+    OutputPipe.parse(cmdline) -> tuple
+    OutputPipe.apply(output, pipes) -> generator
+    filter(lines) -> generator
+    """
+    names = ['begin', 'count', 'exclude', 'head', 'include', 'section', 'tail']
+    separator_pattern = r'"[^"]*"|\'[^\']*\'|\s*\|\s*'
+
+    def __init__(self, name, argument=''):
+        self.name = name
+        self.argument = argument.strip()
+        if len(self.argument) > 1 and self.argument[0] == self.argument[-1] in '"\'':
+            self.argument = self.argument[1:-1]
+        if self.name in ['head', 'tail']:
+            txt = self.argument or '10'
+            if not txt.isdigit():
+                fmt = 'Invalid number "{}" for "{}" pipe'
+                raise OutputPipeError(fmt.format(txt, self.name))
+            self.number = int(txt)
+        elif self.name == 'count' and not self.argument:
+            self.pattern = None
+        else:
+            if not self.argument:
+                fmt = 'Missing regular expression for "{}" pipe'
+                raise OutputPipeError(fmt.format(self.name))
+            self.pattern = compile_pattern(self.argument)
+
+    def __repr__(self):
+        return '{}({!r}, {!r})'.format(type(self).__name__, self.name, self.argument)
+
+    @classmethod
+    def get_name(cls, word):
+        """Get a filter name from a full or abbreviated word
+
+        Parameters
+        ----------
+        word (str): a word after pipe
+
+        Returns
+        -------
+        str: a filter name if word is unique, otherwise, empty
+        """
+        word = word.lower()
+        lst = [name for name in cls.names if name.startswith(word)]
+        return lst[0] if len(lst) == 1 else ''
+
+    @classmethod
+    def parse(cls, cmdline):
+        """Parse command line and its output pipes
+
+        A vertical bar which is not followed by a filter name belongs to
+        the previous segment, e.g. "show log | include up|down".  A bar
+        without leading whitespace, e.g. "show version|include v", starts
+        a pipe only if it is followed by a filter name and an argument or
+        by a full filter name, and a bar inside a quoted argument, e.g.
+        'show log | include "up | down"', never starts a pipe.
+
+        Parameters
+        ----------
+        cmdline (str): a command line
+
+        Returns
+        -------
+        tuple: a command line without pipes and a list of OutputPipe
+
+        Raises
+        ------
+        OutputPipeError: raise exception if a pipe has invalid argument
+        """
+        if '|' not in cmdline:
+            return cmdline, []
+
+        segments, start = [], 0
+        for match in re.finditer(cls.separator_pattern, cmdline):
+            if match.group()[:1] not in '"\'':
+                segments.extend([cmdline[start:match.start()], match.group()])
+                start = match.end()
+        segments.append(cmdline[start:])
+
+        base = segments[0]
+        lst = []
+        for separator, segment in zip(segments[1::2], segments[2::2]):
+            word, _, argument = segment.partition(' ')
+            name = cls.get_name(word) if word else ''
+            if not separator[0].isspace() and not argument and word.lower() not in cls.names:
+                name = ''
+            if name:
+                lst.append([name, argument])
+            elif lst:
+                lst[-1][1] += separator + segment
+            else:
+                base += separator + segment
+
+        pipes = [cls(name, argument) for name, argument in lst]
+        return base, pipes
+
+    @classmethod
+    def apply(cls, output, pipes):
+        """Apply output pipes to output
+
+        Parameters
+        ----------
+        output (str, iterable): an output or an iterable of lines
+        pipes (list): a list of OutputPipe
+
+        Returns
+        -------
+        generator: a generator of filtered lines
+        """
+        lines = iter_lines(output)
+        for pipe in pipes:
+            lines = pipe.filter(lines)
+        return lines
+
+    def filter(self, lines):
+        method = getattr(self, 'filter_{}'.format(self.name))
+        return method(lines)
+
+    def filter_include(self, lines):
+        search = self.pattern.search
+        return (line for line in lines if search(line))
+
+    def filter_exclude(self, lines):
+        search = self.pattern.search
+        return (line for line in lines if not search(line))
+
+    def filter_begin(self, lines):
+        search = self.pattern.search
+        return itertools.dropwhile(lambda line: not search(line), lines)
+
+    def filter_section(self, lines):
+        search = self.pattern.search
+        is_matched = False
+        for line in lines:
+            if line[:1].isspace():
+                if is_matched:
+                    yield line
+            else:
+                is_matched = bool(search(line))
+                if is_matched:
+                    yield line
+
+    def filter_count(self, lines):
+        if self.pattern is None:
+            total = sum(1 for _ in lines)
+        else:
+            search = self.pattern.search
+            total = sum(1 for line in lines if search(line))
+        yield 'Number of lines which match regexp = {}'.format(total)
+
+    def filter_head(self, lines):
+        return itertools.islice(lines, self.number)
+
+    def filter_tail(self, lines):
+        return iter(deque(lines, maxlen=self.number))
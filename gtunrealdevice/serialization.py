@@ -1,8 +1,32 @@
-"""Module containing the logic for UnrealDevice(s) serialization."""
+"""Module containing the logic for UnrealDevice(s) serialization.
 
-import yaml
+Sessions of unreal devices are kept in an indexed sqlite table of
+~/.geekstrident/gtunrealdevice/serialized_data.db which is keyed by
+device address.  Name and connection status of a session are stored in
+their own columns, so listing or counting sessions never unpickles an
+instance, and a single session is read or written by its key.  Sessions
+of a legacy serialized_data.yaml file are migrated on first use.
+
+Output-cycling cursors of sessions are kept in their own table which is
+keyed by device address and command line, so an executed command line
+advances its cursor with a single row update instead of re-pickling
+its session.
+
+In in-memory mode, i.e. Data.is_in_memory, sessions are kept in a
+private in-memory sqlite database, and no file is created or migrated.
+
+Parallel CLI workers and unreal-device daemon share the database.  Every
+write is a single sqlite transaction of its own session, so a writer
+never overwrites sessions of another writer, and a worker waits for a
+locked database instead of failing.
+"""
+
+import os
 import pickle
 import re
+import sqlite3
+import threading
+import time
 
 from gtunrealdevice.exceptions import SerializedError
 from gtunrealdevice.exceptions import InvalidSerializedFile
@@ -12,13 +36,62 @@ from gtunrealdevice import UnrealDevice
 from gtunrealdevice.config import Data
 from gtunrealdevice.utils import File
 from gtunrealdevice.utils import DictObject
+from gtunrealdevice.dataformat import DataFormat
+from gtunrealdevice.filelock import FileLock
 
 from gtunrealdevice.core import DEVICES_DATA
 
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    address TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    is_connected INTEGER NOT NULL,
+    instance BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cursors (
+    address TEXT NOT NULL,
+    cmdline TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    PRIMARY KEY (address, cmdline)
+);
+"""
+
 
 class SerializedFile:
-    filename = Data.serialized_filename
+    """Serialized file class
+
+    Attributes
+    ----------
+    filename (str): a serialized database file name
+    legacy_filename (str): a serialized yaml file name which is migrated
+    message (str): a message of the last operation
+    timeout (float): waiting time in seconds for a locked database
+    retries (int): a number of attempts of a statement on a locked database
+
+    Methods
+    -------
+    connect() -> sqlite3.Connection
+    close() -> None
+    execute_retry(connection, sql, is_script=False) -> sqlite3.Cursor
+    migrate(connection) -> int
+    get_info(is_instance=True) -> DictObject
+    add_instance(name, node) -> bool
+    remove_instance(name) -> bool
+    check_instance(name) -> bool
+    get_instance(name) -> UnrealDevice
+    get_cursors(name) -> dict
+    update_cursors(name, cursors) -> bool
+    snapshot() -> dict
+    restore(snapshot) -> None
+    """
+    filename = Data.serialized_db_filename
+    legacy_filename = Data.serialized_filename
     message = ''
+    timeout = 30.0
+    retries = 5
+    _connection = None
+    _connection_filename = ''
+    _lock = threading.RLock()
 
     @classmethod
     def is_file_exist(cls):
@@ -31,58 +104,197 @@ class SerializedFile:
         return is_created
 
     @classmethod
-    def get_info(cls):
+    def connect(cls):
+        """Connect to serialized database, create its table, and migrate
+        legacy serialized yaml file
+
+        Returns
+        -------
+        sqlite3.Connection: a connection of serialized database
+        """
+        with cls._lock:
+            filename = ':memory:' if Data.is_in_memory else os.path.expanduser(cls.filename)
+            if cls._connection is not None and cls._connection_filename == filename:
+                return cls._connection
+
+            cls._connection is not None and cls._connection.close()
+            if filename == ':memory:':
+                connection = sqlite3.connect(filename, check_same_thread=False)
+                connection.executescript(SCHEMA)
+                cls._connection, cls._connection_filename = connection, filename
+                return connection
+
+            os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+            connection = sqlite3.connect(filename, timeout=cls.timeout,
+                                         check_same_thread=False)
+            cls.execute_retry(connection, 'PRAGMA journal_mode = WAL')
+            cls.execute_retry(connection, SCHEMA, is_script=True)
+            cls._connection, cls._connection_filename = connection, filename
+            with FileLock('{}.lock'.format(filename)).acquire():
+                cls.migrate(connection)
+            return connection
+
+    @classmethod
+    def close(cls):
+        """Close serialized database.  Sessions of in-memory mode are dropped."""
+        with cls._lock:
+            cls._connection is not None and cls._connection.close()
+            cls._connection, cls._connection_filename = None, ''
+
+    @classmethod
+    def execute_retry(cls, connection, sql, is_script=False):
+        """Execute a statement which sqlite busy timeout does not cover,
+        e.g. switching journal mode, and retry it while database is locked
+
+        Parameters
+        ----------
+        connection (sqlite3.Connection): a connection of serialized database
+        sql (str): a statement
+        is_script (bool): True if sql has many statements.  Default is False.
+
+        Returns
+        -------
+        sqlite3.Cursor: a cursor of statement
+
+        Raises
+        ------
+        sqlite3.OperationalError: raise exception if database is still locked
+        """
+        for attempt in range(cls.retries):
+            try:
+                execute = connection.executescript if is_script else connection.execute
+                return execute(sql)
+            except sqlite3.OperationalError as ex:
+                is_locked = 'locked' in str(ex) or 'busy' in str(ex)
+                if not is_locked or attempt + 1 == cls.retries:
+                    raise
+                time.sleep(0.05 * 2 ** attempt)
+
+    @classmethod
+    def migrate(cls, connection):
+        """Move sessions of legacy serialized yaml file to serialized database.
+        The legacy file is renamed with .migrated suffix.
+
+        Parameters
+        ----------
+        connection (sqlite3.Connection): a connection of serialized database
+
+        Returns
+        -------
+        int: a number of migrated sessions
+
+        Raises
+        ------
+        SerializedError: raise exception if legacy file has invalid instance
+        """
+        legacy_filename = os.path.expanduser(cls.legacy_filename)
+        if not os.path.isfile(legacy_filename):
+            return 0
+
+        with open(legacy_filename) as stream:
+            content = stream.read().strip()
+        dict_obj = DataFormat.load(content) if content else dict()
+        if not isinstance(dict_obj, dict):
+            failure = 'Invalid format {}'.format(legacy_filename)
+            raise InvalidSerializedFile(failure)
+
+        rows = []
+        for address, byte_data in dict_obj.items():
+            instance = cls.load_instance(byte_data)
+            rows.append(cls.get_row(address, instance, byte_data=byte_data))
+        with connection:
+            connection.executemany(
+                'INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)', rows
+            )
+        os.replace(legacy_filename, '{}.migrated'.format(legacy_filename))
+        return len(rows)
+
+    @classmethod
+    def load_instance(cls, byte_data):
+        """Unpickle a session
+
+        Parameters
+        ----------
+        byte_data (bytes): a pickled UnrealDevice instance
+
+        Returns
+        -------
+        UnrealDevice: an unreal device instance
+
+        Raises
+        ------
+        SerializedError: raise exception if byte_data is not an UnrealDevice instance
+        """
+        try:
+            obj = pickle.loads(byte_data)
+            if isinstance(obj, UnrealDevice):
+                return obj
+            type_name = type(obj).__name__
+            fmt = 'Expecting UnrealDevice instance but received {} type'
+            raise InvalidSerializedInstance(fmt.format(type_name))
+        except Exception as ex:
+            raise SerializedError(str(ex))
+
+    @classmethod
+    def get_row(cls, address, instance, byte_data=None):
+        byte_data = pickle.dumps(instance) if byte_data is None else byte_data
+        name = str(instance.name or '')
+        return str(address), name, int(bool(instance.is_connected)), byte_data
+
+    @classmethod
+    def get_info(cls, is_instance=True):
+        """Get sessions info
+
+        Parameters
+        ----------
+        is_instance (bool): True if devices are unpickled UnrealDevice
+                instances, otherwise, devices are DictObject instances of
+                address, name, and is_connected, and no instance is unpickled.
+                Default is True.
+
+        Returns
+        -------
+        DictObject: filename, existed, total, devices, and text
+        """
         tbl = DictObject(filename=cls.filename)
-        instances = []
-        if cls.is_file_exist():
+        devices = []
+        if Data.is_in_memory or cls.is_file_exist() or File.is_exist(cls.legacy_filename):
             tbl.update(existed=True)
-            with open(cls.filename) as stream:
-                content = stream.read().strip()
-                if content:
-                    dict_obj = yaml.safe_load(content)
-                    if isinstance(dict_obj, dict):
-                        tbl.update(dict_obj=dict_obj)
-                        for byte_data in dict_obj.values():
-                            try:
-                                obj = pickle.loads(byte_data)
-                                if isinstance(obj, UnrealDevice):
-                                    instances.append(obj)
-                                    continue
-                                type_name = type(obj).__name__
-                                fmt = 'Expecting UnrealDevice instance but received {} type'
-                                raise InvalidSerializedInstance(fmt.format(type_name))
-                            except Exception as ex:
-                                raise SerializedError(str(ex))
-                        tbl.update(total=len(dict_obj))
-                    else:
-                        failure = 'Invalid format {}'.format(cls.filename)
-                        raise InvalidSerializedFile(failure)
+            with cls._lock:
+                rows = cls.connect().execute(
+                    'SELECT address, name, is_connected, instance FROM sessions ORDER BY rowid'
+                    if is_instance else
+                    'SELECT address, name, is_connected, NULL FROM sessions ORDER BY rowid'
+                ).fetchall()
+            for address, name, is_connected, byte_data in rows:
+                if is_instance:
+                    devices.append(cls.load_instance(byte_data))
                 else:
-                    tbl.update(total=0)
+                    node = DictObject(address=address, name=name, is_connected=bool(is_connected))
+                    devices.append(node)
         else:
             tbl.update(existed=False)
-            tbl.update(total=0)
+        tbl.update(total=len(devices))
 
         lst = ['Connected Device(s) Info:',
                'Total connected unreal-device: {}'.format(tbl['total'])]
 
-        if instances:
-            for instance in instances:
-                status = 'connected' if instance.is_connected else 'disconnected'
-                l1 = [instance.address, status, instance.name]
-                lst.append('  - {} is {} (name={})'.format(*l1))
-        tbl.update(devices=instances)
+        for device in devices:
+            status = 'connected' if device.is_connected else 'disconnected'
+            l1 = [device.address, status, device.name]
+            lst.append('  - {} is {} (name={})'.format(*l1))
+        tbl.update(devices=devices)
         tbl.update(text='\n'.join(lst))
         return tbl
 
     @classmethod
     def get_info_text(cls):
-        node = cls.get_info()
+        node = cls.get_info(is_instance=False)
         return node.text    # noqa
 
     @classmethod
     def get_connected_info(cls, name=''):
-        node = cls.get_info()
+        node = cls.get_info(is_instance=False)
         fmt = 'Unreal-device connection status: {} device(s)'
         lst = [fmt.format(node.total)]      # noqa
         if node.total:      # noqa
@@ -112,79 +324,156 @@ class SerializedFile:
 
     @classmethod
     def add_instance(cls, name, node):
-        cls.create_file()
-        tbl = cls.get_info()
-        dict_obj = tbl.get('dict_obj', dict())
-        dict_obj.update({name: pickle.dumps(node)})
-        with (open(cls.filename, 'w')) as stream:
-            yaml.dump(dict_obj, stream)
-            fmt = '+++ Successfully added "{}" unreal-device.'
-            cls.message = fmt.format(name)
-            return True
+        row = cls.get_row(name, node)
+        with cls._lock:
+            connection = cls.connect()
+            with connection:
+                connection.execute('INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)', row)
+                connection.execute('DELETE FROM cursors WHERE address = ?', row[:1])
+        fmt = '+++ Successfully added "{}" unreal-device.'
+        cls.message = fmt.format(name)
+        return True
 
     @classmethod
     def remove_instance(cls, name):
         pattern = r'(?i) *([*]|(_+all_+)) *$'
         match = re.match(pattern, name)
-        tbl = cls.get_info()
-        if tbl.get('total') == 0:
+        with cls._lock:
+            rows = cls.connect().execute(
+                'SELECT address FROM sessions ORDER BY rowid'
+            ).fetchall()
+        hosts = [address for address, in rows]
+
+        if not hosts:
             if match:
                 cls.message = '*** CANT release because NONE unreal-device is initialized.'
             else:
                 fmt = '''*** CANT release because "{}" unreal-device isn't initialized.'''
                 cls.message = fmt.format(name)
             return False
-        else:
-            with open(cls.filename) as read_stream:
-                dict_obj = yaml.safe_load(read_stream)
-                if match:
-                    hosts = list(dict_obj)
-                    for host in hosts:
-                        byte_data = dict_obj.pop(host)
-                        instance = pickle.loads(byte_data)
-                        instance.is_connected and instance.disconnect()
-                        if instance.is_auto_generated_device:
-                            DEVICES_DATA.remove_device(host)
-
-                    with (open(cls.filename, 'w')) as write_stream:
-                        yaml.dump(dict_obj, write_stream)
-
-                    hosts = repr(hosts[0]) if len(hosts) == 1 else tuple(hosts)
-                    txt = 'unreal-device' if len(hosts) == 1 else 'unreal-devices'
-                    fmt = '+++ Successfully released {} {}.'
-                    cls.message = fmt.format(hosts, txt)
-                    return True
 
-                else:
-                    if name in dict_obj:
-                        byte_data = dict_obj.pop(name)
-                        instance = pickle.loads(byte_data)
-                        instance.is_connected and instance.disconnect()
-                        if instance.is_auto_generated_device:
-                            DEVICES_DATA.remove_device(name)
-
-                        with (open(cls.filename, 'w')) as write_stream:
-                            yaml.dump(dict_obj, write_stream)
-                        fmt = '+++ Successfully released {} unreal-device.'
-                        cls.message = fmt.format(name)
-                        return True
-                    else:
-                        fmt = '*** CANT release because there is no "{}" unreal-device.'
-                        cls.message = fmt.format(name)
-                        return False
+        if not match:
+            if name not in hosts:
+                fmt = '*** CANT release because there is no "{}" unreal-device.'
+                cls.message = fmt.format(name)
+                return False
+            hosts = [name]
+
+        for host in hosts:
+            instance = cls.get_instance(host)
+            instance.is_connected and instance.disconnect()
+            if instance.is_auto_generated_device:
+                DEVICES_DATA.remove_device(host)
+
+        with cls._lock:
+            connection = cls.connect()
+            with connection:
+                connection.executemany(
+                    'DELETE FROM sessions WHERE address = ?', [(host,) for host in hosts]
+                )
+                connection.executemany(
+                    'DELETE FROM cursors WHERE address = ?', [(host,) for host in hosts]
+                )
+
+        if match:
+            hosts = repr(hosts[0]) if len(hosts) == 1 else tuple(hosts)
+            txt = 'unreal-device' if len(hosts) == 1 else 'unreal-devices'
+            fmt = '+++ Successfully released {} {}.'
+            cls.message = fmt.format(hosts, txt)
+        else:
+            fmt = '+++ Successfully released {} unreal-device.'
+            cls.message = fmt.format(name)
+        return True
 
     @classmethod
     def check_instance(cls, name):
-        tbl = cls.get_info()
-        dict_obj = tbl.get('dict_obj', dict())
-        return name in dict_obj
+        with cls._lock:
+            row = cls.connect().execute(
+                'SELECT 1 FROM sessions WHERE address = ?', (str(name),)
+            ).fetchone()
+        return row is not None
 
     @classmethod
     def get_instance(cls, name):
-        tbl = cls.get_info()
-        dict_obj = tbl.get('dict_obj', dict())
-        if name in dict_obj:
-            instance = pickle.loads(dict_obj.get(name))
-            return instance
-        else:
+        with cls._lock:
+            row = cls.connect().execute(
+                'SELECT instance FROM sessions WHERE address = ?', (str(name),)
+            ).fetchone()
+        if not row:
             return None
+        instance = cls.load_instance(row[0])
+        instance.table.update(cls.get_cursors(name))
+        return instance
+
+    @classmethod
+    def get_cursors(cls, name):
+        """Get output-cycling cursors of a session
+
+        Parameters
+        ----------
+        name (str): a device address
+
+        Returns
+        -------
+        dict: output indexes which are keyed by command line
+        """
+        with cls._lock:
+            rows = cls.connect().execute(
+                'SELECT cmdline, idx FROM cursors WHERE address = ?', (str(name),)
+            ).fetchall()
+        return dict(rows)
+
+    @classmethod
+    def update_cursors(cls, name, cursors):
+        """Save output-cycling cursors of a session without re-pickling it
+
+        Parameters
+        ----------
+        name (str): a device address
+        cursors (dict): output indexes which are keyed by command line
+
+        Returns
+        -------
+        bool: True if cursors are saved, otherwise, False.
+        """
+        if not cursors:
+            return True
+
+        rows = [(str(name), cmdline, idx) for cmdline, idx in cursors.items()]
+        with cls._lock:
+            connection = cls.connect()
+            with connection:
+                connection.executemany('INSERT OR REPLACE INTO cursors VALUES (?, ?, ?)', rows)
+        return True
+
+    @classmethod
+    def snapshot(cls):
+        """Copy all sessions and their cursors without unpickling them
+
+        Returns
+        -------
+        dict: rows of sessions and cursors
+        """
+        with cls._lock:
+            connection = cls.connect()
+            rows = connection.execute('SELECT * FROM sessions ORDER BY rowid').fetchall()
+            cursors = connection.execute('SELECT * FROM cursors').fetchall()
+        return dict(sessions=rows, cursors=cursors)
+
+    @classmethod
+    def restore(cls, snapshot):
+        """Replace all sessions and their cursors with a snapshot
+
+        Parameters
+        ----------
+        snapshot (dict): a snapshot of sessions
+        """
+        with cls._lock:
+            connection = cls.connect()
+            with connection:
+                connection.execute('DELETE FROM sessions')
+                connection.execute('DELETE FROM cursors')
+                connection.executemany('INSERT INTO sessions VALUES (?, ?, ?, ?)',
+                                       snapshot.get('sessions', []))
+                connection.executemany('INSERT INTO cursors VALUES (?, ?, ?)',
+                                       snapshot.get('cursors', []))
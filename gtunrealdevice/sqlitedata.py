@@ -0,0 +1,695 @@
+"""Module containing the sqlite storage backend of devices info.
+
+Devices, command lines, and outputs live in indexed tables of
+~/.geekstrident/gtunrealdevice/devices_info.db.  A device node is built
+with the names of its command lines only, and an output is fetched when
+it is needed, e.g. by UnrealDevice.execute.  Every change is written
+through, so saving never rewrites the whole devices info.
+
+The backend is selected with environment variable GTUNREALDEVICE_STORAGE=sqlite.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+import contextlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from collections.abc import KeysView
+from collections.abc import ValuesView
+from collections.abc import ItemsView
+
+from gtunrealdevice.config import Data
+from gtunrealdevice.dataformat import DataFormat
+from gtunrealdevice.core import DevicesData
+from gtunrealdevice.core import materialized
+from gtunrealdevice.utils import File
+from gtunrealdevice.exceptions import DevicesInfoError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS devices (
+    id INTEGER PRIMARY KEY,
+    address TEXT NOT NULL UNIQUE,
+    name TEXT,
+    info TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS devices_name ON devices (name);
+CREATE TABLE IF NOT EXISTS cmdlines (
+    device_id INTEGER NOT NULL REFERENCES devices (id) ON DELETE CASCADE,
+    cmdline TEXT NOT NULL,
+    output TEXT NOT NULL,
+    UNIQUE (device_id, cmdline)
+);
+"""
+
+
+def dump_value(value):
+    return json.dumps(DataFormat.encode_json(value))
+
+
+def load_value(text):
+    return DataFormat.decode_json(json.loads(text))
+
+
+class SqliteCmdlines(MutableMapping):
+    """Command lines of a device whose outputs are fetched on demand
+
+    Attributes
+    ----------
+    store (SqliteDevicesData): a sqlite devices data
+    device_id (int): a row id of device
+    """
+    def __init__(self, store, device_id, cmdlines=()):
+        self.store = store
+        self.device_id = device_id
+        self._keys = dict.fromkeys(cmdlines)
+
+    def __getitem__(self, cmdline):
+        if cmdline not in self._keys:
+            raise KeyError(cmdline)
+        return self.store.fetch_output(self.device_id, cmdline)
+
+    def __setitem__(self, cmdline, output):
+        cmdline = str(cmdline)
+        self.store.write_outputs(self.device_id, [(cmdline, output)])
+        self._keys[cmdline] = None
+
+    def __delitem__(self, cmdline):
+        if cmdline not in self._keys:
+            raise KeyError(cmdline)
+        self.store.delete_output(self.device_id, cmdline)
+        del self._keys[cmdline]
+
+    def __contains__(self, cmdline):
+        return cmdline in self._keys
+
+    def __iter__(self):
+        return iter(list(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, list(self._keys))
+
+    def __reduce__(self):
+        return dict, (dict(self.items()),)
+
+    def items(self):
+        return self.store.fetch_outputs(self.device_id)
+
+
+class SqliteDeviceNode(dict):
+    """Device info of sqlite devices data whose changes are written through
+
+    Attributes
+    ----------
+    store (SqliteDevicesData): a sqlite devices data
+    address (str): a device address
+    device_id (int): a row id of device
+    """
+    def __init__(self, store, address, device_id, info, cmdlines):
+        super().__init__(info)
+        super().__setitem__('cmdlines', cmdlines)
+        self.store = store
+        self.address = address
+        self.device_id = device_id
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.store.write_node(self)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.store.write_node(self)
+
+    def __reduce__(self):
+        return dict, (self.to_dict(),)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.store.write_node(self)
+
+    def pop(self, key, *args):
+        result = super().pop(key, *args)
+        self.store.write_node(self)
+        return result
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def to_dict(self):
+        """Return a detached device info"""
+        node = dict()
+        for key, value in super().items():
+            if key == 'cmdlines':
+                value = dict(value.items())
+                if not value:
+                    continue
+            node[key] = value
+        return node
+
+
+class SqliteDevicesData(DevicesData):
+    """Devices Data class with sqlite storage
+
+    Devices info is stored in ~/.geekstrident/gtunrealdevice/devices_info.db.
+    If database does not exist, it is created and populated with
+    ~/.geekstrident/gtunrealdevice/devices_info.yaml.
+
+    Attributes
+    ----------
+    db_filename (str): a database file name
+    cache_size (int): a maximum number of cached device nodes
+    stream_min_size (int): a file size in bytes from which load streams
+            devices.  Default is 0 because every load is streamed.
+    is_upsert_supported (bool): True if sqlite supports INSERT ... ON
+            CONFLICT DO UPDATE, i.e. sqlite 3.24.0 or later.  Otherwise,
+            a row is updated, and inserted if it does not exist.
+
+    Methods
+    -------
+    connect() -> None
+    import_yaml(filename) -> int
+    export_yaml(filename) -> int
+    """
+    cache_size = 1024
+    stream_min_size = 0
+    is_upsert_supported = sqlite3.sqlite_version_info >= (3, 24, 0)
+
+    def __init__(self, db_filename=''):
+        super().__init__()
+        self.db_filename = db_filename or Data.devices_db_filename
+        self.filenames = [self.db_filename]
+        self.connection = None
+        self.lock = threading.RLock()
+        self._nodes = OrderedDict()
+        self._streamed_ids = None
+
+    def connect(self):
+        """Connect to database and create tables if they do not exist"""
+        with self.lock:
+            if self.connection is not None:
+                return
+            filename = ':memory:' if Data.is_in_memory else self.db_filename
+            if filename != ':memory:':
+                filename = os.path.expanduser(filename)
+                os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+            connection = sqlite3.connect(filename, check_same_thread=False)
+            connection.execute('PRAGMA foreign_keys = ON')
+            connection.execute('PRAGMA journal_mode = WAL')
+            connection.execute('PRAGMA synchronous = NORMAL')
+            connection.executescript(SCHEMA)
+            self.connection = connection
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Commit changes at exit unless a batch is in progress"""
+        with self.lock:
+            if self.is_batching:
+                yield
+            else:
+                with self.connection:
+                    yield
+
+    @contextlib.contextmanager
+    def batch(self):
+        """Group changes of devices data into one database transaction
+
+        The transaction is committed at the end of batch and rolled back
+        if an exception is raised.  A nested batch joins the outer batch.
+
+        Yields
+        ------
+        SqliteDevicesData: this devices data
+        """
+        if self.is_batching:
+            yield self
+            return
+
+        self.materialize()
+        with self.lock:
+            self._undo = dict()
+            try:
+                yield self
+            except BaseException:
+                self.connection.rollback()
+                self._nodes.clear()
+                self._command_indexes.clear()
+                raise
+            else:
+                self.connection.commit()
+            finally:
+                self._undo = None
+
+    def load_default(self):
+        """Connect to devices info database.  A new database is populated
+        with ~/.geekstrident/gtunrealdevice/devices_info.yaml"""
+        self._is_loaded = True
+        is_new = self.db_filename == ':memory:' or not File.is_exist(self.db_filename)
+        self.connect()
+        if is_new and not Data.is_in_memory and Data.is_devices_info_file_exist():
+            self.import_yaml(Data.devices_info_filename)
+
+    def reset(self):
+        """Close database without saving, so it is connected again on next use"""
+        with self.lock:
+            self.connection is not None and self.connection.close()
+            self.connection = None
+            self._nodes.clear()
+        super().reset()
+
+    def import_yaml(self, filename):
+        """Import devices info from a yaml file one output at a time.
+        Nothing is imported if the yaml file has an invalid format.
+
+        Parameters
+        ----------
+        filename (str): a yaml file name
+
+        Returns
+        -------
+        int: a number of imported devices
+        """
+        errors = []
+        try:
+            with self.batch():
+                total = self.stream_devices(filename, errors)
+                if errors:
+                    raise DevicesInfoError('\n'.join(errors))
+        except DevicesInfoError:
+            return 0
+        return total
+
+    def stream_devices(self, filename, errors, on_cmdline=None):
+        """Stream, validate, and write devices of filename.  Every output
+        is written as soon as it is parsed, so memory is bounded by the
+        largest output instead of the largest device.
+
+        Parameters
+        ----------
+        filename (str): a file name
+        errors (list): a list which collects errors
+        on_cmdline (callable): unused.  Every cmdline is written to database.
+
+        Returns
+        -------
+        int: a number of streamed devices
+        """
+        def write_cmdline(address, cmdline, output, root):
+            node = {address: dict(cmdlines={cmdline: output})}
+            errors.extend(self.validate(node, root=root))
+            if errors:
+                return
+            if address not in self._streamed_ids:
+                self._streamed_ids[address] = self.write_device(str(address), dict())
+            self.write_outputs(self._streamed_ids[address], [(cmdline, output)])
+
+        with self.lock:
+            self._streamed_ids = dict()
+            try:
+                return super().stream_devices(filename, errors, on_cmdline=write_cmdline)
+            finally:
+                self._streamed_ids = None
+
+    def store_device(self, address, node):
+        """Write a streamed device info and keep its streamed cmdlines
+
+        Parameters
+        ----------
+        address (str): an address of device
+        node (dict): device info
+        """
+        address = str(address)
+        is_streamed = self._streamed_ids is not None and address in self._streamed_ids
+        with self.transaction():
+            self.write_device(address, node, is_cmdlines_kept=is_streamed)
+        self.discard(address)
+
+    @materialized
+    def export_yaml(self, filename):
+        """Export devices info to a yaml file with the current yaml format
+
+        Parameters
+        ----------
+        filename (str): a yaml file name
+
+        Returns
+        -------
+        int: a number of exported devices
+        """
+        total = 0
+        with open(os.path.expanduser(filename), 'w') as stream:
+            for address, node in self.iter_nodes(ordered=True):
+                DataFormat.dump({address: node}, stream)
+                total += 1
+        return total
+
+    def iter_nodes(self, ordered=False):
+        """Iterate detached device info without touching node cache
+
+        Parameters
+        ----------
+        ordered (bool): sorting by address.  Default is False.
+
+        Returns
+        -------
+        generator: a generator of address and device info
+        """
+        order = 'address' if ordered else 'id'
+        with self.lock:
+            rows = self.connection.execute(
+                'SELECT id, address, info FROM devices ORDER BY {}'.format(order)
+            ).fetchall()
+        for device_id, address, info in rows:
+            node = load_value(info)
+            cmdlines = dict(self.fetch_outputs(device_id))
+            if cmdlines:
+                node.update(cmdlines=cmdlines)
+            yield address, node
+
+    def get_device_id(self, address):
+        row = self.connection.execute(
+            'SELECT id FROM devices WHERE address = ?', (address,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def fetch_output(self, device_id, cmdline):
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT output FROM cmdlines WHERE device_id = ? AND cmdline = ?',
+                (device_id, cmdline)
+            ).fetchone()
+        if row is None:
+            raise KeyError(cmdline)
+        return load_value(row[0])
+
+    def fetch_outputs(self, device_id):
+        with self.lock:
+            rows = self.connection.execute(
+                'SELECT cmdline, output FROM cmdlines WHERE device_id = ? ORDER BY rowid',
+                (device_id,)
+            ).fetchall()
+        return [(cmdline, load_value(output)) for cmdline, output in rows]
+
+    def write_outputs(self, device_id, items):
+        rows = ((device_id, str(cmdline), dump_value(output)) for cmdline, output in items)
+        with self.transaction():
+            if self.is_upsert_supported:
+                self.connection.executemany(
+                    'INSERT INTO cmdlines (device_id, cmdline, output) VALUES (?, ?, ?) '
+                    'ON CONFLICT (device_id, cmdline) DO UPDATE SET output = excluded.output',
+                    rows
+                )
+                return
+            for row in rows:
+                cursor = self.connection.execute(
+                    'UPDATE cmdlines SET output = ? WHERE device_id = ? AND cmdline = ?',
+                    (row[2], row[0], row[1])
+                )
+                cursor.rowcount or self.connection.execute(
+                    'INSERT INTO cmdlines (device_id, cmdline, output) VALUES (?, ?, ?)', row
+                )
+
+    def delete_output(self, device_id, cmdline):
+        with self.transaction():
+            self.connection.execute(
+                'DELETE FROM cmdlines WHERE device_id = ? AND cmdline = ?',
+                (device_id, cmdline)
+            )
+
+    def write_device(self, address, node, is_cmdlines_kept=False):
+        """Write device info without committing
+
+        Parameters
+        ----------
+        address (str): a device address
+        node (dict): a device info
+        is_cmdlines_kept (bool): keeping stored cmdlines of device.  Default is False.
+
+        Returns
+        -------
+        int: a row id of device
+        """
+        node = node if isinstance(node, dict) else dict()
+        info = {k: v for k, v in node.items() if k != 'cmdlines'}
+        name = info.get('name')
+        name = None if name is None else str(name)
+        if self.is_upsert_supported:
+            self.connection.execute(
+                'INSERT INTO devices (address, name, info) VALUES (?, ?, ?) '
+                'ON CONFLICT (address) DO UPDATE SET name = excluded.name, info = excluded.info',
+                (address, name, dump_value(info))
+            )
+        else:
+            cursor = self.connection.execute(
+                'UPDATE devices SET name = ?, info = ? WHERE address = ?',
+                (name, dump_value(info), address)
+            )
+            cursor.rowcount or self.connection.execute(
+                'INSERT INTO devices (address, name, info) VALUES (?, ?, ?)',
+                (address, name, dump_value(info))
+            )
+        device_id = self.get_device_id(address)
+
+        cmdlines = node.get('cmdlines')
+        is_bound = isinstance(cmdlines, SqliteCmdlines) and cmdlines.device_id == device_id
+        if not is_bound and not is_cmdlines_kept:
+            cmdlines = cmdlines.items() if isinstance(cmdlines, dict) else []
+            self.connection.execute('DELETE FROM cmdlines WHERE device_id = ?', (device_id,))
+            self.connection.executemany(
+                'INSERT INTO cmdlines (device_id, cmdline, output) VALUES (?, ?, ?)',
+                ((device_id, str(cmdline), dump_value(output)) for cmdline, output in cmdlines)
+            )
+        return device_id
+
+    def write_node(self, node):
+        with self.lock:
+            with self.transaction():
+                self.write_device(node.address, node)
+            if not isinstance(dict.get(node, 'cmdlines'), SqliteCmdlines):
+                self.discard(node.address)
+
+    def discard(self, address):
+        """Discard cached node and command index of device"""
+        self._nodes.pop(address, None)
+        self._command_indexes.pop(address, None)
+
+    @materialized
+    def __contains__(self, key):
+        with self.lock:
+            return self.get_device_id(str(key)) is not None
+
+    @materialized
+    def __getitem__(self, key):
+        address = str(key)
+        with self.lock:
+            node = self._nodes.get(address)
+            if node is not None:
+                self._nodes.move_to_end(address)
+                return node
+
+            row = self.connection.execute(
+                'SELECT id, info FROM devices WHERE address = ?', (address,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(key)
+            device_id, info = row
+            cmdlines = self.connection.execute(
+                'SELECT cmdline FROM cmdlines WHERE device_id = ? ORDER BY rowid',
+                (device_id,)
+            ).fetchall()
+            cmdlines = SqliteCmdlines(self, device_id, (r[0] for r in cmdlines))
+            node = SqliteDeviceNode(self, address, device_id, load_value(info), cmdlines)
+
+            self._nodes[address] = node
+            while len(self._nodes) > self.cache_size:
+                self._nodes.popitem(last=False)
+            return node
+
+    @materialized
+    def __setitem__(self, key, value):
+        with self.lock:
+            with self.transaction():
+                self.write_device(str(key), value)
+            self.discard(str(key))
+
+    @materialized
+    def __delitem__(self, key):
+        with self.lock:
+            with self.transaction():
+                cursor = self.connection.execute(
+                    'DELETE FROM devices WHERE address = ?', (str(key),)
+                )
+            self.discard(str(key))
+            if not cursor.rowcount:
+                raise KeyError(key)
+
+    @materialized
+    def __iter__(self):
+        with self.lock:
+            rows = self.connection.execute('SELECT address FROM devices ORDER BY id').fetchall()
+        return iter([row[0] for row in rows])
+
+    @materialized
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute('SELECT COUNT(*) FROM devices').fetchone()[0]
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.db_filename)
+
+    @materialized
+    def __eq__(self, other):
+        return dict(self.iter_nodes()) == dict(other)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return KeysView(self)
+
+    def values(self):
+        return ValuesView(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def pop(self, key, *args):
+        try:
+            node = self[key].to_dict()
+        except KeyError:
+            if args:
+                return args[0]
+            raise
+        del self[key]
+        return node
+
+    @materialized
+    def popitem(self):
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT address FROM devices ORDER BY id DESC LIMIT 1'
+            ).fetchone()
+            if row is None:
+                raise KeyError('popitem(): dictionary is empty')
+            return row[0], self.pop(row[0])
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    @materialized
+    def update(self, *args, **kwargs):
+        data = dict(*args, **kwargs)
+        with self.lock:
+            with self.transaction():
+                for address, node in data.items():
+                    self.write_device(str(address), node)
+            self._nodes.clear()
+            self._command_indexes.clear()
+
+    def copy(self):
+        return dict(self.iter_nodes())
+
+    def clear(self):
+        self.materialize()
+        with self.lock:
+            with self.transaction():
+                self.connection.execute('DELETE FROM cmdlines')
+                self.connection.execute('DELETE FROM devices')
+            self._nodes.clear()
+            self._command_indexes.clear()
+
+    def save(self, filename=''):
+        """Save device info.  Changes are already written to database,
+        and a provided filename is exported with the yaml format.
+
+        Parameters
+        ----------
+        filename (str): a file name
+
+        Returns
+        -------
+        bool: True if filename is successfully saved, otherwise, False.
+        """
+        if filename:
+            self.export_yaml(filename)
+        return True
+
+    @materialized
+    def intern_node(self, node):
+        """Keep device info as is because outputs are fetched on demand"""
+        return node
+
+    def intern_output(self, output):
+        return output
+
+    @materialized
+    def get_output_stats(self):
+        """Count stored outputs of devices.  Every cmdline row keeps its own
+        output, so nothing is shared.
+
+        Returns
+        -------
+        dict: total, unique, size, and unique_size of outputs
+        """
+        with self.lock:
+            total, size = self.connection.execute(
+                'SELECT COUNT(*), COALESCE(SUM(LENGTH(output)), 0) FROM cmdlines'
+            ).fetchone()
+        return dict(total=total, unique=total, compressed=0, size=size, unique_size=size)
+
+    def get_address_from_name(self, name):
+        """Get device address from device name with the indexed name column
+
+        Parameters
+        ----------
+        name (str): a device name
+
+        Returns
+        -------
+        str: device address or original name
+        """
+        name = str(name).strip()
+        if not name or name in self:
+            return super().get_address_from_name(name)
+
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT address FROM devices WHERE name = ? ORDER BY id LIMIT 1',
+                (name,)
+            ).fetchone()
+        return row[0] if row else name
+
+    def get_addresses_from_names(self, names):
+        """Get device addresses from a list of device names
+
+        Parameters
+        ----------
+        names (list): a list of device names or addresses
+
+        Returns
+        -------
+        list: a list of device addresses or original names
+        """
+        return [self.get_address_from_name(name) for name in names]
+
+
+def represent_node(dumper, data):
+    return dumper.represent_dict(data.to_dict())
+
+
+def represent_cmdlines(dumper, data):
+    return dumper.represent_dict(dict(data.items()))
+
+
+DataFormat.add_representer(SqliteDeviceNode, represent_node)
+DataFormat.add_representer(SqliteCmdlines, represent_cmdlines)
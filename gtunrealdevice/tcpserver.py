@@ -0,0 +1,198 @@
+"""Module containing the logic for serving unreal devices over TCP.
+
+Each TCP connection is a telnet-style session of an unreal device.
+A server either binds one port per device or binds a single port and
+asks for a device address or name at login.  All sessions run in one
+asyncio event loop and share DEVICES_DATA.
+"""
+
+import re
+import asyncio
+
+from gtunrealdevice.core import UnrealDevice
+from gtunrealdevice.core import DEVICES_DATA
+from gtunrealdevice.utils import Text
+
+
+class UnrealDeviceSession:
+    """Telnet-style session of an unreal device
+
+    Parameters
+    ----------
+    reader (asyncio.StreamReader): a stream reader
+    writer (asyncio.StreamWriter): a stream writer
+    address (str): device address.  Default is empty, i.e. asking at login.
+    is_timestamp (bool): showing timestamp.  Default is True.
+    """
+    exit_commands = ['exit', 'quit', 'logout']
+
+    def __init__(self, reader, writer, address='', is_timestamp=True):
+        self.reader = reader
+        self.writer = writer
+        self.address = address
+        self.is_timestamp = is_timestamp
+        self.device = None
+
+    async def write(self, data, prompt=''):
+        data = str(data).replace('\n', '\r\n')
+        lst = [data, '\r\n'] if data else []
+        prompt and lst.append(prompt)
+        self.writer.write(''.join(lst).encode('utf-8'))
+        await self.writer.drain()
+
+    async def readline(self):
+        line = await self.reader.readline()
+        if not line:
+            raise EOFError('session is closed')
+        return line.decode('utf-8', errors='replace').strip()
+
+    async def login(self):
+        address = self.address
+        while not address:
+            await self.write('', prompt='Device: ')
+            address = await self.readline()
+
+        address = DEVICES_DATA.get_address_from_name(address)
+        device = UnrealDevice(address)
+        device.connect(default=False, showed=False)
+        self.device = device
+        await self.write(device.get_login_output(is_timestamp=self.is_timestamp),
+                         prompt=self.prompt)
+
+    @property
+    def prompt(self):
+        return '{}#'.format(self.device.name)
+
+    @property
+    def config_prompt(self):
+        return '{}(configure)#'.format(self.device.name)
+
+    async def configure(self, first_line):
+        lst = [first_line]
+        await self.write('', prompt=self.config_prompt)
+        while True:
+            line = await self.readline()
+            lst.append(line)
+            if line.lower() in ['end', 'exit']:
+                break
+            await self.write('', prompt=self.config_prompt)
+
+        result = self.device.configure(lst, is_timestamp=self.is_timestamp,
+                                       showed=False)
+        await self.write(result, prompt=self.prompt)
+
+    async def run(self):
+        try:
+            await self.login()
+            while True:
+                line = await self.readline()
+                if not line:
+                    await self.write('', prompt=self.prompt)
+                elif line.lower() in self.exit_commands:
+                    self.device.disconnect(showed=False)
+                    logout = self.device.get_logout_output(is_timestamp=self.is_timestamp)
+                    await self.write(logout)
+                    break
+                elif re.match(r'(?i)conf(i(g(u(r(e)?)?)?)?)?( |$)', line):
+                    await self.configure(line)
+                else:
+                    output = self.device.execute(line, is_timestamp=self.is_timestamp,
+                                                 showed=False)
+                    await self.write(output, prompt=self.prompt)
+        except (EOFError, ConnectionError):
+            pass
+        except Exception as ex:
+            try:
+                await self.write('% {}'.format(Text(ex)))
+            except ConnectionError:
+                pass
+        finally:
+            self.writer.close()
+
+
+class UnrealDeviceServer:
+    """Asyncio TCP server for unreal devices
+
+    Parameters
+    ----------
+    host (str): a binding host.  Default is 127.0.0.1.
+    port (int): a binding port or a first port if addresses is provided.
+            Default is 0, i.e. selected by operating system.
+    addresses (list): a list of device addresses.  If provided, each device
+            is bound to its own port, i.e. port, port + 1, ..., otherwise,
+            device is selected at login.  Default is None.
+    is_timestamp (bool): showing timestamp.  Default is True.
+    backlog (int): a maximum number of queued connections.  Default is 1024.
+
+    Properties
+    ----------
+    ports -> dict
+
+    Methods
+    -------
+    start() -> None
+    serve_forever() -> None
+    close() -> None
+    """
+    def __init__(self, host='127.0.0.1', port=0, addresses=None,
+                 is_timestamp=True, backlog=1024):
+        self.host = host
+        self.port = port
+        self.addresses = list(addresses or [])
+        self.is_timestamp = is_timestamp
+        self.backlog = backlog
+        self.servers = dict()
+
+    @property
+    def ports(self):
+        """Return a mapping of device address (or empty) to bound port"""
+        tbl = dict()
+        for address, server in self.servers.items():
+            tbl[address] = server.sockets[0].getsockname()[1]
+        return tbl
+
+    def create_handler(self, address=''):
+        async def handle(reader, writer):
+            session = UnrealDeviceSession(reader, writer, address=address,
+                                          is_timestamp=self.is_timestamp)
+            await session.run()
+        return handle
+
+    async def start(self):
+        if self.addresses:
+            for index, address in enumerate(self.addresses):
+                port = self.port + index if self.port else 0
+                self.servers[address] = await asyncio.start_server(
+                    self.create_handler(address), self.host, port,
+                    backlog=self.backlog
+                )
+        else:
+            self.servers[''] = await asyncio.start_server(
+                self.create_handler(), self.host, self.port,
+                backlog=self.backlog
+            )
+
+    async def serve_forever(self):
+        self.servers or await self.start()
+        await asyncio.gather(*[server.serve_forever() for server in self.servers.values()])
+
+    async def close(self):
+        for server in self.servers.values():
+            server.close()
+            await server.wait_closed()
+        self.servers.clear()
+
+
+def serve(host='127.0.0.1', port=0, addresses=None, is_timestamp=True):
+    """Run unreal device TCP server until it is interrupted
+
+    Parameters
+    ----------
+    host (str): a binding host.  Default is 127.0.0.1.
+    port (int): a binding port or a first port if addresses is provided.
+    addresses (list): a list of device addresses.  Default is None.
+    is_timestamp (bool): showing timestamp.  Default is True.
+    """
+    server = UnrealDeviceServer(host=host, port=port, addresses=addresses,
+                                is_timestamp=is_timestamp)
+    asyncio.run(server.serve_forever())
@@ -144,75 +144,106 @@ def get_example_usage(name):
     return example_usage
 
 
+class LazyUsage:
+    """Build a usage object on first access and cache it in the owner class.
+
+    Parameters
+    ----------
+    func (function): a function to build usage object
+    args (tuple): positional arguments of func
+    kwargs (dict): keyword arguments of func
+    """
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.name = ''
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        usage = self.func(*self.args, **self.kwargs)
+        setattr(owner, self.name, usage)
+        return usage
+
+
 class ConfigureUsage:
-    usage = get_usage('configure', flags=FLAG.HOST | FLAG.HELP)
-    other_usage = get_usage('configure', flags=FLAG.HOST)
-    example_usage = get_example_usage('configure')
+    usage = LazyUsage(get_usage, 'configure', flags=FLAG.HOST | FLAG.HELP)
+    other_usage = LazyUsage(get_usage, 'configure', flags=FLAG.HOST)
+    example_usage = LazyUsage(get_example_usage, 'configure')
 
 
 class ConnectUsage:
-    usage = get_usage('connect', flags=FLAG.HOST | FLAG.HELP)
-    other_usage = get_usage('connect', flags=FLAG.HOST | FLAG.HELP)
-    example_usage = get_example_usage('connect')
+    usage = LazyUsage(get_usage, 'connect', flags=FLAG.HOST | FLAG.HELP)
+    other_usage = LazyUsage(get_usage, 'connect', flags=FLAG.HOST | FLAG.HELP)
+    example_usage = LazyUsage(get_example_usage, 'connect')
+
+
+class DaemonUsage:
+    usage = LazyUsage(get_usage, 'daemon', flags=FLAG.HELP)
+    other_usage = LazyUsage(get_usage, 'daemon', flags=FLAG.HELP)
+    example_usage = LazyUsage(get_example_usage, 'daemon')
 
 
 class DisconnectUsage:
-    usage = get_usage('disconnect', flags=FLAG.HOST | FLAG.HELP)
-    other_usage = get_usage('disconnect', flags=FLAG.HOST | FLAG.HELP)
-    example_usage = get_example_usage('disconnect')
+    usage = LazyUsage(get_usage, 'disconnect', flags=FLAG.HOST | FLAG.HELP)
+    other_usage = LazyUsage(get_usage, 'disconnect', flags=FLAG.HOST | FLAG.HELP)
+    example_usage = LazyUsage(get_example_usage, 'disconnect')
 
 
 class DestroyUsage:
-    usage = get_usage('destroy', flags=FLAG.HOST | FLAG.HELP)
-    other_usage = get_usage('destroy', flags=FLAG.HOST | FLAG.HELP)
-    example_usage = get_example_usage('destroy')
+    usage = LazyUsage(get_usage, 'destroy', flags=FLAG.HOST | FLAG.HELP)
+    other_usage = LazyUsage(get_usage, 'destroy', flags=FLAG.HOST | FLAG.HELP)
+    example_usage = LazyUsage(get_example_usage, 'destroy')
 
 
 class ExecuteUsage:
-    usage = get_usage('execute', flags=FLAG.HOST | FLAG.HELP)
-    other_usage = get_usage('execute', flags=FLAG.HOST | FLAG.HELP)
-    example_usage = get_example_usage('execute')
+    usage = LazyUsage(get_usage, 'execute', flags=FLAG.HOST | FLAG.HELP)
+    other_usage = LazyUsage(get_usage, 'execute', flags=FLAG.HOST | FLAG.HELP)
+    example_usage = LazyUsage(get_example_usage, 'execute')
 
 
 class InfoUsage:
-    usage = get_usage('info', flags=FLAG.INFO_USAGE)
-    other_usage = get_usage('info', flags=FLAG.INFO_USAGE)
-    example_usage = get_example_usage('info')
+    usage = LazyUsage(get_usage, 'info', flags=FLAG.INFO_USAGE)
+    other_usage = LazyUsage(get_usage, 'info', flags=FLAG.INFO_USAGE)
+    example_usage = LazyUsage(get_example_usage, 'info')
 
 
 class ListUsage:
-    usage = get_usage('list', flags=FLAG.HOST | FLAG.HELP)
-    other_usage = get_usage('list', flags=FLAG.HOST | FLAG.HELP)
-    example_usage = get_example_usage('list')
+    usage = LazyUsage(get_usage, 'list', flags=FLAG.HOST | FLAG.HELP)
+    other_usage = LazyUsage(get_usage, 'list', flags=FLAG.HOST | FLAG.HELP)
+    example_usage = LazyUsage(get_example_usage, 'list')
 
 
 class LoadUsage:
-    usage = get_usage('load', flags=FLAG.FILENAME | FLAG.SAVE | FLAG.HELP)
-    other_usage = get_usage('load', flags=FLAG.FILENAME | FLAG.SAVE | FLAG.HELP)
-    example_usage = get_example_usage('load')
+    usage = LazyUsage(get_usage, 'load', flags=FLAG.FILENAME | FLAG.SAVE | FLAG.HELP)
+    other_usage = LazyUsage(get_usage, 'load', flags=FLAG.FILENAME | FLAG.SAVE | FLAG.HELP)
+    example_usage = LazyUsage(get_example_usage, 'load')
 
 
 class ReleaseUsage:
-    usage = get_usage('release', flags=FLAG.HOST | FLAG.HELP)
-    other_usage = get_usage('release', flags=FLAG.HOST | FLAG.HELP)
-    example_usage = get_example_usage('release')
+    usage = LazyUsage(get_usage, 'release', flags=FLAG.HOST | FLAG.HELP)
+    other_usage = LazyUsage(get_usage, 'release', flags=FLAG.HOST | FLAG.HELP)
+    example_usage = LazyUsage(get_example_usage, 'release')
 
 
 class ReloadUsage:
-    usage = get_usage('reload', flags=FLAG.HOST | FLAG.HELP)
-    other_usage = get_usage('reload', flags=FLAG.HOST | FLAG.HELP)
-    example_usage = get_example_usage('reload')
+    usage = LazyUsage(get_usage, 'reload', flags=FLAG.HOST | FLAG.HELP)
+    other_usage = LazyUsage(get_usage, 'reload', flags=FLAG.HOST | FLAG.HELP)
+    example_usage = LazyUsage(get_example_usage, 'reload')
 
 
 class ViewUsage:
-    usage = get_usage('view', flags=FLAG.VIEW_USAGE)
-    other_usage = get_usage('view', flags=FLAG.VIEW_USAGE)
-    example_usage = get_example_usage('view')
+    usage = LazyUsage(get_usage, 'view', flags=FLAG.VIEW_USAGE)
+    other_usage = LazyUsage(get_usage, 'view', flags=FLAG.VIEW_USAGE)
+    example_usage = LazyUsage(get_example_usage, 'view')
 
 
 class Usage:
     configure = ConfigureUsage
     connect = ConnectUsage
+    daemon = DaemonUsage
     disconnect = DisconnectUsage
     destroy = DestroyUsage
     execute = ExecuteUsage
@@ -243,11 +274,11 @@ def show_usage(name, *args, exit_code=None):
 
 
 def validate_example_usage(name, operands):
-    max_count = get_number_of_example(name)
     pattern = r'example *(?P<index>[0-9]+)$'
     txt = ' '.join(operands).strip().lower()
     m = re.match(pattern, txt)
     if m:
+        max_count = get_number_of_example(name)
         index = m.group('index')
         if 1 <= int(index) <= max_count:
             cls_name = '{}Example'.format(name.title())
@@ -278,7 +309,8 @@ def get_global_usage():
         DisconnectUsage.usage,
         ReloadUsage.usage,
         ConfigureUsage.usage,
-        ExecuteUsage.usage
+        ExecuteUsage.usage,
+        DaemonUsage.usage
     ]
 
     return '\n'.join(str(item) for item in lst)
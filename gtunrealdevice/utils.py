@@ -9,7 +9,7 @@ from datetime import datetime
 
 from textwrap import wrap
 
-import yaml
+from gtunrealdevice.dataformat import DataFormat
 
 import typing
 
@@ -314,7 +314,7 @@ class File:
                     content = content.strip()
 
                 if content:
-                    yaml_result = yaml.safe_load(content)
+                    yaml_result = DataFormat.load(content)
                     cls.message = 'loaded {}'.format(filename)
                     return yaml_result
                 else:
@@ -0,0 +1,179 @@
+"""Module containing the logic for caching parsed yaml files.
+
+A parsed yaml file is pickled to ~/.geekstrident/gtunrealdevice/cache
+under a name which is a hash of its path, and reused as long as mtime
+and size of the source file, and optionally its content hash, are
+unchanged.  A cache only holds plain containers and yaml scalars, so it
+is unpickled with an unpickler which refuses any other global.  No cache
+is read or written in in-memory mode.
+"""
+
+import os
+import pickle
+import hashlib
+
+from gtunrealdevice.config import Data
+from gtunrealdevice.dataformat import DataFormat
+
+
+class SafeUnpickler(pickle.Unpickler):
+    """Unpickler of parsed yaml data which only resolves yaml scalar types"""
+    safe_globals = {
+        ('builtins', 'set'), ('builtins', 'frozenset'),
+        ('builtins', 'bytearray'), ('builtins', 'complex'),
+        ('datetime', 'date'), ('datetime', 'datetime'),
+        ('datetime', 'timedelta'), ('datetime', 'timezone'),
+        ('gtunrealdevice.compression', 'CompressedOutput'),
+        ('gtunrealdevice.fileoutput', 'FileReference'),
+    }
+
+    def find_class(self, module, name):
+        if (module, name) not in self.safe_globals:
+            fmt = 'global {}.{} is forbidden in yaml cache'
+            raise pickle.UnpicklingError(fmt.format(module, name))
+        return super().find_class(module, name)
+
+
+class YamlCache:
+    """Cache of parsed yaml files
+
+    Attributes
+    ----------
+    hits (int): a number of loads which are served from cache
+    misses (int): a number of loads which are parsed from yaml
+    is_hashed (bool): validating cache with content hash of source file.
+            Default is environment variable GTUNREALDEVICE_CACHE_HASH.
+    directory (str): a directory of cache files
+
+    Methods
+    -------
+    YamlCache.get_cache_filename(filename) -> str
+    YamlCache.get_signature(filename) -> list
+    YamlCache.load(filename, cache_filename='') -> object
+    YamlCache.get(filename, cache_filename='', signature=None) -> tuple
+    YamlCache.dump(filename, data, cache_filename='', signature=None) -> bool
+    YamlCache.get_info_text() -> str
+    """
+    hits = 0
+    misses = 0
+    is_hashed = Data.is_cache_hashed
+    directory = Data.cache_directory
+
+    @classmethod
+    def get_cache_filename(cls, filename):
+        filename = os.path.abspath(os.path.expanduser(filename))
+        name = hashlib.blake2b(filename.encode('utf-8', 'surrogatepass'), digest_size=16)
+        return os.path.join(os.path.expanduser(cls.directory), '{}.cache'.format(name.hexdigest()))
+
+    @classmethod
+    def get_signature(cls, filename):
+        """Get signature of source file
+
+        Parameters
+        ----------
+        filename (str): a yaml file name
+
+        Returns
+        -------
+        list: mtime in nanoseconds, size, and content hash if is_hashed
+        """
+        stat = os.stat(filename)
+        signature = [stat.st_mtime_ns, stat.st_size, '']
+        if cls.is_hashed:
+            with open(filename, 'rb') as stream:
+                signature[-1] = hashlib.blake2b(stream.read(), digest_size=16).hexdigest()
+        return signature
+
+    @classmethod
+    def load(cls, filename, cache_filename=''):
+        """Load yaml file through its cache
+
+        Parameters
+        ----------
+        filename (str): a yaml file name
+        cache_filename (str): a cache file name.  Default is a file of directory.
+
+        Returns
+        -------
+        object: parsed data of yaml file
+        """
+        filename = os.path.expanduser(filename)
+        signature = cls.get_signature(filename)
+        is_hit, data = cls.get(filename, cache_filename=cache_filename, signature=signature)
+        if is_hit:
+            return data
+
+        data = DataFormat.load_file(filename)
+
+        cls.dump(filename, data, cache_filename=cache_filename, signature=signature)
+        return data
+
+    @classmethod
+    def get(cls, filename, cache_filename='', signature=None):
+        """Get parsed data of yaml file from its cache only
+
+        Parameters
+        ----------
+        filename (str): a yaml file name
+        cache_filename (str): a cache file name.  Default is a file of directory.
+        signature (list): a signature of yaml file.  Default is None.
+
+        Returns
+        -------
+        tuple: True and parsed data if cache is valid, otherwise, False and None
+        """
+        if Data.is_in_memory:
+            cls.misses += 1
+            return False, None
+
+        filename = os.path.expanduser(filename)
+        cache_filename = cache_filename or cls.get_cache_filename(filename)
+        try:
+            signature = signature or cls.get_signature(filename)
+            with open(cache_filename, 'rb') as stream:
+                cached_signature, data = SafeUnpickler(stream).load()
+            if cached_signature == signature:
+                cls.hits += 1
+                return True, data
+        except Exception:   # noqa
+            pass
+
+        cls.misses += 1
+        return False, None
+
+    @classmethod
+    def dump(cls, filename, data, cache_filename='', signature=None):
+        """Write cache of yaml file whose parsed data is already known,
+        e.g. right after the yaml file is saved.  Failure is ignored.
+
+        Parameters
+        ----------
+        filename (str): a yaml file name
+        data (object): parsed data of yaml file
+        cache_filename (str): a cache file name.  Default is a file of directory.
+        signature (list): a signature of yaml file.  Default is None.
+
+        Returns
+        -------
+        bool: True if cache is written, otherwise, False.
+        """
+        if Data.is_in_memory:
+            return False
+
+        filename = os.path.expanduser(filename)
+        cache_filename = cache_filename or cls.get_cache_filename(filename)
+        tmp_filename = '{}.{}.tmp'.format(cache_filename, os.getpid())
+        try:
+            signature = signature or cls.get_signature(filename)
+            os.makedirs(os.path.dirname(cache_filename), mode=0o700, exist_ok=True)
+            with open(tmp_filename, 'wb') as stream:
+                pickle.dump([signature, data], stream, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_filename, cache_filename)
+            return True
+        except Exception:   # noqa
+            os.path.isfile(tmp_filename) and os.remove(tmp_filename)
+            return False
+
+    @classmethod
+    def get_info_text(cls):
+        return 'hits={}, misses={}'.format(cls.hits, cls.misses)
@@ -30,8 +30,8 @@ setup(
     test_suite='tests',
     entry_points={
         'console_scripts': [
-            'gtunrealdevice = gtunrealdevice.main:execute',
-            'gt-unreal-device = gtunrealdevice.main:execute',
+            'gtunrealdevice = gtunrealdevice.client:execute',
+            'gt-unreal-device = gtunrealdevice.client:execute',
         ]
     },
     classifiers=[
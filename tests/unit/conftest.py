@@ -0,0 +1,12 @@
+import shutil
+import tempfile
+
+from gtunrealdevice.yamlcache import YamlCache
+
+
+def pytest_configure(config):
+    YamlCache.directory = tempfile.mkdtemp(prefix='gtunrealdevice-cache-')
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(YamlCache.directory, ignore_errors=True)
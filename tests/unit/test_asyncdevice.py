@@ -0,0 +1,78 @@
+import asyncio
+
+from os import path
+
+from gtunrealdevice import AsyncUnrealDevice
+from gtunrealdevice import asyncdevice
+from gtunrealdevice import core
+from gtunrealdevice.core import DEVICES_DATA
+
+DEVICES_DATA.load(path.join(path.dirname(__file__), 'data/devices_info.yaml'))
+
+
+class TestAsyncUnrealDevice:
+    def test_execute(self, capsys):
+        async def run():
+            device = AsyncUnrealDevice('1.1.1.1', latency=0.01)
+            await device.connect(is_timestamp=False)
+            outputs = [await device.execute('show version', is_timestamp=False)
+                       for _ in range(3)]
+            await device.disconnect()
+            return device, outputs
+
+        device, outputs = asyncio.run(run())
+        assert outputs == ['show version\nversion is 2.0.1',
+                           'show version\nversion is 2.0.2',
+                           'show version\nversion is 2.0.1']
+        assert device.is_connected is False
+        assert capsys.readouterr().out == ''
+
+    def test_concurrent_sessions(self):
+        async def run_session():
+            device = AsyncUnrealDevice('1.1.1.1', latency=0.05)
+            await device.connect()
+            return await device.execute('show version', is_timestamp=False)
+
+        async def run():
+            return await asyncio.gather(*[run_session() for _ in range(100)])
+
+        outputs = asyncio.run(run())
+        assert outputs == ['show version\nversion is 2.0.1'] * 100
+
+    def test_connect_default_in_executor(self, monkeypatch):
+        import threading
+        from gtunrealdevice.core import DevicesData
+
+        devices_data = DevicesData()
+        devices_data.clear()
+        monkeypatch.setattr(core, 'DEVICES_DATA', devices_data)
+        monkeypatch.setattr(asyncdevice, 'DEVICES_DATA', devices_data)
+        threads = []
+        monkeypatch.setattr(devices_data, 'save',
+                            lambda: threads.append(threading.current_thread()) or True)
+
+        async def run():
+            device = AsyncUnrealDevice('7.7.7.7')
+            await device.connect(is_timestamp=False)
+            return device.is_connected
+
+        assert asyncio.run(run()) is True
+        assert '7.7.7.7' in devices_data
+        assert threads and threads[0] is not threading.main_thread()
+
+    def test_reconnect_in_executor(self, monkeypatch):
+        import threading
+
+        threads = []
+        reconnect = core.UnrealDevice.reconnect
+        monkeypatch.setattr(core.UnrealDevice, 'reconnect',
+                            lambda *args, **kwargs: threads.append(threading.current_thread())
+                            or reconnect(*args, **kwargs))
+
+        async def run():
+            device = AsyncUnrealDevice('1.1.1.1')
+            await device.connect(is_timestamp=False)
+            return await device.reconnect(is_timestamp=False)
+
+        assert asyncio.run(run()) is True
+        assert threads and threads[0] is not threading.main_thread()
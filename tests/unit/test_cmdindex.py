@@ -0,0 +1,176 @@
+import pytest
+
+from gtunrealdevice.cmdindex import CommandIndex
+from gtunrealdevice.core import DevicesData
+
+CMDLINES = {
+    'show version': '',
+    'show interfaces': '',
+    'show  ip route': '',
+    'show running-config': '',
+    'show running-config interface': '',
+    'show modules': '',
+    'show modules json-format': '',
+}
+
+
+class TestCommandIndex:
+    @pytest.mark.parametrize(
+        ('cmdline', 'expected_result'),
+        [
+            ('show version', 'show version'),
+            ('show interface', 'show interfaces'),
+            ('show   version', 'show version'),
+            ('show ip route', 'show  ip route'),
+            ('show ver', 'show version'),
+            ('show i', 'show i'),
+            ('show ip', 'show  ip route'),
+            ('show run', 'show running-config'),
+            ('show running-config ', 'show running-config interface'),
+            ('show modules ', 'show modules json-format'),
+            ('show bogus', 'show bogus'),
+        ]
+    )
+    def test_search(self, cmdline, expected_result):
+        index = CommandIndex(dict(CMDLINES))
+        assert index.search(cmdline) == expected_result
+
+    @pytest.mark.parametrize(
+        ('cmdline', 'expected_result', 'expected_status'),
+        [
+            ('sh ip int br', 'show ip interface brief', CommandIndex.FOUND),
+            ('sh ip int', 'show ip interface brief', CommandIndex.FOUND),
+            ('sh ip ro', 'show ip route', CommandIndex.FOUND),
+            ('sh ip', None, CommandIndex.INCOMPLETE),
+            ('sh i', None, CommandIndex.AMBIGUOUS),
+            ('p', None, CommandIndex.AMBIGUOUS),
+            ('sh bogus', None, CommandIndex.UNKNOWN),
+        ]
+    )
+    def test_resolve_abbreviation(self, cmdline, expected_result, expected_status):
+        cmdlines = {'show ip interface brief': '', 'show ip route': '',
+                    'show interfaces': '', 'ping': '', 'pwd': ''}
+        index = CommandIndex(cmdlines)
+        assert index.resolve_abbreviation(cmdline) == (expected_result, expected_status)
+
+    def test_add_and_remove(self):
+        cmdlines = dict(CMDLINES)
+        index = CommandIndex(cmdlines)
+        assert index.search('show vlan') == 'show vlan'
+
+        cmdlines['show vlan brief'] = ''
+        index.add('show vlan brief')
+        assert index.is_built_from(cmdlines)
+        assert index.search('show vlan') == 'show vlan brief'
+
+        cmdlines.pop('show version')
+        index.remove('show version')
+        assert index.is_built_from(cmdlines)
+        assert index.search('show ver') == 'show ver'
+
+
+class TestDevicesDataCommandIndex:
+    def test_update_command_line(self):
+        devices_data = DevicesData()
+        devices_data.clear()
+        devices_data['1.1.1.1'] = dict(cmdlines=dict(CMDLINES))
+        cmdlines = devices_data['1.1.1.1']['cmdlines']
+
+        index = devices_data.get_command_index('1.1.1.1', cmdlines)
+        devices_data.update_command_line('show clock', 'output', '1.1.1.1')
+        assert devices_data.get_command_index('1.1.1.1', cmdlines) is index
+        assert index.search('show cl') == 'show clock'
+
+        cmdlines.pop('show version')
+        cmdlines['show vlan'] = 'output'
+        other = devices_data.get_command_index('1.1.1.1', cmdlines)
+        assert other is not index
+        assert other.search('show vl') == 'show vlan'
+        assert devices_data.get_command_index('1.1.1.1', cmdlines) is other
+
+        devices_data['1.1.1.1'] = dict(cmdlines=dict())
+        assert devices_data.get_command_index('1.1.1.1', cmdlines) is not other
+
+
+class TestCommandPattern:
+    @pytest.mark.parametrize(
+        ('cmdline', 'expected_result', 'expected_captures'),
+        [
+            ('show interface Gi0/0/1', 'show interface {ifname}', dict(ifname='Gi0/0/1')),
+            ('show  interface Gi0/1 counters', 'show interface {ifname} counters',
+             dict(ifname='Gi0/1')),
+            ('show vlan 10', r'regex::show vlan (?P<vid>\d+)', dict(vid='10')),
+            ('show vlan x', None, dict()),
+        ]
+    )
+    def test_match_pattern(self, cmdline, expected_result, expected_captures):
+        cmdlines = {
+            'show interface {ifname}': '',
+            'show interface {ifname} counters': '',
+            r'regex::show vlan (?P<vid>\d+)': '',
+            'show version': '',
+        }
+        index = CommandIndex(cmdlines)
+        assert index.match_pattern(cmdline) == (expected_result, expected_captures)
+
+    @pytest.mark.parametrize(
+        ('cmdline', 'expected_result'),
+        [
+            ('show interface Gi0/0/1', ('show interface {ifname}', dict(ifname='Gi0/0/1'))),
+            ('show interface Gi0/0/10', ('show interface Gi0/0/10', dict())),
+            ('show interface Gi0/0/1 counters',
+             ('show interface {ifname} counters', dict(ifname='Gi0/0/1'))),
+            ('sh ver', ('show version', dict())),
+        ]
+    )
+    def test_resolve(self, cmdline, expected_result):
+        cmdlines = {
+            'show interface Gi0/0/10': '',
+            'show interface {ifname}': '',
+            'show interface {ifname} counters': '',
+            'show version': '',
+        }
+        index = CommandIndex(cmdlines)
+        assert index.resolve(cmdline) == expected_result
+
+    @pytest.mark.parametrize(
+        ('cmdline', 'expected_result'),
+        [
+            (r'regex::show vlan (', 'Invalid regular expression'),
+            (r'regex::show (\S+) \1', 'numbered group reference'),
+            (r'regex::show (?P<a>\S+) (?(1)x)', 'numbered group reference'),
+        ]
+    )
+    def test_invalid_pattern(self, cmdline, expected_result):
+        cmdlines = {cmdline: '', r'regex::(?i)show ip (?P<name>\S+)': '', 'show version': ''}
+        index = CommandIndex(cmdlines)
+        assert expected_result in index.invalid_patterns[cmdline]
+        assert index.is_built_from(cmdlines)
+        assert index.search('show ver') == 'show version'
+        assert index.resolve('SHOW IP x') == (r'regex::(?i)show ip (?P<name>\S+)', dict(name='x'))
+
+        index.remove(cmdline)
+        assert not index.invalid_patterns and index.size == 2
+
+    def test_execute(self, monkeypatch):
+        from gtunrealdevice import core
+        from gtunrealdevice import UnrealDevice
+
+        devices_data = DevicesData()
+        devices_data.clear()
+        devices_data['3.3.3.3'] = dict(cmdlines={
+            'show interface {ifname}': '{"name": "{ifname}", "status": "up"}',
+            'regex::show (': 'invalid',
+        })
+        monkeypatch.setattr(core, 'DEVICES_DATA', devices_data)
+
+        calls = []
+        match_pattern = CommandIndex.match_pattern
+        monkeypatch.setattr(CommandIndex, 'match_pattern',
+                            lambda *args: calls.append(1) or match_pattern(*args))
+
+        device = UnrealDevice('3.3.3.3')
+        device.connect(showed=False)
+        output = device.execute('show interface Gi0/0/48', is_timestamp=False, showed=False)
+        assert output == 'show interface Gi0/0/48\n{"name": "Gi0/0/48", "status": "up"}'
+        assert calls == [1]
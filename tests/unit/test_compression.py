@@ -0,0 +1,72 @@
+import pickle
+
+import pytest
+
+from gtunrealdevice import core
+from gtunrealdevice.core import DevicesData
+from gtunrealdevice.core import UnrealDevice
+from gtunrealdevice.compression import CompressedOutput
+from gtunrealdevice.outputpool import OutputPool
+from gtunrealdevice.dataformat import DataFormat
+
+OUTPUT = ''.join('interface GigabitEthernet0/{}\n no shutdown\n'.format(i) for i in range(200))
+
+
+class TestCompressedOutput:
+    @pytest.mark.parametrize('codec', ['zlib', 'lzma', 'bz2'])
+    @pytest.mark.parametrize('output', [OUTPUT, OUTPUT.encode()])
+    def test_compress(self, codec, output):
+        compressed = CompressedOutput.compress(output, codec)
+        assert len(compressed.data) < len(output)
+        assert compressed.decompress() == output
+        assert pickle.loads(pickle.dumps(compressed)) == compressed
+
+        text = DataFormat.dump({'show run': compressed})
+        assert text.startswith('show run: !compressed:{}'.format(codec))
+        assert DataFormat.load(text) == {'show run': compressed}
+
+    def test_unsupported_codec(self):
+        devices_data = DevicesData()
+        devices_data.clear()
+        text = '"1.1.1.1":\n  cmdlines:\n    show run: !compressed:gzip |-\n      eJw=\n'
+        assert devices_data.is_valid_structure(text) is False
+        assert devices_data.message.startswith('line 3, column 15: ConstructorError')
+
+    def test_lru_cache(self, monkeypatch):
+        CompressedOutput.clear_cache()
+        monkeypatch.setattr(CompressedOutput, 'cache_max_size', len(OUTPUT) * 2 + 2)
+        outputs = [CompressedOutput.compress(OUTPUT + str(i), 'zlib') for i in range(3)]
+        for output in outputs:
+            output.decompress()
+        assert list(CompressedOutput._cache) == outputs[1:]
+        assert CompressedOutput._cache_size <= CompressedOutput.cache_max_size
+        CompressedOutput.clear_cache()
+
+    def test_devices_data(self, tmp_path, monkeypatch):
+        devices_data = DevicesData()
+        devices_data.clear()
+        devices_data.pool = OutputPool(codec='lzma', min_size=1024)
+        devices_data['1.1.1.1'] = dict(cmdlines={'show run': OUTPUT, 'show clock': ['08:00', OUTPUT]})
+        cmdlines = devices_data['1.1.1.1']['cmdlines']
+        assert isinstance(cmdlines['show run'], CompressedOutput)
+        assert cmdlines['show clock'][0] == '08:00'
+        assert cmdlines['show run'] is cmdlines['show clock'][1]
+        assert devices_data.get_output_stats()['compressed'] == 2
+
+        filename = str(tmp_path / 'devices_info.yaml')
+        devices_data.save(filename)
+        other = DevicesData()
+        other.clear()
+        other.load(filename)
+        assert other == devices_data
+        assert CompressedOutput.expand(dict(other)) == {
+            '1.1.1.1': dict(cmdlines={'show run': OUTPUT, 'show clock': ['08:00', OUTPUT]})
+        }
+
+        monkeypatch.setattr(core, 'DEVICES_DATA', other)
+        device = UnrealDevice('1.1.1.1')
+        device.connect(is_timestamp=False, showed=False)
+        output = device.execute('show run | include Gigabit', is_timestamp=False, showed=False)
+        assert output.splitlines()[1:] == [line for line in OUTPUT.splitlines() if 'Gigabit' in line]
+        outputs = [device.execute('show clock', is_timestamp=False, showed=False) for _ in range(2)]
+        assert outputs == ['show clock\n08:00', 'show clock\n{}'.format(OUTPUT.rstrip())]
@@ -1,3 +1,6 @@
+import sys
+import subprocess
+
 import pytest   # noqa
 
 from os import path
@@ -6,9 +9,12 @@ from gtunrealdevice import UnrealDevice
 from gtunrealdevice.core import DEVICES_DATA
 
 from gtunrealdevice.utils import Misc
+from gtunrealdevice.constant import ECODE
 
 DEVICES_DATA.load(path.join(path.dirname(__file__), 'data/devices_info.yaml'))
 
+ROOT = path.dirname(path.dirname(path.dirname(path.abspath(__file__))))
+
 
 class TestUnrealDevice:
     @pytest.mark.parametrize(
@@ -61,3 +67,289 @@ class TestUnrealDevice:
 
         actual_expected_result = Misc.join_string(cmdline, expected_output, sep='\n')
         assert output == format(actual_expected_result)
+
+    @pytest.mark.parametrize(
+        ('cmdline', 'expected_output', 'expected_success_code'),
+        [
+            ('sh ver', 'version is 2.0.1', ECODE.SUCCESS),
+            ('show bogus', 'UnrealDeviceCmdline: "show bogus" does not have output', ECODE.BAD),
+        ]
+    )
+    def test_abbreviated_execute(self, cmdline, expected_output, expected_success_code):
+        device = UnrealDevice('1.1.1.1')
+        device.connect(is_timestamp=False)
+        output = device.execute(cmdline, is_timestamp=False)
+        assert output == Misc.join_string(cmdline, expected_output, sep='\n')
+        assert device.success_code == expected_success_code
+
+
+class TestDevicesData:
+    def test_lazy_loading(self, tmp_path, monkeypatch):
+        from gtunrealdevice.config import Data
+        from gtunrealdevice.core import DevicesData
+
+        filename = tmp_path / 'devices_info.yaml'
+        filename.write_text('"2.2.2.2":\n  name: device2\n')
+        monkeypatch.setattr(Data, 'devices_info_filename', str(filename))
+
+        devices_data = DevicesData()
+        assert devices_data.is_loaded is False
+
+        assert devices_data.get_address_from_name('device2') == '2.2.2.2'
+        assert devices_data.is_loaded is True
+        assert len(devices_data) == 1
+
+    def test_incremental_save(self, tmp_path, monkeypatch):
+        from gtunrealdevice.config import Data
+        from gtunrealdevice.core import DevicesData
+
+        filename = tmp_path / 'devices_info.yaml'
+        filename.write_text('"2.2.2.2":\n  name: device2\n')
+        monkeypatch.setattr(Data, 'devices_info_filename', str(filename))
+
+        devices_data = DevicesData()
+        devices_data['3.3.3.3'] = dict(name='device3')
+        devices_data.pop('2.2.2.2')
+        assert devices_data.save() is True
+        assert filename.read_text() == '"2.2.2.2":\n  name: device2\n'
+
+        journal = tmp_path / 'devices_info.yaml.journal'
+        with open(journal, 'a') as stream:
+            stream.write('{"op": "set", "address": "4.4')
+
+        other = DevicesData()
+        assert dict(other) == {'3.3.3.3': dict(name='device3')}
+        assert journal.read_text().endswith('}\n')
+
+        other.journal_min_size = 0
+        other.update_command_line('show clock', '08:00', '3.3.3.3')
+        other.save()
+        assert not journal.exists()
+        assert DevicesData() == {'3.3.3.3': dict(name='device3', cmdlines={'show clock': '08:00'})}
+
+    def test_in_place_save(self, tmp_path, monkeypatch):
+        from gtunrealdevice.config import Data
+        from gtunrealdevice.core import DevicesData
+
+        filename = tmp_path / 'devices_info.yaml'
+        filename.write_text('"2.2.2.2":\n  name: device2\n"3.3.3.3":\n  name: device3\n')
+        monkeypatch.setattr(Data, 'devices_info_filename', str(filename))
+
+        devices_data = DevicesData()
+        node = devices_data['2.2.2.2']
+        node['name'] = 'changed2'
+        devices_data.get('3.3.3.3')['cmdlines'] = {'show clock': '08:00'}
+        assert devices_data.save() is True
+        assert devices_data.is_dirty is False
+
+        node['name'] = 'changed again'
+        assert devices_data.save() is True
+        assert DevicesData() == {'2.2.2.2': dict(name='changed again'),
+                                 '3.3.3.3': dict(name='device3', cmdlines={'show clock': '08:00'})}
+
+        records = (tmp_path / 'devices_info.yaml.journal').read_text().splitlines()
+        assert len(records) == 3
+        devices_data.get('3.3.3.3')
+        assert devices_data.save() is True
+        assert len((tmp_path / 'devices_info.yaml.journal').read_text().splitlines()) == 3
+
+    def test_journal_types(self, tmp_path, monkeypatch):
+        from datetime import date
+        from gtunrealdevice.config import Data
+        from gtunrealdevice.core import DevicesData
+        from gtunrealdevice.compression import CompressedOutput
+
+        filename = tmp_path / 'devices_info.yaml'
+        filename.write_text('')
+        monkeypatch.setattr(Data, 'devices_info_filename', str(filename))
+
+        cmdlines = {'show tech': CompressedOutput.compress('tech\n' * 100, 'zlib'),
+                    'show dump': b'\x80\x04binary',
+                    'show date': date(2024, 1, 2)}
+        devices_data = DevicesData()
+        devices_data['3.3.3.3'] = dict(name='device3', cmdlines=dict(cmdlines))
+        devices_data.save()
+        assert (tmp_path / 'devices_info.yaml.journal').exists()
+
+        other = DevicesData()
+        assert other['3.3.3.3']['cmdlines'] == cmdlines
+        other.compact()
+        assert DevicesData()['3.3.3.3']['cmdlines'] == cmdlines
+
+    def test_batch(self, tmp_path, monkeypatch):
+        from gtunrealdevice.config import Data
+        from gtunrealdevice.core import DevicesData
+
+        filename = tmp_path / 'devices_info.yaml'
+        filename.write_text('"2.2.2.2":\n  name: device2\n"3.3.3.3":\n  name: device3\n')
+        monkeypatch.setattr(Data, 'devices_info_filename', str(filename))
+
+        devices_data = DevicesData()
+        calls = []
+        append_journal = devices_data.append_journal
+        monkeypatch.setattr(devices_data, 'append_journal',
+                            lambda: calls.append(1) or append_journal())
+
+        with pytest.raises(ValueError):
+            with devices_data.batch():
+                devices_data.update_command_line('show clock', '08:00', '2.2.2.2')
+                devices_data.remove_device('device3')
+                devices_data['4.4.4.4'] = dict(name='device4')
+                raise ValueError('rolled back')
+        assert devices_data == {'2.2.2.2': dict(name='device2'),
+                                '3.3.3.3': dict(name='device3')}
+        assert devices_data.is_dirty is False
+        assert calls == []
+
+        with pytest.raises(ValueError):
+            with devices_data.batch():
+                devices_data['2.2.2.2']['name'] = 'changed'
+                devices_data.get('3.3.3.3')['cmdlines'] = dict(x='changed')
+                raise ValueError('rolled back')
+        assert devices_data == {'2.2.2.2': dict(name='device2'),
+                                '3.3.3.3': dict(name='device3')}
+
+        with pytest.raises(KeyboardInterrupt):
+            with devices_data.batch():
+                devices_data['4.4.4.4'] = dict(name='device4')
+                devices_data['2.2.2.2']['name'] = 'changed'
+                raise KeyboardInterrupt
+        assert devices_data == {'2.2.2.2': dict(name='device2'),
+                                '3.3.3.3': dict(name='device3')}
+        assert devices_data.is_batching is False
+        assert devices_data.is_dirty is False
+
+        with devices_data.batch():
+            devices_data.remove_device('device2')
+            devices_data.remove_device('device3')
+        assert len(devices_data) == 0
+        assert calls == [1]
+
+    def test_concurrent_save(self, tmp_path, monkeypatch):
+        from gtunrealdevice.config import Data
+        from gtunrealdevice.core import DevicesData
+
+        filename = tmp_path / 'devices_info.yaml'
+        filename.write_text('"2.2.2.2":\n  name: device2\n')
+        monkeypatch.setattr(Data, 'devices_info_filename', str(filename))
+
+        first, second = DevicesData(), DevicesData()
+        first.materialize()
+        second.materialize()
+        first['3.3.3.3'] = dict(name='device3')
+        second['4.4.4.4'] = dict(name='device4')
+        second.pop('2.2.2.2')
+        assert first.save() is True
+        assert second.save() is True
+        assert set(second) == {'3.3.3.3', '4.4.4.4'}
+
+        first.compact()
+        second.update_command_line('show clock', '08:00', '4.4.4.4')
+        assert second.save() is True
+        assert DevicesData() == {'3.3.3.3': dict(name='device3'),
+                                 '4.4.4.4': dict(name='device4',
+                                                 cmdlines={'show clock': '08:00'})}
+        assert (tmp_path / 'devices_info.yaml.lock').exists()
+
+    def test_validate_and_load(self, tmp_path, monkeypatch):
+        from gtunrealdevice.core import DevicesData
+        from gtunrealdevice.dataformat import DataFormat
+
+        filename = tmp_path / 'capture.yaml'
+        filename.write_text('\n'.join([
+            '"1.1.1.1":',
+            '  name: device1',
+            '  cmdlines: show version',
+            '"2.2.2.2":',
+            '  cmdlines:',
+            '    show version:',
+            '      - {version: 1}',
+            '  configs: [cfg]',
+        ]))
+        devices_data = DevicesData()
+        devices_data.clear()
+        assert devices_data.is_valid_file(str(filename)) is False
+        assert devices_data.message.splitlines() == [
+            'line 3, column 13: Invalid cmdlines format of "1.1.1.1" device.',
+            'line 7, column 7: Invalid output format of "show version" cmdline of "2.2.2.2" device.',
+            'line 8, column 12: Invalid configs format of "2.2.2.2" device.',
+        ]
+
+        filename.write_text('"1.1.1.1":\n  name: [device1\n')
+        assert devices_data.is_valid_file(str(filename)) is False
+        assert devices_data.message.startswith('line 3, column 1: ')
+
+        filename.write_text('"1.1.1.1":\n  name: device1\n')
+        calls = []
+        compose = DataFormat.compose
+        monkeypatch.setattr(DataFormat, 'compose', lambda data: calls.append(1) or compose(data))
+        assert devices_data.is_valid_file(str(filename)) is True
+        devices_data.load(str(filename))
+        assert devices_data == {'1.1.1.1': dict(name='device1')}
+        assert calls == [1]
+
+    def test_load_stream(self, tmp_path, monkeypatch):
+        from gtunrealdevice.core import DevicesData
+        from gtunrealdevice.exceptions import DevicesInfoError
+
+        filename = tmp_path / 'capture.yaml'
+        filename.write_text('\n'.join([
+            '"1.1.1.1":',
+            '  name: device1',
+            '"2.2.2.2":',
+            '  cmdlines:',
+            '    show version: [{version: 1}]',
+        ]))
+        devices_data = DevicesData()
+        devices_data.clear()
+        devices_data.stream_min_size = 0
+        monkeypatch.setattr(devices_data, 'is_valid_file', None)
+        with pytest.raises(DevicesInfoError):
+            devices_data.load(str(filename))
+        assert devices_data.message == (
+            'line 5, column 19: Invalid output format of "show version" cmdline of "2.2.2.2" device.'
+        )
+        assert devices_data == {}
+
+        filename.write_text('"1.1.1.1":\n  name: device1\n"2.2.2.2": {name: device2}\n')
+        devices_data.load(str(filename))
+        assert devices_data == {'1.1.1.1': dict(name='device1'), '2.2.2.2': dict(name='device2')}
+        assert str(filename) in devices_data.filenames
+
+    def test_session_state(self, monkeypatch):
+        import pickle
+        from gtunrealdevice import core
+        from gtunrealdevice.core import DevicesData
+
+        devices_data = DevicesData()
+        devices_data.clear()
+        output = 'interface Ethernet0\n' * 1000
+        devices_data['1.1.1.1'] = dict(name='device1', cmdlines={'show run': [output, output]})
+        monkeypatch.setattr(core, 'DEVICES_DATA', devices_data)
+
+        device = UnrealDevice('1.1.1.1', vendor='cisco')
+        device.connect(is_timestamp=False, showed=False)
+        device.execute('show run', is_timestamp=False, showed=False)
+        byte_data = pickle.dumps(device)
+        assert len(byte_data) < 1024
+
+        other = pickle.loads(byte_data)
+        assert other.data is devices_data['1.1.1.1']
+        assert (other.address, other.name, other.is_connected) == ('1.1.1.1', 'device1', True)
+        assert (other.table, other.success_code, other.vendor) == ({'show run': 0}, ECODE.SUCCESS, 'cisco')
+
+        legacy = UnrealDevice.__new__(UnrealDevice)
+        legacy.__setstate__(dict(device.__dict__))
+        assert legacy.data == device.data
+
+        device.disconnect(is_timestamp=False, showed=False)
+        assert pickle.loads(pickle.dumps(device)).data is devices_data['1.1.1.1']
+
+
+class TestPackage:
+    def test_lazy_import(self):
+        code = ('import sys, gtunrealdevice; '
+                'from gtunrealdevice import UnrealDevice, MemoryMode; '
+                'print(sorted(m for m in ["asyncio", "concurrent.futures"] if m in sys.modules))')
+        output = subprocess.check_output([sys.executable, '-c', code], cwd=ROOT)
+        assert output.decode().strip() == '[]'
@@ -0,0 +1,97 @@
+import os
+import threading
+
+import pytest
+
+from gtunrealdevice import main
+from gtunrealdevice.config import Data
+from gtunrealdevice.client import Client
+from gtunrealdevice.core import DEVICES_DATA
+from gtunrealdevice.core import DevicesData
+from gtunrealdevice.daemon import Daemon
+from gtunrealdevice.daemon import DaemonServer
+from gtunrealdevice.serialization import SerializedFile
+
+pytestmark = pytest.mark.skipif(not Client.is_supported(), reason='requires Unix domain socket')
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    filename = str(tmp_path / 'daemon.sock')
+    monkeypatch.setattr(Daemon, 'filename', filename)
+    server = DaemonServer(filename)
+    thread = threading.Thread(target=server.serve_until_stopped, daemon=True)
+    thread.start()
+    yield server
+    Client.send(dict(action='shutdown'), timeout=5, filename=filename)
+    thread.join(5)
+    server.server_close()
+
+
+@pytest.fixture
+def devices_info_file(tmp_path, monkeypatch):
+    filename = tmp_path / 'devices_info.yaml'
+    monkeypatch.setattr(Data, 'devices_info_filename', str(filename))
+    monkeypatch.setattr(SerializedFile, 'filename', str(tmp_path / 'serialized_data.db'))
+    monkeypatch.setattr(SerializedFile, 'legacy_filename', str(tmp_path / 'serialized_data.yaml'))
+    DEVICES_DATA.reset()
+    yield filename
+    SerializedFile.close()
+    DEVICES_DATA.reset()
+    DEVICES_DATA.clear()
+    DEVICES_DATA.load(os.path.join(os.path.dirname(__file__), 'data/devices_info.yaml'))
+
+
+class TestClient:
+    def test_filename(self):
+        assert Client.filename == Data.daemon_socket_filename
+
+    @pytest.mark.parametrize(
+        ('args', 'expected_result'),
+        [
+            (['execute', '1.1.1.1::show version'], 'execute'),
+            (['VIEW'], 'view'),
+            (['daemon', 'start'], ''),
+            (['--help'], ''),
+            ([], ''),
+        ]
+    )
+    def test_get_command(self, args, expected_result):
+        assert Client.get_command(args) == expected_result
+
+    def test_forward_without_daemon(self, tmp_path):
+        assert Client.forward(['version'], filename=str(tmp_path / 'daemon.sock')) is None
+
+
+class TestDaemon:
+    def test_forward(self, server, capsys):
+        assert Daemon.is_running() is True
+        assert Client.forward(['version'], filename=Daemon.filename) == 0
+        assert capsys.readouterr().out == 'unreal-device v{}\n'.format(main.version)
+
+    def test_relative_filename(self, server, tmp_path, monkeypatch):
+        devices_data = DevicesData()
+        devices_data.clear()
+        monkeypatch.setattr(main, 'DEVICES_DATA', devices_data)
+        (tmp_path / 'capture.yaml').write_text('"2.2.2.2":\n  name: device2\n')
+
+        cwd = os.getcwd()
+        response = server.run_command(['load', 'capture.yaml'], cwd=str(tmp_path))
+        assert response.exit_code == 0
+        assert '2.2.2.2' in devices_data
+        assert os.getcwd() == cwd
+
+    def test_other_writer(self, server, devices_info_file):
+        assert server.run_command(['connect', '8.8.8.8']).exit_code == 0
+        assert DEVICES_DATA.is_loaded is True
+
+        other = DevicesData()
+        other['9.9.9.9'] = dict(name='edge9')
+        assert other.save() is True
+
+        assert server.run_command(['connect', '9.9.9.9']).exit_code == 0
+        assert DEVICES_DATA['9.9.9.9']['name'] == 'edge9'
+
+        devices_data = DevicesData()
+        assert devices_data['9.9.9.9'] == dict(name='edge9')
+        assert '8.8.8.8' in devices_data
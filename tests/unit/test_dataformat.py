@@ -0,0 +1,116 @@
+import json
+from datetime import date, datetime
+
+import pytest
+import yaml
+
+from gtunrealdevice.dataformat import DataFormat
+from gtunrealdevice.core import DevicesData
+from gtunrealdevice.compression import CompressedOutput
+
+DATA = {'1.1.1.1': {'name': 'device1', 'cmdlines': {'show version': ['v1', 'v2']}}}
+
+
+class TestDataFormat:
+    @pytest.mark.parametrize(
+        ('text', 'expected_result'),
+        [
+            ('"1.1.1.1":\n  name: device1\n', {'1.1.1.1': {'name': 'device1'}}),
+            ('{"1.1.1.1": {"name": "device1"}}', {'1.1.1.1': {'name': 'device1'}}),
+            ('{1.1.1.1: {name: device1}}', {'1.1.1.1': {'name': 'device1'}}),
+            ('', None),
+        ]
+    )
+    def test_load(self, text, expected_result):
+        assert DataFormat.load(text) == expected_result
+
+    @pytest.mark.parametrize('is_json', [False, True])
+    def test_dump(self, is_json):
+        text = DataFormat.dump(DATA, is_json=is_json)
+        assert DataFormat.is_json_text(text) is is_json
+        assert DataFormat.load(text) == DATA
+
+    def test_dump_binary(self):
+        data = {'1.1.1.1': b'\x80\x04binary'}
+        assert DataFormat.load(DataFormat.dump(data)) == data
+
+    @pytest.mark.parametrize(
+        'data',
+        [
+            {'show version': b'\x80\x04binary'},
+            {'show clock': [date(2024, 1, 2), datetime(2024, 1, 2, 8, 0)]},
+            {1: 'one', '!type': 'key'},
+            {'show tech': CompressedOutput.compress('tech' * 100, 'zlib')},
+            [None, True, 1, 1.5, 'text', "b'text'"],
+        ]
+    )
+    def test_json_round_trip(self, data):
+        text = json.dumps(DataFormat.encode_json(data))
+        assert DataFormat.decode_json(json.loads(text)) == data
+
+    def test_global_yaml_unchanged(self):
+        output = CompressedOutput.compress('tech' * 100, 'zlib')
+        text = DataFormat.dump({'show tech': output})
+        assert DataFormat.load(text) == {'show tech': output}
+        with pytest.raises(yaml.YAMLError):
+            yaml.safe_dump({'show tech': output})
+        with pytest.raises(yaml.YAMLError):
+            yaml.safe_load(text)
+        assert CompressedOutput not in yaml.Dumper.yaml_representers
+
+    @pytest.mark.parametrize('suffix', ['.yaml', '.json'])
+    def test_devices_data_file(self, tmp_path, suffix):
+        filename = str(tmp_path / 'devices_info{}'.format(suffix))
+        devices_data = DevicesData()
+        devices_data.clear()
+        devices_data.update(DATA)
+        devices_data.save(filename)
+
+        with open(filename) as stream:
+            assert DataFormat.is_json_text(stream.read()) is (suffix == '.json')
+        assert DataFormat.load_file(filename) == DATA
+
+        other = DevicesData()
+        other.clear()
+        other.load(filename)
+        assert other == DATA
+
+    def test_iter_items(self):
+        text = '\n'.join([
+            '"1.1.1.1":',
+            '  name: device1',
+            '  cmdlines:',
+            '    show version: &version v1',
+            '    show clock: [08:00, 08:01]',
+            '"2.2.2.2": {name: *version}',
+        ])
+        items = list(DataFormat.iter_items(text))
+        assert [(key, value) for key, value, _ in items] == [
+            ('1.1.1.1', {'name': 'device1',
+                         'cmdlines': {'show version': 'v1', 'show clock': ['08:00', '08:01']}}),
+            ('2.2.2.2', {'name': 'v1'}),
+        ]
+        assert DataFormat.locate(items[1][2], ('2.2.2.2',)) == 'line 6, column 12'
+
+        streamed = []
+        items = DataFormat.iter_items(
+            text, streamed_key='cmdlines',
+            on_item=lambda *args: streamed.append(
+                args[:3] + (DataFormat.locate(args[3], args[:1] + ('cmdlines',) + args[1:2]),)
+            )
+        )
+        assert [(key, value) for key, value, _ in items] == [
+            ('1.1.1.1', {'name': 'device1'}), ('2.2.2.2', {'name': 'v1'})
+        ]
+        assert streamed == [
+            ('1.1.1.1', 'show version', 'v1', 'line 4, column 19'),
+            ('1.1.1.1', 'show clock', ['08:00', '08:01'], 'line 5, column 17'),
+        ]
+
+    @pytest.mark.parametrize('text', ['', '# comment\n', '---\n'])
+    def test_iter_items_empty(self, text):
+        assert list(DataFormat.iter_items(text)) == []
+
+    def test_iter_items_not_mapping(self):
+        with pytest.raises(ValueError):
+            list(DataFormat.iter_items('- 1.1.1.1\n'))
@@ -0,0 +1,107 @@
+import pytest
+
+from gtunrealdevice import core
+from gtunrealdevice.core import DevicesData
+from gtunrealdevice.core import UnrealDevice
+from gtunrealdevice.fileoutput import FileOutput
+from gtunrealdevice.fileoutput import FileReference
+from gtunrealdevice.dataformat import DataFormat
+from gtunrealdevice.constant import ECODE
+
+
+@pytest.fixture
+def capture(tmp_path):
+    filename = tmp_path / 'show_tech.txt'
+    filename.write_text(''.join('interface Ethernet{}\n ip address 10.0.0.{}\r\n'.format(i, i)
+                                for i in range(100)))
+    yield filename
+    FileOutput.clear()
+
+
+class TestFileOutput:
+    @pytest.mark.parametrize(
+        ('output', 'expected_result'),
+        [
+            ('file::/tmp/show_tech.txt', '/tmp/show_tech.txt'),
+            ('  FILENAME::  /tmp/show tech.txt  ', '/tmp/show tech.txt'),
+            ('file::/tmp/show_tech.txt\nmore', ''),
+            ('interface file::x', ''),
+            (['file::/tmp/show_tech.txt'], ''),
+        ]
+    )
+    def test_match_filename(self, output, expected_result):
+        assert FileOutput.match_filename(output) == expected_result
+
+    @pytest.mark.parametrize(
+        ('output', 'expected_result'),
+        [
+            (FileReference('/tmp/show_tech.txt'), '/tmp/show_tech.txt'),
+            ('file::/tmp/show_tech.txt', ''),
+            ([FileReference('/tmp/show_tech.txt')], ''),
+        ]
+    )
+    def test_get_filename(self, output, expected_result):
+        assert FileOutput.get_filename(output) == expected_result
+
+    @pytest.mark.parametrize('is_json', [False, True])
+    def test_file_tag(self, is_json):
+        data = {'show tech': FileReference('/tmp/show_tech.txt'), 'show file': 'file::/tmp/x'}
+        text = DataFormat.dump(data)
+        assert "!file '/tmp/show_tech.txt'" in text or '!file /tmp/show_tech.txt' in text
+        assert DataFormat.load(text) == data
+        assert DataFormat.decode_json(DataFormat.encode_json(data)) == data
+
+    def test_read_and_iter_lines(self, capture, monkeypatch):
+        filename = str(capture)
+        lines = list(FileOutput.iter_lines(filename))
+        assert len(lines) == 200
+        assert lines[:2] == ['interface Ethernet0', ' ip address 10.0.0.0']
+        assert FileOutput.read(filename) == capture.read_bytes().decode()
+
+        monkeypatch.setattr(FileOutput, 'max_handles', 1)
+        other = capture.parent / 'empty.txt'
+        other.write_text('')
+        assert FileOutput.read(str(other)) == ''
+        assert list(FileOutput._handles) == [str(other)]
+
+    def test_close_evicted(self, capture, monkeypatch):
+        monkeypatch.setattr(FileOutput, 'max_handles', 1)
+        lines = FileOutput.iter_lines(str(capture))
+        handle = FileOutput._handles[str(capture)]
+        assert next(lines) == 'interface Ethernet0'
+
+        other = capture.parent / 'other.txt'
+        other.write_text('other\n')
+        assert FileOutput.read(str(other)) == 'other\n'
+        assert handle.is_evicted and not handle.data.closed
+        assert len(list(lines)) == 199
+        assert handle.data.closed
+
+        other_handle = FileOutput._handles[str(other)]
+        FileOutput.clear()
+        assert other_handle.data.closed
+
+    def test_execute(self, capture, tmp_path, monkeypatch):
+        devices_data = DevicesData()
+        devices_data.clear()
+        devices_data.update_command_line('show tech', 'file::{}'.format(capture.name), '1.1.1.1')
+        monkeypatch.chdir(tmp_path)
+        devices_data.update_command_line('show tech', 'file::{}'.format(capture.name), '1.1.1.1')
+        output = devices_data['1.1.1.1']['cmdlines']['show tech']
+        assert output == FileReference(str(capture))
+        devices_data.update_command_line('show literal', 'file::missing.txt', '1.1.1.1')
+
+        monkeypatch.setattr(core, 'DEVICES_DATA', devices_data)
+        device = UnrealDevice('1.1.1.1')
+        device.connect(is_timestamp=False, showed=False)
+        output = device.execute('show tech | include Ethernet9$', is_timestamp=False, showed=False)
+        assert output == 'show tech | include Ethernet9$\ninterface Ethernet9'
+        output = device.execute('show tech', is_timestamp=False, showed=False)
+        assert output == 'show tech\n{}'.format(capture.read_text().rstrip())
+        output = device.execute('show literal', is_timestamp=False, showed=False)
+        assert output == 'show literal\nfile::missing.txt'
+
+        capture.unlink()
+        output = device.execute('show tech | count', is_timestamp=False, showed=False)
+        assert 'Cannot read' in output
+        assert device.success_code == ECODE.BAD
@@ -0,0 +1,81 @@
+import pytest
+
+from os import path
+
+from gtunrealdevice import DeviceGroup
+from gtunrealdevice.core import DEVICES_DATA
+from gtunrealdevice.constant import ECODE
+
+DEVICES_DATA.load(path.join(path.dirname(__file__), 'data/devices_info.yaml'))
+
+
+class TestDeviceGroup:
+    @pytest.mark.parametrize('is_process', [False, True])
+    def test_execute(self, is_process):
+        with DeviceGroup(['device1'], max_workers=2, is_process=is_process) as group:
+            result = group.connect(default=False, is_timestamp=False)
+            assert result['1.1.1.1'].success_code == ECODE.SUCCESS
+
+            outputs = []
+            for _ in range(3):
+                result = group.execute('show version', is_timestamp=False)
+                outputs.append(result['1.1.1.1'].output)
+
+            assert outputs == ['show version\nversion is 2.0.1',
+                               'show version\nversion is 2.0.2',
+                               'show version\nversion is 2.0.1']
+
+    def test_unavailable_device(self):
+        with DeviceGroup(['device1', '9.9.9.9']) as group:
+            result = group.connect(default=False)
+            assert result['1.1.1.1'].success_code == ECODE.SUCCESS
+            assert result['9.9.9.9'].success_code == ECODE.BAD
+            assert list(group.execute('show version')) == ['1.1.1.1']
+
+    @pytest.mark.parametrize('is_process', [False, True])
+    def test_success_code(self, is_process):
+        with DeviceGroup(['device1'], max_workers=1, is_process=is_process) as group:
+            group.connect(default=False, is_timestamp=False)
+            result = group.execute('show bogus', is_timestamp=False)
+            assert result['1.1.1.1'].success_code == ECODE.BAD
+            assert group.devices['1.1.1.1'].success_code == ECODE.BAD
+
+            group.execute('show version', is_timestamp=False)
+            assert group.devices['1.1.1.1'].success_code == ECODE.SUCCESS
+
+    def test_connect_in_batch(self, tmp_path, monkeypatch):
+        from gtunrealdevice import core
+        from gtunrealdevice import fleet
+        from gtunrealdevice.config import Data
+        from gtunrealdevice.core import DevicesData
+        from gtunrealdevice.core import UnrealDevice
+
+        monkeypatch.setattr(Data, 'devices_info_filename', str(tmp_path / 'devices_info.yaml'))
+        devices_data = DevicesData()
+        monkeypatch.setattr(core, 'DEVICES_DATA', devices_data)
+        monkeypatch.setattr(fleet, 'DEVICES_DATA', devices_data)
+        calls = []
+        append_journal = devices_data.append_journal
+        monkeypatch.setattr(devices_data, 'append_journal',
+                            lambda: calls.append(1) or append_journal())
+
+        with DeviceGroup(['5.5.5.5', '6.6.6.6']) as group:
+            result = group.connect(is_timestamp=False)
+            assert [item.success_code for item in result.values()] == [ECODE.SUCCESS] * 2
+        assert calls == [1]
+        assert set(DevicesData()) == {'5.5.5.5', '6.6.6.6'}
+
+        connect = UnrealDevice.connect
+
+        def interrupted_connect(device, *args, **kwargs):
+            if device.address == '8.8.8.8':
+                raise KeyboardInterrupt
+            return connect(device, *args, **kwargs)
+
+        monkeypatch.setattr(UnrealDevice, 'connect', interrupted_connect)
+        with DeviceGroup(['7.7.7.7', '8.8.8.8']) as group:
+            with pytest.raises(KeyboardInterrupt):
+                group.connect(is_timestamp=False)
+            assert len(group) == 0
+        assert '7.7.7.7' not in devices_data
+        assert calls == [1]
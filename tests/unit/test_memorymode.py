@@ -0,0 +1,64 @@
+import pytest
+
+from os import path
+
+from gtunrealdevice import MemoryMode
+from gtunrealdevice.config import Data
+from gtunrealdevice.core import DEVICES_DATA
+from gtunrealdevice.core import UnrealDevice
+from gtunrealdevice.serialization import SerializedFile
+
+
+@pytest.fixture
+def memory_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(Data, 'devices_info_filename', str(tmp_path / 'devices_info.yaml'))
+    monkeypatch.setattr(SerializedFile, 'filename', str(tmp_path / 'serialized_data.db'))
+    monkeypatch.setattr(SerializedFile, 'legacy_filename', str(tmp_path / 'serialized_data.yaml'))
+    MemoryMode.enable()
+    yield MemoryMode
+    MemoryMode.disable()
+    DEVICES_DATA.load(path.join(path.dirname(__file__), 'data/devices_info.yaml'))
+
+
+class TestMemoryMode:
+    def test_no_disk_write(self, memory_mode, tmp_path):
+        assert memory_mode.is_enabled() is True
+        assert len(DEVICES_DATA) == 0
+
+        device = UnrealDevice('5.5.5.5')
+        device.connect(is_timestamp=False, showed=False)
+        assert device.is_auto_generated_device is True
+        SerializedFile.add_instance('5.5.5.5', device)
+        assert SerializedFile.get_info().total == 1
+        assert '5.5.5.5' in DEVICES_DATA
+        assert DEVICES_DATA.is_dirty is False
+        assert list(tmp_path.iterdir()) == []
+
+    def test_release_after_disconnect(self, memory_mode):
+        device = UnrealDevice('5.5.5.5')
+        device.connect(is_timestamp=False, showed=False)
+        device.disconnect(is_timestamp=False, showed=False)
+        SerializedFile.add_instance('5.5.5.5', device)
+
+        assert SerializedFile.get_instance('5.5.5.5').is_auto_generated_device is True
+        assert SerializedFile.remove_instance('5.5.5.5') is True
+        assert '5.5.5.5' not in DEVICES_DATA
+
+    def test_snapshot_and_restore(self, memory_mode, tmp_path):
+        filename = tmp_path / 'capture.yaml'
+        filename.write_text('"2.2.2.2":\n  cmdlines:\n    show clock: ["08:00", "08:01"]\n')
+        DEVICES_DATA.load(str(filename))
+        assert list(tmp_path.iterdir()) == [filename]
+
+        with memory_mode.isolated() as snapshot:
+            assert snapshot['devices'] == {'2.2.2.2': dict(cmdlines={'show clock': ['08:00', '08:01']})}
+            DEVICES_DATA['2.2.2.2']['cmdlines']['show clock'].append('08:02')
+            device = UnrealDevice('5.5.5.5')
+            device.connect(is_timestamp=False, showed=False)
+            SerializedFile.add_instance('5.5.5.5', device)
+            SerializedFile.update_cursors('5.5.5.5', {'show clock': 1})
+
+        assert DEVICES_DATA == snapshot['devices']
+        assert SerializedFile.get_info().total == 0
+        assert SerializedFile.get_cursors('5.5.5.5') == dict()
+        assert list(tmp_path.iterdir()) == [filename]
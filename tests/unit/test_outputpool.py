@@ -0,0 +1,79 @@
+import pytest
+
+from gtunrealdevice.outputpool import OutputPool
+from gtunrealdevice.compression import CompressedOutput
+from gtunrealdevice.core import DevicesData
+from gtunrealdevice.dataformat import DataFormat
+
+
+class TestOutputPool:
+    @pytest.mark.parametrize(
+        'output',
+        ['version is 2.0.1', b'\x80binary', ['version is 2.0.1', 'version is 2.0.2'], 1, None]
+    )
+    def test_intern(self, output):
+        pool = OutputPool()
+        first = pool.intern(output)
+        second = pool.intern(output.copy() if isinstance(output, list) else output)
+        assert first == second == output
+        if isinstance(output, list):
+            assert all(i is j for i, j in zip(first, second))
+        else:
+            assert first is second
+
+    def test_devices_data(self, tmp_path):
+        output = ''.join(['interface {}\n'.format(i) for i in range(10)])
+        devices_data = DevicesData()
+        devices_data.clear()
+        devices_data['1.1.1.1'] = dict(cmdlines={'show run': output})
+        devices_data.update({'2.2.2.2': dict(cmdlines={'show run': ''.join(output)})})
+        devices_data.update_command_line('show run', ''.join(output), '3.3.3.3')
+        nodes = devices_data.values()
+        assert len({id(node['cmdlines']['show run']) for node in nodes}) == 1
+
+        stats = devices_data.get_output_stats()
+        assert stats['total'] == 3 and stats['unique'] == 1
+        assert OutputPool.get_info_text(stats).startswith('outputs=3, unique=1, compressed=0, ratio=3.00')
+
+        filename = str(tmp_path / 'devices_info.yaml')
+        devices_data.save(filename)
+        with open(filename) as stream:
+            text = stream.read()
+        assert text.count(output.splitlines()[-1]) == 1
+        assert DataFormat.load(text) == devices_data
+
+        other = DevicesData()
+        other.clear()
+        other.load(filename)
+        assert other.get_output_stats()['unique'] == 1
+
+    def test_compressed_devices_data(self, monkeypatch):
+        calls = []
+        compress = CompressedOutput.compress
+        monkeypatch.setattr(CompressedOutput, 'compress',
+                            lambda output, codec: calls.append(1) or compress(output, codec))
+
+        output = ''.join(['interface {}\n'.format(i) for i in range(10)])
+        devices_data = DevicesData()
+        devices_data.clear()
+        devices_data.pool = OutputPool(codec='zlib', min_size=16)
+        for address in ['1.1.1.1', '2.2.2.2', '3.3.3.3']:
+            devices_data[address] = dict(cmdlines={'show run': ''.join(output)})
+        assert calls == [1]
+
+        stats = devices_data.get_output_stats()
+        assert (stats['total'], stats['unique'], stats['compressed']) == (3, 1, 3)
+        assert str(devices_data['3.3.3.3']['cmdlines']['show run']) == output
+
+    def test_prune(self, tmp_path, monkeypatch):
+        from gtunrealdevice.config import Data
+
+        monkeypatch.setattr(Data, 'devices_info_filename', str(tmp_path / 'devices_info.yaml'))
+        devices_data = DevicesData()
+        devices_data.clear()
+        devices_data['1.1.1.1'] = dict(name='device1', cmdlines={'show version': 'v1'})
+        devices_data['2.2.2.2'] = dict(name='device2', cmdlines={'show version': ['v1', 'v2']})
+        assert len(devices_data.pool) == 2
+
+        devices_data.remove_device('device2')
+        assert list(devices_data.pool.outputs) == ['v1']
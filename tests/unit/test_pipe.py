@@ -0,0 +1,124 @@
+import pytest
+
+from gtunrealdevice.pipe import OutputPipe
+from gtunrealdevice.exceptions import OutputPipeError
+from gtunrealdevice.core import UnrealDevice
+from gtunrealdevice.core import DEVICES_DATA
+from gtunrealdevice.constant import ECODE
+
+OUTPUT = '\n'.join([
+    'hostname router1',
+    'interface GigabitEthernet0/1',
+    ' ip address 10.0.0.1 255.255.255.0',
+    ' no shutdown',
+    'interface GigabitEthernet0/2',
+    ' shutdown',
+    'router ospf 1',
+    ' network 10.0.0.0 0.0.0.255 area 0',
+    'end',
+])
+
+
+class TestOutputPipe:
+    @pytest.mark.parametrize(
+        ('cmdline', 'expected_cmdline', 'expected_pipes'),
+        [
+            ('show run', 'show run', []),
+            ('show run | include ip', 'show run', [('include', 'ip')]),
+            ('show run | i ip | ex 10', 'show run', [('include', 'ip'), ('exclude', '10')]),
+            ('show log | include up|down', 'show log', [('include', 'up|down')]),
+            ('show log | include up | down', 'show log', [('include', 'up | down')]),
+            ('show run | sec interface', 'show run', [('section', 'interface')]),
+            ('show a|b', 'show a|b', []),
+            ('show ver|include v', 'show ver', [('include', 'v')]),
+            ('show ver|count', 'show ver', [('count', '')]),
+            ('show log | include up|b', 'show log', [('include', 'up|b')]),
+            ('show log | include "up | down" | count', 'show log',
+             [('include', 'up | down'), ('count', '')]),
+        ]
+    )
+    def test_parse(self, cmdline, expected_cmdline, expected_pipes):
+        base_cmdline, pipes = OutputPipe.parse(cmdline)
+        assert base_cmdline == expected_cmdline
+        assert [(pipe.name, pipe.argument) for pipe in pipes] == expected_pipes
+
+    @pytest.mark.parametrize(
+        'cmdline',
+        [
+            'show run | include (',
+            'show run | include',
+            'show run | head ten',
+        ]
+    )
+    def test_parse_invalid_pipe(self, cmdline):
+        with pytest.raises(OutputPipeError):
+            OutputPipe.parse(cmdline)
+
+    @pytest.mark.parametrize(
+        ('cmdline', 'expected_lines'),
+        [
+            ('x | include shutdown', [' no shutdown', ' shutdown']),
+            (r'x | exclude ^\s', ['hostname router1', 'interface GigabitEthernet0/1',
+                                'interface GigabitEthernet0/2', 'router ospf 1', 'end']),
+            ('x | begin ospf', ['router ospf 1',
+                                ' network 10.0.0.0 0.0.0.255 area 0', 'end']),
+            ('x | section 0/1', ['interface GigabitEthernet0/1',
+                                 ' ip address 10.0.0.1 255.255.255.0', ' no shutdown']),
+            ('x | section interface | include shut', [' no shutdown', ' shutdown']),
+            ('x | count interface', ['Number of lines which match regexp = 2']),
+            ('x | count', ['Number of lines which match regexp = 9']),
+            ('x | head 2', ['hostname router1', 'interface GigabitEthernet0/1']),
+            ('x | tail 1', ['end']),
+        ]
+    )
+    def test_apply(self, cmdline, expected_lines):
+        _, pipes = OutputPipe.parse(cmdline)
+        assert list(OutputPipe.apply(OUTPUT, pipes)) == expected_lines
+        assert list(OutputPipe.apply(OUTPUT + '\n', pipes)) == expected_lines
+
+    @pytest.mark.parametrize(
+        ('output', 'expected_result'),
+        [
+            ('', 0),
+            ('line\n' * 50, 50),
+            ('line\r\n' * 49 + 'line', 50),
+            ('line\n\n', 2),
+        ]
+    )
+    def test_count_lines(self, output, expected_result):
+        _, pipes = OutputPipe.parse('x | count')
+        expected_line = 'Number of lines which match regexp = {}'.format(expected_result)
+        assert list(OutputPipe.apply(output, pipes)) == [expected_line]
+
+    def test_apply_is_lazy(self):
+        def lines():
+            yield 'a1'
+            yield 'b1'
+            raise AssertionError('pipe consumed more lines than needed')
+
+        _, pipes = OutputPipe.parse('x | include 1 | head 2')
+        assert list(OutputPipe.apply(lines(), pipes)) == ['a1', 'b1']
+
+
+class TestExecuteWithPipe:
+    @pytest.fixture
+    def device(self):
+        DEVICES_DATA['3.3.3.3'] = dict(name='router3', cmdlines={'show running-config': OUTPUT})
+        device = UnrealDevice('3.3.3.3')
+        device.connect(is_timestamp=False, showed=False)
+        yield device
+        DEVICES_DATA.pop('3.3.3.3')
+
+    @pytest.mark.parametrize(
+        ('cmdline', 'expected_output', 'expected_success_code'),
+        [
+            ('sh run | i ospf', 'router ospf 1', ECODE.SUCCESS),
+            ('show running-config | count ^interface', 'Number of lines which match regexp = 2', ECODE.SUCCESS),
+            ('show bogus | i ospf', 'UnrealDeviceCmdline: "show bogus" does not have output', ECODE.BAD),
+            ('sh run | i (', '% Invalid regular expression', ECODE.BAD),
+        ]
+    )
+    def test_execute(self, device, cmdline, expected_output, expected_success_code):
+        output = device.execute(cmdline, is_timestamp=False, showed=False)
+        assert output.startswith(cmdline + '\n' + expected_output)
+        assert device.success_code == expected_success_code
@@ -0,0 +1,98 @@
+import pickle
+
+import pytest
+
+from os import path
+
+from gtunrealdevice.core import DEVICES_DATA
+from gtunrealdevice.core import UnrealDevice
+from gtunrealdevice.dataformat import DataFormat
+from gtunrealdevice.serialization import SerializedFile
+
+DEVICES_DATA.load(path.join(path.dirname(__file__), 'data/devices_info.yaml'))
+
+
+@pytest.fixture
+def serialized_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(SerializedFile, 'filename', str(tmp_path / 'serialized_data.db'))
+    monkeypatch.setattr(SerializedFile, 'legacy_filename', str(tmp_path / 'serialized_data.yaml'))
+    yield SerializedFile
+    SerializedFile._connection.close()
+    SerializedFile._connection = None
+
+
+class TestSerializedFile:
+    def test_migrate(self, serialized_file, tmp_path):
+        device = UnrealDevice('1.1.1.1')
+        device.connect(is_timestamp=False, showed=False)
+        legacy_file = tmp_path / 'serialized_data.yaml'
+        legacy_file.write_text(DataFormat.dump({'1.1.1.1': pickle.dumps(device)}))
+
+        tbl = serialized_file.get_info(is_instance=False)
+        assert tbl.total == 1
+        assert tbl.devices == [dict(address='1.1.1.1', name='device1', is_connected=True)]
+        instance, = serialized_file.get_info().devices
+        assert isinstance(instance, UnrealDevice) and instance.is_connected is True
+        assert not legacy_file.exists()
+        assert (tmp_path / 'serialized_data.yaml.migrated').exists()
+        assert serialized_file.get_instance('1.1.1.1').address == '1.1.1.1'
+
+    def test_instance(self, serialized_file, monkeypatch):
+        device = UnrealDevice('1.1.1.1')
+        device.connect(is_timestamp=False, showed=False)
+        assert serialized_file.add_instance('1.1.1.1', device) is True
+        assert serialized_file.check_instance('1.1.1.1') is True
+        assert serialized_file.check_instance('2.2.2.2') is False
+
+        with monkeypatch.context() as context:
+            context.setattr(pickle, 'loads', None)
+            assert serialized_file.get_info(is_instance=False).total == 1
+            assert '1.1.1.1 is connected (name=device1)' in serialized_file.get_connected_info()
+
+        instance = serialized_file.get_instance('1.1.1.1')
+        assert instance.is_connected is True
+        assert serialized_file.remove_instance('2.2.2.2') is False
+        assert serialized_file.remove_instance('1.1.1.1') is True
+        assert serialized_file.get_info().total == 0
+        assert serialized_file.remove_instance('__all__') is False
+
+    def test_concurrent_writers(self, serialized_file):
+        import sqlite3
+
+        device = UnrealDevice('1.1.1.1')
+        device.connect(is_timestamp=False, showed=False)
+        serialized_file.add_instance('1.1.1.1', device)
+
+        other = UnrealDevice('2.2.2.2')
+        with sqlite3.connect(serialized_file.filename) as connection:
+            connection.execute('INSERT INTO sessions VALUES (?, ?, ?, ?)',
+                               serialized_file.get_row('2.2.2.2', other))
+            connection.execute('INSERT INTO cursors VALUES (?, ?, ?)',
+                               ('2.2.2.2', 'show version', 1))
+        connection.close()
+
+        serialized_file.add_instance('1.1.1.1', device)
+        serialized_file.update_cursors('1.1.1.1', {'show version': 0})
+        devices = serialized_file.get_info(is_instance=False).devices
+        assert sorted(device.address for device in devices) == ['1.1.1.1', '2.2.2.2']
+        assert serialized_file.get_cursors('2.2.2.2') == {'show version': 1}
+
+    def test_cursors(self, serialized_file):
+        device = UnrealDevice('1.1.1.1')
+        device.connect(is_timestamp=False, showed=False)
+        serialized_file.add_instance('1.1.1.1', device)
+
+        outputs = []
+        for _ in range(3):
+            instance = serialized_file.get_instance('1.1.1.1')
+            output = instance.execute('show version', is_timestamp=False, showed=False)
+            outputs.append(output.splitlines()[-1])
+            serialized_file.update_cursors('1.1.1.1', instance.table)
+        assert outputs == ['version is 2.0.1', 'version is 2.0.2', 'version is 2.0.1']
+        assert serialized_file.get_cursors('1.1.1.1') == {'show version': 0}
+
+        serialized_file.add_instance('1.1.1.1', device)
+        assert serialized_file.get_cursors('1.1.1.1') == dict()
+        serialized_file.update_cursors('1.1.1.1', {'show version': 1})
+        serialized_file.remove_instance('1.1.1.1')
+        assert serialized_file.get_cursors('1.1.1.1') == dict()
@@ -0,0 +1,127 @@
+import pickle
+from datetime import date
+
+import pytest
+import yaml
+
+from os import path
+
+from gtunrealdevice import core
+from gtunrealdevice.core import UnrealDevice
+from gtunrealdevice.sqlitedata import SqliteDevicesData
+from gtunrealdevice.sqlitedata import SqliteCmdlines
+from gtunrealdevice.compression import CompressedOutput
+from gtunrealdevice.exceptions import DevicesInfoError
+
+FILENAME = path.join(path.dirname(__file__), 'data/devices_info.yaml')
+
+
+@pytest.fixture
+def devices_data(tmp_path):
+    devices_data = SqliteDevicesData(str(tmp_path / 'devices_info.db'))
+    devices_data.clear()
+    devices_data.load(FILENAME)
+    yield devices_data
+    devices_data.connection.close()
+
+
+class TestSqliteDevicesData:
+    def test_import_and_export(self, devices_data, tmp_path):
+        assert len(devices_data) == 1
+        assert '1.1.1.1' in devices_data
+        assert devices_data.get_address_from_name('device1') == '1.1.1.1'
+        assert devices_data.get_address_from_name('bogus') == 'bogus'
+
+        node = devices_data['1.1.1.1']
+        assert isinstance(node['cmdlines'], SqliteCmdlines)
+        assert list(node['cmdlines']) == ['show version']
+
+        filename = str(tmp_path / 'exported.yaml')
+        devices_data.save(filename)
+        with open(filename) as stream, open(FILENAME) as other_stream:
+            assert yaml.safe_load(stream) == yaml.safe_load(other_stream)
+
+    @pytest.mark.parametrize('is_upsert_supported', [True, False])
+    def test_write_through(self, devices_data, monkeypatch, is_upsert_supported):
+        monkeypatch.setattr(SqliteDevicesData, 'is_upsert_supported', is_upsert_supported)
+        devices_data.update_command_line('show clock', '08:00', '1.1.1.1')
+        devices_data.update_command_line('show version', 'version is 2.0.3',
+                                         '1.1.1.1', appended=True)
+        devices_data['2.2.2.2'] = dict(name='device2')
+
+        other = SqliteDevicesData(devices_data.db_filename)
+        assert other['1.1.1.1']['cmdlines']['show clock'] == '08:00'
+        assert other['1.1.1.1']['cmdlines']['show version'][-1] == 'version is 2.0.3'
+        assert other.get_address_from_name('device2') == '2.2.2.2'
+
+        assert other.pop('2.2.2.2') == dict(name='device2')
+        assert '2.2.2.2' not in devices_data
+        other.connection.close()
+
+    def test_typed_values(self, devices_data):
+        cmdlines = {'show tech': CompressedOutput.compress('tech\n' * 100, 'zlib'),
+                    'show dump': b'\x80\x04binary',
+                    'show date': date(2024, 1, 2)}
+        devices_data['2.2.2.2'] = dict(name='device2', since=date(2024, 1, 1), cmdlines=cmdlines)
+
+        other = SqliteDevicesData(devices_data.db_filename)
+        assert other['2.2.2.2']['since'] == date(2024, 1, 1)
+        assert dict(other['2.2.2.2']['cmdlines']) == cmdlines
+        other.connection.close()
+
+    def test_execute(self, devices_data, monkeypatch):
+        monkeypatch.setattr(core, 'DEVICES_DATA', devices_data)
+        device = UnrealDevice('1.1.1.1')
+        device.connect(is_timestamp=False, showed=False)
+        outputs = [device.execute('sh ver', is_timestamp=False, showed=False) for _ in range(3)]
+        assert outputs == ['sh ver\nversion is 2.0.1',
+                           'sh ver\nversion is 2.0.2',
+                           'sh ver\nversion is 2.0.1']
+
+        other_device = pickle.loads(pickle.dumps(device))
+        assert other_device.data == devices_data['1.1.1.1'].to_dict()
+
+    @pytest.mark.parametrize('exc_type', [ValueError, KeyboardInterrupt])
+    def test_batch(self, devices_data, exc_type):
+        with pytest.raises(exc_type):
+            with devices_data.batch():
+                devices_data.update_command_line('show clock', '08:00', '1.1.1.1')
+                devices_data['2.2.2.2'] = dict(name='device2')
+                raise exc_type('rolled back')
+        assert devices_data.is_batching is False
+        assert list(devices_data) == ['1.1.1.1']
+        assert 'show clock' not in devices_data['1.1.1.1']['cmdlines']
+
+        with devices_data.batch():
+            devices_data['2.2.2.2'] = dict(name='device2')
+            devices_data.remove_device('device1')
+        assert list(devices_data) == ['2.2.2.2']
+
+    def test_load_stream(self, devices_data, tmp_path, monkeypatch):
+        filename = tmp_path / 'capture.yaml'
+        filename.write_text('\n'.join([
+            '"2.2.2.2":',
+            '  cmdlines:',
+            '    show clock: "08:00"',
+            '    show version: v1',
+            '  name: device2',
+            '"3.3.3.3":',
+            '  name: [device3]',
+        ]))
+        with pytest.raises(DevicesInfoError):
+            devices_data.load(str(filename))
+        assert devices_data.message == 'line 7, column 9: Invalid name format of "3.3.3.3" device.'
+        assert list(devices_data) == ['1.1.1.1']
+
+        filename.write_text(filename.read_text().replace('[device3]', 'device3'))
+        calls = []
+        write_outputs = devices_data.write_outputs
+        monkeypatch.setattr(devices_data, 'write_outputs',
+                            lambda device_id, items: calls.append(len(items))
+                            or write_outputs(device_id, items))
+        devices_data.load(str(filename))
+        assert calls == [1, 1]
+        assert devices_data['2.2.2.2'].to_dict() == dict(
+            name='device2', cmdlines={'show clock': '08:00', 'show version': 'v1'}
+        )
+        assert devices_data.get_address_from_name('device3') == '3.3.3.3'
@@ -0,0 +1,55 @@
+import asyncio
+
+from os import path
+
+from gtunrealdevice.core import DEVICES_DATA
+from gtunrealdevice.tcpserver import UnrealDeviceServer
+
+DEVICES_DATA.load(path.join(path.dirname(__file__), 'data/devices_info.yaml'))
+
+
+async def run_session(port, *lines):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    await reader.readuntil(b'Device: ')
+    writer.write(b'device1\r\n')
+    banner = await reader.readuntil(b'device1#')
+    outputs = [banner.decode()]
+    for line in lines:
+        writer.write('{}\r\n'.format(line).encode())
+        output = await reader.readuntil(b'device1#')
+        outputs.append(output.decode())
+    writer.write(b'exit\r\n')
+    outputs.append((await reader.read()).decode())
+    writer.close()
+    return outputs
+
+
+class TestUnrealDeviceServer:
+    def test_session(self):
+        async def run():
+            server = UnrealDeviceServer(is_timestamp=False)
+            await server.start()
+            try:
+                return await run_session(server.ports[''], 'show version', 'show version')
+            finally:
+                await server.close()
+
+        banner, output1, output2, logout = asyncio.run(run())
+        assert 'device1 is successfully connected.' in banner
+        assert output1 == 'show version\r\nversion is 2.0.1\r\ndevice1#'
+        assert output2 == 'show version\r\nversion is 2.0.2\r\ndevice1#'
+        assert 'device1 is disconnected.' in logout
+
+    def test_concurrent_sessions(self):
+        async def run():
+            server = UnrealDeviceServer(is_timestamp=False)
+            await server.start()
+            try:
+                coros = [run_session(server.ports[''], 'show version') for _ in range(200)]
+                return await asyncio.gather(*coros)
+            finally:
+                await server.close()
+
+        results = asyncio.run(run())
+        assert len(results) == 200
+        assert all('version is 2.0.1' in outputs[1] for outputs in results)
@@ -0,0 +1,81 @@
+import os
+import shutil
+
+import pytest
+
+from gtunrealdevice import example
+from gtunrealdevice.config import Data
+from gtunrealdevice.yamlcache import YamlCache
+from gtunrealdevice.usage import LazyUsage
+
+
+@pytest.fixture
+def filename(tmp_path, monkeypatch):
+    filename = tmp_path / 'exampledata.yaml'
+    shutil.copy(example.EXAMPLE_DATA_FILENAME, str(filename))
+    monkeypatch.setattr(example, 'EXAMPLE_DATA_FILENAME', str(filename))
+    monkeypatch.setattr(YamlCache, 'directory', str(tmp_path / 'cache'))
+    monkeypatch.setattr(YamlCache, 'hits', 0)
+    monkeypatch.setattr(YamlCache, 'misses', 0)
+    example.load_example_data.cache_clear()
+    yield filename
+    example.load_example_data.cache_clear()
+
+
+def load_example_data():
+    example.load_example_data.cache_clear()
+    return example.load_example_data()
+
+
+class TestExampleData:
+    def test_cache(self, filename):
+        data = load_example_data()
+        assert data and isinstance(data, dict)
+        assert example.load_example_data() is data
+        assert os.path.isfile(YamlCache.get_cache_filename(str(filename)))
+
+        assert load_example_data() == data
+        assert (YamlCache.hits, YamlCache.misses) == (1, 1)
+
+    @pytest.mark.parametrize('is_size_changed', [False, True])
+    def test_invalidation(self, filename, is_size_changed):
+        load_example_data()
+        stat = filename.stat()
+        text = 'connect:\n  1: changed\n' if is_size_changed else ''
+        filename.write_text(text or filename.read_text().replace('connect', 'xonnect', 1))
+        if not is_size_changed:
+            os.utime(str(filename), ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        data = load_example_data()
+        assert ('xonnect' in data) is not is_size_changed
+        assert (YamlCache.hits, YamlCache.misses) == (0, 2)
+
+    def test_corrupt_cache(self, filename):
+        expected_result = load_example_data()
+        with open(YamlCache.get_cache_filename(str(filename)), 'wb') as stream:
+            stream.write(b'\x80corrupt')
+        assert load_example_data() == expected_result
+        assert YamlCache.misses == 2
+
+    def test_in_memory(self, filename, tmp_path, monkeypatch):
+        monkeypatch.setattr(Data, 'is_in_memory', True)
+        assert load_example_data()
+        assert not (tmp_path / 'cache').exists()
+
+
+class TestLazyUsage:
+    def test_descriptor(self):
+        calls = []
+
+        def get_usage(name, flags=0):
+            calls.append((name, flags))
+            return '{} usage'.format(name)
+
+        class Usage:
+            usage = LazyUsage(get_usage, 'connect', flags=1)
+
+        assert calls == []
+        assert Usage.usage == 'connect usage'
+        assert Usage().usage == 'connect usage'
+        assert Usage.__dict__['usage'] == 'connect usage'
+        assert calls == [('connect', 1)]
@@ -0,0 +1,63 @@
+import os
+import pickle
+
+import pytest
+
+from gtunrealdevice.yamlcache import YamlCache
+
+
+@pytest.fixture
+def filename(tmp_path, monkeypatch):
+    monkeypatch.setattr(YamlCache, 'hits', 0)
+    monkeypatch.setattr(YamlCache, 'misses', 0)
+    monkeypatch.setattr(YamlCache, 'directory', str(tmp_path / 'cache'))
+    filename = tmp_path / 'devices_info.yaml'
+    filename.write_text('"1.1.1.1":\n  name: device1\n')
+    return filename
+
+
+class TestYamlCache:
+    def test_load(self, filename):
+        expected_result = {'1.1.1.1': {'name': 'device1'}}
+        assert YamlCache.load(str(filename)) == expected_result
+        assert os.path.isfile(YamlCache.get_cache_filename(str(filename)))
+        assert sorted(os.listdir(str(filename.parent))) == ['cache', 'devices_info.yaml']
+        assert YamlCache.load(str(filename)) == expected_result
+        assert (YamlCache.hits, YamlCache.misses) == (1, 1)
+
+        filename.write_text('"2.2.2.2":\n  name: device2\n')
+        assert YamlCache.load(str(filename)) == {'2.2.2.2': {'name': 'device2'}}
+        assert (YamlCache.hits, YamlCache.misses) == (1, 2)
+
+    @pytest.mark.parametrize('is_hashed', [False, True])
+    def test_load_with_same_mtime_and_size(self, filename, monkeypatch, is_hashed):
+        monkeypatch.setattr(YamlCache, 'is_hashed', is_hashed)
+        YamlCache.load(str(filename))
+
+        stat = filename.stat()
+        filename.write_text('"1.1.1.1":\n  name: device9\n')
+        os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        name = YamlCache.load(str(filename))['1.1.1.1']['name']
+        assert name == ('device9' if is_hashed else 'device1')
+
+    def test_invalid_cache(self, filename):
+        cache_filename = YamlCache.get_cache_filename(str(filename))
+        os.makedirs(os.path.dirname(cache_filename))
+        with open(cache_filename, 'w') as stream:
+            stream.write('invalid')
+        assert YamlCache.load(str(filename)) == {'1.1.1.1': {'name': 'device1'}}
+        assert YamlCache.misses == 1
+
+    def test_forbidden_global(self, filename, tmp_path):
+        class Payload:
+            def __reduce__(self):
+                return os.mkdir, (str(tmp_path / 'hacked'),)
+
+        YamlCache.load(str(filename))
+        signature = YamlCache.get_signature(str(filename))
+        with open(YamlCache.get_cache_filename(str(filename)), 'wb') as stream:
+            pickle.dump([signature, Payload()], stream)
+        assert YamlCache.load(str(filename)) == {'1.1.1.1': {'name': 'device1'}}
+        assert not (tmp_path / 'hacked').exists()
+        assert YamlCache.misses == 2